@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare adaptive (successive halving) simulation allocation with an even split of the same budget.
+
+A long paired run over every candidate gives the reference ranking. Each method then gets the same
+budget for several seeds, and we report how often its top-k set and order match the reference.
+
+Usage: python benchmarks/adaptive_allocation.py [--slot 6] [--round 5] [--budget 12000] [--top-k 5] [--trials 5]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.paired_sampling import build_assistant
+from simulation_allocator import allocate_simulations
+from simulation_engine import BoardSnapshot, compare_candidates
+from simulation_executor import SimulationExecutor
+
+POSITIONS = ('QB', 'RB', 'WR', 'TE', 'K', 'DST')
+
+
+def top_candidates(assistant, snapshot, per_position: int):
+    """Top players by projection at each position, as table indices."""
+    table = snapshot.table
+    ranked = sorted(assistant.get_available_players(), key=lambda p: -table.projection[table.index[p.name]])
+    candidates = []
+    for position in POSITIONS:
+        candidates += [table.index[p.name] for p in ranked if p.position == position][:per_position]
+    return candidates
+
+
+def ranking(stats, top_k: int):
+    return sorted(stats, key=lambda c: stats[c]['mean'], reverse=True)[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slot', type=int, default=6, help='User draft slot (1-based)')
+    parser.add_argument('--round', type=int, default=5, help='Round the user is on the clock in')
+    parser.add_argument('--per-position', type=int, default=5, help='Candidates per position')
+    parser.add_argument('--budget', type=int, default=12000, help='Simulations per method and trial')
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--reference-sims', type=int, default=4000, help='Reference simulations per candidate')
+    args = parser.parse_args()
+
+    assistant = build_assistant(args.slot, args.round)
+    snapshot = BoardSnapshot.from_assistant(assistant)
+    candidates = top_candidates(assistant, snapshot, args.per_position)
+    executor = SimulationExecutor()
+
+    reference = compare_candidates(executor.run(snapshot, candidates, args.reference_sims, seed=10_000))
+    truth = ranking(reference, args.top_k)
+    print(f"{len(candidates)} candidates, budget {args.budget}, reference top {args.top_k}: "
+          + ', '.join(snapshot.table.names[c] for c in truth))
+
+    results = {'even split': [], 'adaptive': []}
+    for trial in range(args.trials):
+        even = compare_candidates(executor.run(snapshot, candidates, args.budget // len(candidates), seed=trial))
+        adaptive = allocate_simulations(executor, snapshot, candidates, args.budget, top_k=args.top_k, seed=trial)
+        for name, stats in (('even split', even), ('adaptive', adaptive.stats)):
+            top = ranking(stats, args.top_k)
+            leader_error = np.mean([stats[c]['diff_std_error'] for c in top[1:]]) if len(top) > 1 else 0.0
+            results[name].append((len(set(top) & set(truth)) / args.top_k, top == truth, leader_error))
+
+    print(f"{'method':<12} {'top-k overlap':>14} {'exact order':>12} {'mean diff se':>13}")
+    for name, rows in results.items():
+        overlap, exact, error = zip(*rows)
+        print(f"{name:<12} {np.mean(overlap):>14.2f} {np.mean(exact):>12.2f} {np.mean(error):>13.2f}")
+    executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
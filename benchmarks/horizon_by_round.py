@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark horizon-truncated simulation against full-draft simulation by draft round.
+
+Usage: python benchmarks/horizon_by_round.py [--slot 12] [--teams 12] [--sims 20] [--engine-sims 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+from simulation_engine import PlayerTable, SimulationSettings, BoardState, BatchDraftSimulator
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '09042025LEAGUE_Rankings_2.csv')
+
+
+def build_assistant(slot: int, num_teams: int) -> FantasyDraftAssistant:
+    """Create an initialized draft with the user in the given slot."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        assistant = FantasyDraftAssistant(CSV_PATH)
+        assistant.set_num_teams(num_teams)
+        assistant.set_user_draft_position(slot)
+        assistant.reset_draft()
+    return assistant
+
+
+def advance_to_user_pick(assistant: FantasyDraftAssistant, round_num: int) -> bool:
+    """Draft by ADP until the user is on the clock in round_num."""
+    while assistant.current_pick <= len(assistant.draft_order):
+        pick_round, team_id = assistant.draft_order[assistant.current_pick - 1]
+        if pick_round == round_num and team_id == assistant.user_draft_position:
+            return True
+        assistant.draft_player(assistant.get_available_players()[0].name)
+    return False
+
+
+def time_scalar(assistant: FantasyDraftAssistant, candidate, num_sims: int, truncate: bool) -> float:
+    """Average seconds per scalar simulation."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(num_sims):
+            assistant._simulate_draft_with_player_simple(candidate, truncate_horizon=truncate)
+    return (time.perf_counter() - start) / num_sims
+
+
+def time_engine(table, settings, board, candidate: int, num_sims: int, truncate: bool) -> float:
+    """Simulations per second for the batched engine."""
+    simulator = BatchDraftSimulator(table, settings, truncate_horizon=truncate)
+    start = time.perf_counter()
+    simulator.run(board, candidate, num_sims, np.random.default_rng(0))
+    return num_sims / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slot', type=int, default=12, help='User draft slot (1-based)')
+    parser.add_argument('--teams', type=int, default=12, help='Number of teams')
+    parser.add_argument('--sims', type=int, default=20, help='Scalar simulations per round')
+    parser.add_argument('--engine-sims', type=int, default=2000, help='Engine simulations per round')
+    args = parser.parse_args()
+
+    assistant = build_assistant(args.slot, args.teams)
+    table = PlayerTable(assistant.players, {p.name: assistant.get_player_projected_points(p) for p in assistant.players})
+    settings = SimulationSettings.from_assistant(assistant)
+    total_rounds = assistant.draft_order[-1][0]
+
+    print(f"{'round':>5} {'pick':>5} {'left':>5} {'full ms':>9} {'trunc ms':>9} {'speedup':>8} {'eng full/s':>11} {'eng trunc/s':>12} {'speedup':>8}")
+    for round_num in range(1, total_rounds + 1):
+        if not advance_to_user_pick(assistant, round_num):
+            break
+        candidate = assistant.get_available_players()[0]
+        picks_left = len(assistant.draft_order) - assistant.current_pick
+
+        scalar_full = time_scalar(assistant, candidate, args.sims, truncate=False)
+        scalar_truncated = time_scalar(assistant, candidate, args.sims, truncate=True)
+
+        board = BoardState.from_assistant(assistant, table)
+        engine_full = time_engine(table, settings, board, table.index[candidate.name], args.engine_sims, truncate=False)
+        engine_truncated = time_engine(table, settings, board, table.index[candidate.name], args.engine_sims, truncate=True)
+
+        print(f"{round_num:>5} {assistant.current_pick:>5} {picks_left:>5} "
+              f"{scalar_full * 1000:>9.2f} {scalar_truncated * 1000:>9.2f} {scalar_full / scalar_truncated:>7.2f}x "
+              f"{engine_full:>11.0f} {engine_truncated:>12.0f} {engine_truncated / engine_full:>7.2f}x")
+
+        # Take the user's pick so the next round starts from a realistic board
+        assistant.draft_player(candidate.name)
+
+
+if __name__ == '__main__':
+    main()
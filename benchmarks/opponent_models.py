@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Calibrate and benchmark the opponent pick models.
+
+Measures how far opponents reach past the best available ADP under each model, compares that
+pick-distance distribution to the original 70% / top-6 rule, grid-searches the noisy ADP reach
+parameters and times scalar and batched simulations for both models.
+
+Usage: python benchmarks/opponent_models.py [--drafts 200] [--sims 20] [--engine-sims 2000] [--calibrate]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+from simulation_engine import (PlayerTable, SimulationSettings, BoardState, BatchDraftSimulator,
+                               OPPONENT_MODELS, OPPONENT_ADP_WINDOW, OPPONENT_NOISY_ADP,
+                               OPPONENT_ADP_PROBABILITY, OPPONENT_WINDOW,
+                               NOISY_ADP_REACH_PROBABILITY, NOISY_ADP_MAX_REACH, noisy_adp_keys)
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '09042025LEAGUE_Rankings_2.csv')
+
+# Reaches beyond this many slots are lumped together in the histogram
+MAX_DISTANCE = 20
+
+
+def target_distribution() -> np.ndarray:
+    """Pick-distance distribution of the original rule: best ADP 70% of the time, else uniform over the top 6."""
+    target = np.zeros(MAX_DISTANCE + 1)
+    target[:OPPONENT_WINDOW] = (1 - OPPONENT_ADP_PROBABILITY) / OPPONENT_WINDOW
+    target[0] += OPPONENT_ADP_PROBABILITY
+    return target
+
+
+def total_variation(a: np.ndarray, b: np.ndarray) -> float:
+    return 0.5 * float(np.abs(a - b).sum())
+
+
+def window_distances(num_players: int, num_picks: int, rng: np.random.Generator) -> np.ndarray:
+    """Pick distances of one draft under the adp_window model."""
+    available = np.ones(num_players, dtype=bool)
+    distances = np.zeros(num_picks, dtype=np.int64)
+    for pick in range(num_picks):
+        open_slots = np.flatnonzero(available)
+        if rng.random() < OPPONENT_ADP_PROBABILITY:
+            distance = 0
+        else:
+            distance = min(int(rng.integers(0, OPPONENT_WINDOW)), len(open_slots) - 1)
+        available[open_slots[distance]] = False
+        distances[pick] = distance
+    return distances
+
+
+def noisy_distances(num_players: int, num_picks: int, rng: np.random.Generator,
+                    reach_probability: float = NOISY_ADP_REACH_PROBABILITY,
+                    max_reach: int = NOISY_ADP_MAX_REACH) -> np.ndarray:
+    """Pick distances of one draft under the noisy_adp model."""
+    order = np.argsort(noisy_adp_keys(num_players, rng, reach_probability=reach_probability, max_reach=max_reach))
+    available = np.ones(num_players, dtype=bool)
+    distances = np.zeros(num_picks, dtype=np.int64)
+    for pick, player in enumerate(order[:num_picks]):
+        distances[pick] = available[:player].sum()
+        available[player] = False
+    return distances
+
+
+def distance_histogram(sample, num_drafts: int) -> np.ndarray:
+    counts = np.zeros(MAX_DISTANCE + 1)
+    for _ in range(num_drafts):
+        counts += np.bincount(np.minimum(sample(), MAX_DISTANCE), minlength=MAX_DISTANCE + 1)
+    return counts / counts.sum()
+
+
+def build_assistant(slot: int = 6, num_teams: int = 12) -> FantasyDraftAssistant:
+    """Create an initialized draft with the user on the clock in round 1."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        assistant = FantasyDraftAssistant(CSV_PATH)
+        assistant.set_num_teams(num_teams)
+        assistant.set_user_draft_position(slot)
+        assistant.reset_draft()
+        while not assistant.get_current_pick_info().get('is_user_turn', False):
+            assistant.draft_player(assistant.get_available_players()[0].name)
+    return assistant
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--drafts', type=int, default=200, help='Drafts sampled per distribution')
+    parser.add_argument('--sims', type=int, default=20, help='Scalar simulations per model')
+    parser.add_argument('--engine-sims', type=int, default=2000, help='Engine simulations per model')
+    parser.add_argument('--calibrate', action='store_true', help='Grid-search the noisy ADP reach parameters')
+    args = parser.parse_args()
+
+    assistant = build_assistant()
+    num_players = len(assistant.players)
+    num_picks = len(assistant.draft_order)
+    rng = np.random.default_rng(0)
+    target = target_distribution()
+
+    print(f"Pick distance distribution ({args.drafts} drafts, {num_picks} picks)")
+    print(f"{'model':>12} " + ' '.join(f'{d:>6}' for d in range(8)) + f" {'TV':>7}")
+    print(f"{'target':>12} " + ' '.join(f'{p:>6.3f}' for p in target[:8]))
+    histograms = {
+        OPPONENT_ADP_WINDOW: distance_histogram(lambda: window_distances(num_players, num_picks, rng), args.drafts),
+        OPPONENT_NOISY_ADP: distance_histogram(lambda: noisy_distances(num_players, num_picks, rng), args.drafts),
+    }
+    for model, histogram in histograms.items():
+        print(f"{model:>12} " + ' '.join(f'{p:>6.3f}' for p in histogram[:8]) + f" {total_variation(histogram, target):>7.3f}")
+
+    if args.calibrate:
+        print("\nNoisy ADP calibration grid (TV distance to target)")
+        for reach_probability in (0.2, 0.25, 0.3, 0.35):
+            row = []
+            for max_reach in (4, 5, 6, 7, 8):
+                histogram = distance_histogram(
+                    lambda: noisy_distances(num_players, num_picks, rng, reach_probability, max_reach), args.drafts // 4)
+                row.append(total_variation(histogram, target))
+            print(f"  p={reach_probability:<5} " + ' '.join(f'max{m}={tv:.3f}' for m, tv in zip((4, 5, 6, 7, 8), row)))
+
+    print("\nSimulation throughput")
+    candidate = assistant.get_available_players()[0]
+    table = PlayerTable(assistant.players, {p.name: assistant.get_player_projected_points(p) for p in assistant.players})
+    board = BoardState.from_assistant(assistant, table)
+    print(f"{'model':>12} {'scalar ms':>10} {'engine sims/s':>14} {'mean score':>11}")
+    for model in OPPONENT_MODELS:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.sims):
+                assistant._simulate_draft_with_player_simple(candidate, opponent_model=model)
+        scalar_ms = (time.perf_counter() - start) / args.sims * 1000
+
+        simulator = BatchDraftSimulator(table, SimulationSettings.from_assistant(assistant, model))
+        start = time.perf_counter()
+        scores = simulator.run(board, table.index[candidate.name], args.engine_sims, np.random.default_rng(0))
+        engine_rate = args.engine_sims / (time.perf_counter() - start)
+        print(f"{model:>12} {scalar_ms:>10.2f} {engine_rate:>14.0f} {scores.mean():>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Measure how much common random numbers tighten candidate comparisons.
+
+Runs the top player at each position through the batched engine with independent, paired and
+paired + antithetic sampling, then reports the standard error of each candidate's difference to
+the leader and how many independent simulations would be needed to match it.
+
+Usage: python benchmarks/paired_sampling.py [--slot 6] [--round 1] [--sims 1000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+from simulation_engine import BoardSnapshot, BatchDraftSimulator, compare_candidates
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '09042025LEAGUE_Rankings_2.csv')
+
+
+def build_assistant(slot: int, round_num: int, num_teams: int = 12) -> FantasyDraftAssistant:
+    """Create a draft advanced by ADP until the user is on the clock in round_num."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        assistant = FantasyDraftAssistant(CSV_PATH)
+        assistant.set_num_teams(num_teams)
+        assistant.set_user_draft_position(slot)
+        assistant.reset_draft()
+        while True:
+            pick_round, team_id = assistant.draft_order[assistant.current_pick - 1]
+            if pick_round == round_num and team_id == slot:
+                break
+            assistant.draft_player(assistant.get_available_players()[0].name)
+    return assistant
+
+
+def run_mode(snapshot, candidates, num_sims, paired, antithetic, seed):
+    simulator = BatchDraftSimulator(snapshot.table, snapshot.settings)
+    seeds = np.random.SeedSequence(seed).spawn(1 if paired else len(candidates))
+    scores = {}
+    for i, candidate in enumerate(candidates):
+        rng = np.random.default_rng(seeds[0 if paired else i])
+        scores[candidate] = simulator.run(snapshot.board, candidate, num_sims, rng, antithetic)
+    return compare_candidates(scores, paired=paired, antithetic=antithetic)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slot', type=int, default=6, help='User draft slot (1-based)')
+    parser.add_argument('--round', type=int, default=1, help='Round the user is on the clock in')
+    parser.add_argument('--sims', type=int, default=1000, help='Simulations per candidate')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    assistant = build_assistant(args.slot, args.round)
+    snapshot = BoardSnapshot.from_assistant(assistant)
+    top_by_position = {}
+    for player in sorted(assistant.get_available_players(), key=lambda p: -snapshot.table.projection[snapshot.table.index[p.name]]):
+        top_by_position.setdefault(player.position, player)
+    candidates = [snapshot.table.index[p.name] for p in top_by_position.values()]
+
+    modes = {
+        'independent': run_mode(snapshot, candidates, args.sims, False, False, args.seed),
+        'paired': run_mode(snapshot, candidates, args.sims, True, False, args.seed),
+        'paired+anti': run_mode(snapshot, candidates, args.sims, True, True, args.seed),
+    }
+
+    print(f"{args.sims} simulations per candidate, slot {args.slot}, round {args.round}")
+    print(f"{'candidate':<22} {'mode':<12} {'mean':>8} {'diff':>8} {'diff se':>8} {'equiv sims':>11}")
+    for candidate in candidates:
+        name = snapshot.table.names[candidate]
+        baseline = modes['independent'][candidate]['diff_std_error']
+        for mode, summary in modes.items():
+            stats = summary[candidate]
+            error = stats['diff_std_error']
+            # Independent sims needed for the same difference standard error (the leader has nothing to compare)
+            equivalent = f"{args.sims * (baseline / error) ** 2:.0f}" if error > 0 else '-'
+            print(f"{name[:22]:<22} {mode:<12} {stats['mean']:>8.1f} {stats['diff_vs_best']:>8.1f} {error:>8.2f} {equivalent:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Simulation benchmark suite over fixture leagues, with machine-readable results.
+
+Builds fixture boards from the league rankings (early, mid and late draft; 8, 12 and 16 teams;
+default and deep rosters) and measures on each:
+
+  scalar_sims_per_sec      simulate_draft_with_player_web_projections
+  latency_ms               run_simulations_with_web_projections end to end (median, warm)
+  engine_sims_per_sec      simulations per second inside that run
+  valuation_per_sec        engine roster valuation, rosters/s (weekly_valuation_per_sec: weekly lineups)
+  scalar_valuation_per_sec calculate_roster_value_for_simulation_web_projections (unmemoized), rosters/s
+  peak_memory_mb           tracemalloc peak during one end-to-end run on an in-process executor
+
+Results are written as JSON. --compare flags metrics that got worse than a baseline file by
+more than --threshold and exits non-zero, so runs can be diffed before a deploy.
+
+Usage: python benchmarks/simulation_suite.py [--output results.json] [--compare baseline.json] [--boards 12t]
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+from simulation_engine import BatchDraftSimulator, BoardSnapshot, LINEUP_WEEKLY
+from simulation_executor import SimulationExecutor
+
+CSV_PATH = os.path.join(ROOT, '09042025LEAGUE_Rankings_2.csv')
+
+# Fraction of the draft's rounds gone when each fixture board is taken
+STAGES = {'early': 0.0, 'mid': 0.5, 'late': 0.8}
+TEAM_COUNTS = (8, 12, 16)
+ROSTERS = {
+    'default': {},
+    'deep': {'WR': 3, 'FLEX': 2, 'BN': 10}
+}
+
+# How peak_memory_mb is measured, recorded in the results. tracemalloc only sees this process,
+# so that run simulates in-process instead of on the pool workers.
+MEMORY_MEASUREMENT = 'tracemalloc peak, in-process executor (1 worker)'
+
+# Direction of each metric, for --compare
+HIGHER_IS_BETTER = {
+    'scalar_sims_per_sec': True,
+    'latency_ms': False,
+    'engine_sims_per_sec': True,
+    'valuation_per_sec': True,
+    'weekly_valuation_per_sec': True,
+    'scalar_valuation_per_sec': True,
+    'peak_memory_mb': False
+}
+
+
+def build_board(stage: str, num_teams: int, roster: str) -> FantasyDraftAssistant:
+    """Draft by ADP until the user (middle slot) is on the clock at the stage's round."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        assistant = FantasyDraftAssistant(CSV_PATH)
+        assistant.set_num_teams(num_teams)
+        assistant.set_roster_constraints(ROSTERS[roster])
+        assistant.set_user_draft_position(num_teams // 2)
+        assistant.reset_draft()
+        total_rounds = assistant.draft_order[-1][0]
+        round_num = 1 + int(STAGES[stage] * (total_rounds - 1))
+        while True:
+            pick_round, team_id = assistant.draft_order[assistant.current_pick - 1]
+            if pick_round == round_num and team_id == assistant.user_draft_position:
+                break
+            assistant.draft_player(assistant.get_available_players()[0].name)
+    return assistant
+
+
+def random_rosters(num_players: int, roster_size: int, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Distinct-player rosters in table indices, so no valuation is a memo hit."""
+    return np.argsort(rng.random((count, num_players)), axis=1)[:, :roster_size].astype(np.int32)
+
+
+def rate(function, count: int, repeats: int) -> float:
+    """count / seconds for the fastest of repeats calls, which is the least disturbed by other load."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def bench_board(web, assistant, args, memory_executor: SimulationExecutor) -> dict:
+    """Every metric for one fixture board."""
+    rng = np.random.default_rng(args.seed)
+    projection_cache = {p.name: web.get_player_projection(p.name, web.selected_scoring_format)
+                        for p in assistant.get_available_players()}
+    candidate = max(assistant.get_available_players(), key=lambda p: projection_cache[p.name])
+    results = {}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results['scalar_sims_per_sec'] = rate(lambda: [
+            web.simulate_draft_with_player_web_projections(assistant, candidate, projection_cache, rng=rng)
+            for _ in range(args.scalar_sims)], args.scalar_sims, args.repeats)
+
+        # Seeded runs skip the simulation cache, so every repeat really simulates; the first warms the pool
+        def run():
+            return web.run_simulations_with_web_projections(assistant, 10, simulation_budget=args.budget, seed=args.seed)[1]
+        run()
+        latencies = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            summary = run()
+            latencies.append(time.perf_counter() - start)
+        simulations = summary.get('simulations', 0)
+        results['latency_ms'] = statistics.median(latencies) * 1000
+        results['engine_sims_per_sec'] = simulations / statistics.median(latencies)
+
+        # The simulation arrays live wherever the executor runs them, so measure a warm in-process run
+        pool_executor = web.simulation_executor
+        web.simulation_executor = memory_executor
+        try:
+            run()
+            tracemalloc.start()
+            run()
+            results['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+        finally:
+            web.simulation_executor = pool_executor
+
+    snapshot = BoardSnapshot.from_assistant(assistant, lambda name: web.get_player_projection(name, web.selected_scoring_format))
+    table, settings = snapshot.table, snapshot.settings
+    rosters = random_rosters(len(table), settings.roster_size, max(args.rosters, args.scalar_rosters * args.repeats), rng)
+    season = BatchDraftSimulator(table, settings)
+    weekly = BatchDraftSimulator(table, dataclasses.replace(settings, lineup_scoring=LINEUP_WEEKLY))
+    results['valuation_per_sec'] = rate(lambda: season._value_rosters(rosters[:args.rosters]), args.rosters, args.repeats)
+    results['weekly_valuation_per_sec'] = rate(lambda: weekly._value_rosters(rosters[:args.rosters]), args.rosters,
+                                               args.repeats)
+
+    # Unmemoized valuation, on fresh rosters every repeat so the lineup memo stays cold
+    scalar_batches = iter(np.split(rosters[:args.scalar_rosters * args.repeats], args.repeats))
+    results['scalar_valuation_per_sec'] = rate(lambda: [
+        web._value_roster_web_projections(assistant, [table.players[i] for i in roster], projection_cache)
+        for roster in next(scalar_batches)], args.scalar_rosters, args.repeats)
+    return {metric: round(value, 3) for metric, value in results.items()}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Metrics worse than the baseline by more than threshold (a fraction)."""
+    regressions = []
+    for board, metrics in results['boards'].items():
+        for metric, value in metrics.items():
+            before = baseline['boards'].get(board, {}).get(metric)
+            if not before:
+                continue
+            change = (value - before) / before
+            if (-change if HIGHER_IS_BETTER[metric] else change) > threshold:
+                regressions.append(f"{board} {metric}: {before} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='Baseline results file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed slowdown before --compare fails')
+    parser.add_argument('--boards', help='Only boards whose name contains this (e.g. 12t, late, deep)')
+    parser.add_argument('--budget', type=int, default=2000, help='Simulation budget per end-to-end run')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per measurement (median latency, best rate)')
+    parser.add_argument('--scalar-sims', type=int, default=20)
+    parser.add_argument('--rosters', type=int, default=16384, help='Rosters valued by the engine')
+    parser.add_argument('--scalar-rosters', type=int, default=200)
+    parser.add_argument('--scoring-format', default='non-ppr')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import fantasy_draft_web_enhanced as web
+    web.selected_scoring_format = args.scoring_format
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'cpus': os.cpu_count(),
+        'workers': web.simulation_executor.processes,
+        'memory_measurement': MEMORY_MEASUREMENT,
+        'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'boards': {}
+    }
+    memory_executor = SimulationExecutor(processes=1)
+    metrics = list(HIGHER_IS_BETTER)
+    print(f"{'board':<22} " + ' '.join(f"{metric[:14]:>14}" for metric in metrics))
+    for roster in ROSTERS:
+        for num_teams in TEAM_COUNTS:
+            for stage in STAGES:
+                name = f"{stage}-{num_teams}t-{roster}"
+                if args.boards and args.boards not in name:
+                    continue
+                board_results = bench_board(web, build_board(stage, num_teams, roster), args, memory_executor)
+                results['boards'][name] = board_results
+                print(f"{name:<22} " + ' '.join(f"{board_results[metric]:>14.1f}" for metric in metrics))
+    results['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"Wrote {args.output} (max RSS {results['max_rss_mb']} MB)")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        print(f"{len(regressions)} regressions against {args.compare} (commit {baseline.get('commit')})")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
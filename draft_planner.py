@@ -0,0 +1,281 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from simulation_engine import (BatchDraftSimulator, BoardSnapshot, BoardState, OTHER, POSITIONS, availability_hash,
+                               roster_signature)
+
+# User picks planned ahead (the current pick counts as the first)
+PLAN_DEPTH = 2
+MAX_PLAN_DEPTH = 3
+
+# Best positions kept at every branch before the next pick is expanded
+PLAN_BEAM = 3
+
+# Simulated drafts behind every branch
+PLAN_SIMULATIONS = 256
+
+# Rollout values remembered per (board, roster, pick) before the least recently used are evicted
+TRANSPOSITION_SIZE = 200000
+
+# Odd 64-bit multiplier that keeps roster signatures apart from availability hashes in a state key
+_ROSTER_KEY_MULTIPLIER = np.int64(-7046029254386353131)
+
+
+def state_keys(available: np.ndarray, roster: np.ndarray, pick: int) -> np.ndarray:
+    """64-bit key per draft for its board, the user's roster and the pick on the clock."""
+    with np.errstate(over='ignore'):
+        return (availability_hash(available) + roster_signature(roster, available.shape[1]) * _ROSTER_KEY_MULTIPLIER
+                + np.int64(pick))
+
+
+class TranspositionTable:
+    """LRU map from state_keys() to the rollout values seen from that state (sum, sum of squares and count).
+
+    Different plans and searches that reach the same draft state share its rollouts, so only
+    the extra samples a state still needs are simulated.
+    """
+
+    def __init__(self, max_entries: int = TRANSPOSITION_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[int, list]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def samples(self, keys: np.ndarray, needed: np.ndarray) -> np.ndarray:
+        """Rollouts already stored for each key; keys that have the samples they need count as hits."""
+        stored = np.array([self._entries[key][2] if key in self._entries else 0 for key in keys.tolist()],
+                          dtype=np.int64)
+        reused = int(np.count_nonzero(stored >= needed))
+        self.hits += reused
+        self.misses += len(keys) - reused
+        return stored
+
+    def add(self, keys: np.ndarray, values: np.ndarray):
+        for key, value in zip(keys.tolist(), values.tolist()):
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [0.0, 0.0, 0]
+            entry[0] += value
+            entry[1] += value * value
+            entry[2] += 1
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def moments(self, keys: np.ndarray) -> tuple:
+        """Mean and variance of the rollout values per key (every key must have been added)."""
+        means = np.empty(len(keys), dtype=np.float64)
+        variances = np.zeros(len(keys), dtype=np.float64)
+        for i, key in enumerate(keys.tolist()):
+            total, total_sq, count = self._entries[key]
+            means[i] = total / count
+            if count > 1:
+                variances[i] = max(0.0, (total_sq - total * means[i]) / (count - 1))
+            self._entries.move_to_end(key)
+        return means, variances
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'states': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+@dataclass
+class PlanNode:
+    """A branch of the plan: the positions taken at the user's picks so far and each draft's state."""
+    positions: tuple  # position code per planned pick
+    picks: tuple  # pick number of each planned pick
+    available: np.ndarray  # (sims, players) board after the last planned pick
+    team_sizes: np.ndarray
+    roster: np.ndarray  # (sims, slots) user roster, -1 for empty
+    players: np.ndarray  # player each draft took at the last planned pick
+    values: Optional[np.ndarray] = None  # rollout value per draft (the mean over its state's rollouts)
+    variances: Optional[np.ndarray] = None  # rollout variance of each draft's state
+    children: List['PlanNode'] = field(default_factory=list)
+
+    @property
+    def mean(self) -> float:
+        return float(self.values.mean()) if self.values is not None else float('-inf')
+
+    @property
+    def std_error(self) -> float:
+        """Standard error of the expected value, counting rollout noise within states as well as between them.
+
+        Drafts that share a state (every draft at the first pick) share its mean, so the spread of
+        values alone would understate the error there.
+        """
+        if self.values is None or len(self.values) < 2:
+            return 0.0
+        variance = self.values.var(ddof=1) + self.variances.mean()
+        return float(np.sqrt(variance / len(self.values)))
+
+
+class DraftPlanner:
+    """Searches the user's next few picks by position ("RB now, WR at 4.08").
+
+    Every branch drafts the best-ADP player at its position in each simulated draft, the
+    opponents move between the user's picks, and the rest of the draft is a rollout with the
+    simulated user policy. Branches at the same depth share their opponent scenarios, so their
+    values are compared on common random numbers. Branches are expanded best first with a
+    beam, and rollout values live in a transposition table keyed by board, roster and pick so
+    states reached by several plans or searches are only simulated once.
+    """
+
+    def __init__(self, snapshot: BoardSnapshot):
+        self.table = snapshot.table
+        self.settings = snapshot.settings
+        self.simulator = BatchDraftSimulator(snapshot.table, snapshot.settings)
+        self.transpositions = TranspositionTable()
+        self._lock = threading.Lock()
+
+    def compatible(self, snapshot: BoardSnapshot) -> bool:
+        # Same league settings and projections, so stored rollouts are still valid
+        table = snapshot.table
+        return (snapshot.settings == self.settings and table.names == self.table.names
+                and np.array_equal(table.projection, self.table.projection)
+                and (table.weekly is None) == (self.table.weekly is None)
+                and (table.weekly is None or np.array_equal(table.weekly, self.table.weekly)))
+
+    def plan(self, board: BoardState, depth: int = PLAN_DEPTH, beam: int = PLAN_BEAM,
+             num_sims: int = PLAN_SIMULATIONS, seed: Optional[int] = None) -> PlanNode:
+        """Search plans for the user's next depth picks (starting with the current one if it is theirs).
+
+        Returns the root node; node.children are ranked best first.
+        """
+        with self._lock:
+            seed = int(np.random.SeedSequence().entropy % (2 ** 32)) if seed is None else seed
+            settings = self.settings
+            picks = [pick for pick in range(board.current_pick, self.simulator.last_user_pick + 1)
+                     if settings.draft_order[pick - 1] == settings.user_team]
+            if not picks:
+                raise ValueError('The user has no picks left to plan')
+            depth = max(1, min(depth, MAX_PLAN_DEPTH, len(picks)))
+
+            width = max(self.settings.roster_size, len(board.user_roster)) + 1
+            roster = np.full((num_sims, width), -1, dtype=np.int32)
+            roster[:, :len(board.user_roster)] = board.user_roster
+            root = PlanNode((), (), np.repeat(board.available[None, :], num_sims, axis=0),
+                            np.repeat(board.team_sizes[None, :].astype(np.int32), num_sims, axis=0),
+                            roster, np.full(num_sims, -1, dtype=np.int64))
+
+            frontier = [root]
+            for level in range(depth):
+                pick = picks[level]
+                start = picks[level - 1] + 1 if level else board.current_pick
+                if start < pick:
+                    # Opponents up to the user's pick, same scenarios for every branch
+                    for node in frontier:
+                        self.simulator.advance_states(node.available, node.team_sizes, start, pick,
+                                                      np.random.default_rng([seed, level]))
+                next_frontier = []
+                for node in frontier:
+                    for code in range(len(POSITIONS)):
+                        if code == OTHER or not (node.available & (self.table.position == code)).any():
+                            continue
+                        child = self._take(node, code, pick)
+                        # Same rollout seed for every branch at a depth, so their scenarios line up
+                        child.values, child.variances = self._evaluate(child, pick + 1,
+                                                                       np.random.default_rng([seed, level, 1]))
+                        node.children.append(child)
+                    node.children.sort(key=lambda child: child.mean, reverse=True)
+                    del node.children[beam:]
+                    next_frontier.extend(node.children)
+                frontier = next_frontier
+            return root
+
+    def _take(self, node: PlanNode, code: int, pick: int) -> PlanNode:
+        # Best-ADP player at the position in every draft (table rows are in ADP order)
+        available = node.available.copy()
+        rows = np.arange(len(available))
+        at_position = available & (self.table.position == code)
+        players = np.where(at_position.any(axis=1), at_position.argmax(axis=1), available.argmax(axis=1))
+        available[rows, players] = False
+        team_sizes = node.team_sizes.copy()
+        team_sizes[:, self.settings.user_team] += 1
+        roster = node.roster.copy()
+        roster[rows, (roster >= 0).sum(axis=1)] = players
+        return PlanNode(node.positions + (code,), node.picks + (pick,), available, team_sizes, roster, players)
+
+    def _evaluate(self, node: PlanNode, first_pick: int, rng: np.random.Generator) -> tuple:
+        """Rollout mean and variance for every draft in a branch, simulating only what the table is missing."""
+        keys = state_keys(node.available, node.roster, first_pick)
+        unique, first, inverse, needed = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+        # Each draft in the branch needs its own rollout, unless earlier plans already ran them
+        missing = np.maximum(needed - self.transpositions.samples(unique, needed), 0)
+        if missing.any():
+            rows = np.repeat(first, missing)
+            values = self.simulator.run_states(node.available[rows], node.team_sizes[rows], node.roster[rows],
+                                               first_pick, rng)
+            self.transpositions.add(np.repeat(unique, missing), values)
+        means, variances = self.transpositions.moments(unique)
+        inverse = inverse.reshape(-1)
+        return means[inverse], variances[inverse]
+
+
+def plan_summary(node: PlanNode, table, pick_label) -> dict:
+    """JSON-ready branch: position, pick, the players it drafted and its expected value."""
+    players, counts = np.unique(node.players, return_counts=True)
+    order = np.argsort(-counts, kind='stable')[:3]
+    return {
+        'position': POSITIONS[node.positions[-1]],
+        'pick': node.picks[-1],
+        'label': pick_label(node.picks[-1]),
+        'players': [{'name': table.names[players[i]], 'share': round(float(counts[i] / len(node.players)), 3)}
+                    for i in order],
+        'expected_value': node.mean,
+        'std_error': node.std_error,
+        'simulations': int(len(node.values)),
+        'children': [plan_summary(child, table, pick_label) for child in node.children]
+    }
+
+
+def best_plan(root: PlanNode) -> List[PlanNode]:
+    """Branches of the best plan: the best child at every level down to the deepest pick."""
+    plan, node = [], root
+    while node.children:
+        deepest = max(node.children, key=lambda child: _best_leaf(child).mean)
+        plan.append(deepest)
+        node = deepest
+    return plan
+
+
+def _best_leaf(node: PlanNode) -> PlanNode:
+    if not node.children:
+        return node
+    return max((_best_leaf(child) for child in node.children), key=lambda leaf: leaf.mean)
+
+
+class PlannerStore:
+    """Keeps one planner, and its transposition table, while the league and projections stay the same."""
+
+    def __init__(self):
+        self._planner: Optional[DraftPlanner] = None
+        self._lock = threading.Lock()
+
+    def get(self, snapshot: BoardSnapshot) -> DraftPlanner:
+        with self._lock:
+            if self._planner is None or not self._planner.compatible(snapshot):
+                self._planner = DraftPlanner(snapshot)
+            return self._planner
+
+    def clear(self):
+        with self._lock:
+            self._planner = None
+
+
+# Global instance
+planner_store = PlannerStore()
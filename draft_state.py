@@ -0,0 +1,91 @@
+import numpy as np
+from typing import Optional, Sequence
+
+
+class DraftState:
+    """Compact draft board keyed by integer player IDs.
+
+    Availability flags, every team's roster slots, the roster lengths and the current pick all
+    live in one int32 buffer, so forking a board for a simulation is a single copy.
+    """
+
+    def __init__(self, num_players: int, num_teams: int, roster_size: int, current_pick: int = 1,
+                 buffer: Optional[np.ndarray] = None):
+        self.num_players = num_players
+        self.num_teams = num_teams
+        self.roster_size = roster_size
+        if buffer is None:
+            buffer = np.zeros(num_players + num_teams * (roster_size + 1) + 1, dtype=np.int32)
+            buffer[:num_players] = 1
+            buffer[-1] = current_pick
+        self.buffer = buffer
+        self._bind_views()
+
+    def _bind_views(self):
+        # Layout: [available x players | roster slots x teams x roster_size | roster lengths x teams | current pick]
+        players, teams, size = self.num_players, self.num_teams, self.roster_size
+        self.available = self.buffer[:players]
+        self.rosters = self.buffer[players:players + teams * size].reshape(teams, size)
+        self.roster_lengths = self.buffer[players + teams * size:players + teams * (size + 1)]
+
+    @classmethod
+    def from_rosters(cls, num_players: int, rosters: Sequence[Sequence[int]], roster_size: int,
+                     current_pick: int = 1, available: Optional[Sequence[int]] = None) -> 'DraftState':
+        """Build a board from per-team lists of drafted player IDs."""
+        roster_size = max([roster_size] + [len(roster) for roster in rosters])
+        state = cls(num_players, len(rosters), roster_size, current_pick)
+        if available is not None:
+            state.available[:] = 0
+            state.available[list(available)] = 1
+        for team, roster in enumerate(rosters):
+            for player_id in roster:
+                state.rosters[team, state.roster_lengths[team]] = player_id
+                state.roster_lengths[team] += 1
+                if available is None:
+                    state.available[player_id] = 0
+        return state
+
+    @property
+    def current_pick(self) -> int:
+        return int(self.buffer[-1])
+
+    @current_pick.setter
+    def current_pick(self, pick: int):
+        self.buffer[-1] = pick
+
+    def fork(self) -> 'DraftState':
+        """Independent copy of this board for a simulation."""
+        return DraftState(self.num_players, self.num_teams, self.roster_size, buffer=self.buffer.copy())
+
+    def draft(self, player_id: int, team: int):
+        """Move a player from the pool onto a team's roster."""
+        length = self.roster_lengths[team]
+        if length >= self.roster_size:
+            self._grow()
+        self.rosters[team, length] = player_id
+        self.roster_lengths[team] = length + 1
+        self.available[player_id] = 0
+
+    def _grow(self):
+        # Teams can be handed more players than the roster size (e.g. picks beyond the draft order)
+        grown = DraftState(self.num_players, self.num_teams, self.roster_size * 2, self.current_pick)
+        grown.available[:] = self.available
+        grown.rosters[:, :self.roster_size] = self.rosters
+        grown.roster_lengths[:] = self.roster_lengths
+        self.roster_size = grown.roster_size
+        self.buffer = grown.buffer
+        self._bind_views()
+
+    def is_available(self, player_id: int) -> bool:
+        return bool(self.available[player_id])
+
+    def available_ids(self) -> np.ndarray:
+        """IDs of undrafted players in ascending order."""
+        return np.flatnonzero(self.available)
+
+    def roster(self, team: int) -> np.ndarray:
+        """Player IDs on a team's roster in draft order."""
+        return self.rosters[team, :self.roster_lengths[team]]
+
+    def roster_length(self, team: int) -> int:
+        return int(self.roster_lengths[team])
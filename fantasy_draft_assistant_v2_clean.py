@@ -2,9 +2,27 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 import json
+import os
 from dataclasses import dataclass
 from collections import defaultdict
-import random
+from functools import wraps
+import threading
+
+from draft_state import DraftState
+from roster_tracker import RosterNeedsTracker
+from weekly_projections import WeeklyProjectionStore, WEEKLY_PROJECTIONS_CSV
+from lineup_optimizer import SLOT_ELIGIBILITY, canonical_position, optimal_lineup
+from simulation_engine import (OPPONENT_ADP_WINDOW, OPPONENT_NOISY_ADP, SEASON_WEEKS, engine_lineup_slots,
+                               noisy_adp_order, position_code, weekly_lineup_points)
+
+
+def synchronized(method):
+    """Run an assistant method while holding its draft lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 @dataclass(frozen=True)
 class Player:
@@ -14,7 +32,6 @@ class Player:
     adp: float
     bye_week: int
     projected_points: float
-    weekly_projections: tuple
     
     def __str__(self):
         return f"{self.name} ({self.position}, {self.team}) - ADP: {self.adp:.1f}, Proj: {self.projected_points:.1f}"
@@ -23,10 +40,16 @@ class FantasyDraftAssistant:
     def __init__(self, csv_file_path: str):
         """Initialize the fantasy draft assistant with player data from CSV."""
         self.csv_file_path = csv_file_path
+        # Guards draft state so simulations can snapshot it while picks keep arriving
+        self.lock = threading.RLock()
         self.players = []
         self.raw_stats = {}  # Store raw FantasyPros stats for customization
         self.load_players()
         
+        # Weekly projections per scoring format, rows in player ID (ADP) order like the board
+        self.weekly_projections = WeeklyProjectionStore([p.name for p in sorted(self.players, key=lambda p: p.adp)])
+        self._load_weekly_projections()
+        
         # League settings (configurable)
         self.num_teams = 12
         self.user_draft_position = 0  # Will be set when draft is initialized
@@ -69,6 +92,11 @@ class FantasyDraftAssistant:
         self.scoring_format = 'non-ppr'  # Default scoring format
         
         self._generate_draft_order()
+        
+        # Compact integer-ID board mirrored from drafted_players/available_players
+        # board_version changes on every pick or rebuild so background results can spot a stale board
+        self.board_version = 0
+        self.reset_board()
     
     def get_player_raw_stats(self, player_name: str) -> dict:
         """Get raw stats for a player from FantasyPros data."""
@@ -85,11 +113,30 @@ class FantasyDraftAssistant:
             self.custom_stats = custom_stats
         else:
             self.custom_stats = {}
+        self.weekly_projections.clear_flat()
+    
+    def _load_weekly_projections(self):
+        """Load weekly projections if a weekly projections CSV is present."""
+        if not os.path.exists(WEEKLY_PROJECTIONS_CSV):
+            return
+        try:
+            loaded = self.weekly_projections.load_csv(WEEKLY_PROJECTIONS_CSV)
+            print(f"Loaded weekly projections for {loaded} players from {WEEKLY_PROJECTIONS_CSV}")
+        except Exception as e:
+            print(f"Error loading weekly projections CSV: {e}")
+    
+    def get_weekly_projections(self, scoring_format: Optional[str] = None) -> np.ndarray:
+        """(player ID x week) float32 projections for a scoring format (default: the current one)."""
+        scoring_format = scoring_format or self.scoring_format
+        players = sorted(self.players, key=lambda p: p.adp)
+        return self.weekly_projections.matrix(
+            scoring_format, lambda: [self.get_player_projected_points(p, scoring_format) for p in players])
     
     def set_scoring_format(self, scoring_format: str):
         """Set the scoring format for the draft assistant."""
         self.scoring_format = scoring_format
     
+    @synchronized
     def set_user_draft_position(self, position: int):
         """Set the user's draft position (1-based)."""
         if 1 <= position <= self.num_teams:
@@ -98,6 +145,7 @@ class FantasyDraftAssistant:
         else:
             raise ValueError(f"Invalid draft position: {position}. Must be between 1 and {self.num_teams}")
     
+    @synchronized
     def set_num_teams(self, num_teams: int):
         """Set the number of teams in the draft."""
         if num_teams < 2 or num_teams > 20:
@@ -116,16 +164,19 @@ class FantasyDraftAssistant:
         
         # Regenerate draft order
         self._generate_draft_order()
+        self.reset_board()
     
+    @synchronized
     def set_roster_constraints(self, roster_constraints: dict):
         """Set custom roster constraints for the league."""
-        # Update the roster constraints
+        # Update the roster constraints (multi-position slots like SUPERFLEX can be added)
         for position, count in roster_constraints.items():
-            if position in self.roster_constraints:
+            if position in self.roster_constraints or position in SLOT_ELIGIBILITY:
                 self.roster_constraints[position] = count
         
         # Regenerate draft order since roster constraints changed
         self._generate_draft_order()
+        self.reset_board()
         print(f"Updated roster constraints: {self.roster_constraints}")
     
     def get_player_projected_points(self, player: Player, scoring_format: Optional[str] = None) -> float:
@@ -364,8 +415,7 @@ class FantasyDraftAssistant:
                             team=team,
                             adp=adp,
                             bye_week=bye_week,
-                            projected_points=projected_points,
-                            weekly_projections=tuple([projected_points/17] * 18)
+                            projected_points=projected_points
                         )
                         all_players.append(player)
                         
@@ -541,47 +591,47 @@ class FantasyDraftAssistant:
         """Create sample player data if CSV loading fails."""
         sample_players = [
             # QBs
-            Player("Patrick Mahomes", "QB", "KC", 21.0, 10, 364.1, tuple([21.4] * 18)),
-            Player("Josh Allen", "QB", "BUF", 23.5, 7, 371.1, tuple([21.8] * 18)),
-            Player("Jalen Hurts", "QB", "PHI", 25.0, 9, 350.2, tuple([20.6] * 18)),
-            Player("Lamar Jackson", "QB", "BAL", 28.0, 13, 340.5, tuple([20.0] * 18)),
-            Player("Justin Herbert", "QB", "LAC", 30.0, 5, 330.8, tuple([19.5] * 18)),
+            Player("Patrick Mahomes", "QB", "KC", 21.0, 10, 364.1),
+            Player("Josh Allen", "QB", "BUF", 23.5, 7, 371.1),
+            Player("Jalen Hurts", "QB", "PHI", 25.0, 9, 350.2),
+            Player("Lamar Jackson", "QB", "BAL", 28.0, 13, 340.5),
+            Player("Justin Herbert", "QB", "LAC", 30.0, 5, 330.8),
             
             # RBs
-            Player("Christian McCaffrey", "RB", "SF", 9.5, 14, 203.1, tuple([11.9] * 18)),
-            Player("Saquon Barkley", "RB", "PHI", 3.0, 9, 259.9, tuple([15.3] * 18)),
-            Player("Bijan Robinson", "RB", "ATL", 5.0, 11, 245.6, tuple([14.4] * 18)),
-            Player("Jonathan Taylor", "RB", "IND", 8.0, 11, 235.2, tuple([13.8] * 18)),
-            Player("Derrick Henry", "RB", "BAL", 12.0, 13, 225.8, tuple([13.3] * 18)),
-            Player("Nick Chubb", "RB", "CLE", 15.0, 5, 215.4, tuple([12.7] * 18)),
-            Player("Austin Ekeler", "RB", "WAS", 18.0, 7, 205.1, tuple([12.1] * 18)),
+            Player("Christian McCaffrey", "RB", "SF", 9.5, 14, 203.1),
+            Player("Saquon Barkley", "RB", "PHI", 3.0, 9, 259.9),
+            Player("Bijan Robinson", "RB", "ATL", 5.0, 11, 245.6),
+            Player("Jonathan Taylor", "RB", "IND", 8.0, 11, 235.2),
+            Player("Derrick Henry", "RB", "BAL", 12.0, 13, 225.8),
+            Player("Nick Chubb", "RB", "CLE", 15.0, 5, 215.4),
+            Player("Austin Ekeler", "RB", "WAS", 18.0, 7, 205.1),
             
             # WRs
-            Player("Ja'Marr Chase", "WR", "CIN", 1.0, 10, 226.1, tuple([13.3] * 18)),
-            Player("Justin Jefferson", "WR", "MIN", 4.5, 6, 196.3, tuple([11.5] * 18)),
-            Player("Tyreek Hill", "WR", "MIA", 6.0, 10, 185.7, tuple([10.9] * 18)),
-            Player("CeeDee Lamb", "WR", "DAL", 7.0, 7, 175.2, tuple([10.3] * 18)),
-            Player("Amon-Ra St. Brown", "WR", "DET", 10.0, 9, 165.8, tuple([9.8] * 18)),
-            Player("Davante Adams", "WR", "LV", 13.0, 13, 155.4, tuple([9.1] * 18)),
-            Player("Stefon Diggs", "WR", "HOU", 16.0, 7, 145.1, tuple([8.5] * 18)),
-            Player("AJ Brown", "WR", "PHI", 19.0, 9, 135.7, tuple([8.0] * 18)),
+            Player("Ja'Marr Chase", "WR", "CIN", 1.0, 10, 226.1),
+            Player("Justin Jefferson", "WR", "MIN", 4.5, 6, 196.3),
+            Player("Tyreek Hill", "WR", "MIA", 6.0, 10, 185.7),
+            Player("CeeDee Lamb", "WR", "DAL", 7.0, 7, 175.2),
+            Player("Amon-Ra St. Brown", "WR", "DET", 10.0, 9, 165.8),
+            Player("Davante Adams", "WR", "LV", 13.0, 13, 155.4),
+            Player("Stefon Diggs", "WR", "HOU", 16.0, 7, 145.1),
+            Player("AJ Brown", "WR", "PHI", 19.0, 9, 135.7),
             
             # TEs
-            Player("Travis Kelce", "TE", "KC", 78.0, 10, 104.6, tuple([6.2] * 18)),
-            Player("George Kittle", "TE", "SF", 43.5, 14, 149.6, tuple([8.8] * 18)),
-            Player("Mark Andrews", "TE", "BAL", 50.0, 13, 140.2, tuple([8.2] * 18)),
-            Player("T.J. Hockenson", "TE", "MIN", 55.0, 6, 130.8, tuple([7.7] * 18)),
-            Player("Sam LaPorta", "TE", "DET", 60.0, 9, 120.4, tuple([7.1] * 18)),
+            Player("Travis Kelce", "TE", "KC", 78.0, 10, 104.6),
+            Player("George Kittle", "TE", "SF", 43.5, 14, 149.6),
+            Player("Mark Andrews", "TE", "BAL", 50.0, 13, 140.2),
+            Player("T.J. Hockenson", "TE", "MIN", 55.0, 6, 130.8),
+            Player("Sam LaPorta", "TE", "DET", 60.0, 9, 120.4),
             
             # Ks
-            Player("Justin Tucker", "K", "BAL", 120.0, 13, 150.0, tuple([8.8] * 18)),
-            Player("Harrison Butker", "K", "KC", 125.0, 10, 145.0, tuple([8.5] * 18)),
-            Player("Evan McPherson", "K", "CIN", 130.0, 10, 140.0, tuple([8.2] * 18)),
+            Player("Justin Tucker", "K", "BAL", 120.0, 13, 150.0),
+            Player("Harrison Butker", "K", "KC", 125.0, 10, 145.0),
+            Player("Evan McPherson", "K", "CIN", 130.0, 10, 140.0),
             
             # DEFs
-            Player("San Francisco 49ers", "DEF", "SF", 140.0, 14, 180.0, tuple([10.6] * 18)),
-            Player("Dallas Cowboys", "DEF", "DAL", 145.0, 7, 175.0, tuple([10.3] * 18)),
-            Player("Buffalo Bills", "DEF", "BUF", 150.0, 7, 170.0, tuple([10.0] * 18)),
+            Player("San Francisco 49ers", "DEF", "SF", 140.0, 14, 180.0),
+            Player("Dallas Cowboys", "DEF", "DAL", 145.0, 7, 175.0),
+            Player("Buffalo Bills", "DEF", "BUF", 150.0, 7, 170.0),
         ]
         self.players = sample_players
         print("Created sample player data")
@@ -605,6 +655,23 @@ class FantasyDraftAssistant:
         # Update total picks
         self.total_picks = len(self.draft_order)
     
+    def get_user_pick_numbers(self, start_pick: int = 1) -> List[int]:
+        """Get the user's pick numbers from start_pick to the end of the draft order."""
+        return [pick for pick, (round_num, team_id) in enumerate(self.draft_order, 1)
+                if pick >= start_pick and team_id == self.user_draft_position]
+
+    def get_user_last_relevant_pick(self, start_pick: int, roster_size_used: int) -> int:
+        """Get the last pick that can still change the user's roster.
+
+        The user's roster is full after their next (roster size - roster_size_used) picks,
+        so anything drafted after that pick cannot change the user's season score.
+        """
+        remaining_slots = sum(self.roster_constraints.values()) - roster_size_used
+        user_picks = self.get_user_pick_numbers(start_pick)
+        if remaining_slots <= 0 or not user_picks:
+            return start_pick - 1
+        return user_picks[min(remaining_slots, len(user_picks)) - 1]
+
     def get_current_pick_info(self) -> Dict:
         """Get information about the current pick."""
         # If draft is not initialized, return a status indicating it's not started
@@ -657,6 +724,7 @@ class FantasyDraftAssistant:
         
         return matches
     
+    @synchronized
     def draft_player(self, player_name: str, team_id: Optional[str] = None) -> bool:
         """Draft a player for the specified team (or current team if not specified)."""
         # Normalize player name for comparison
@@ -689,6 +757,9 @@ class FantasyDraftAssistant:
         # Add player to team
         self.drafted_players[team_id].append(player)
         self.available_players.remove(player)
+        self.board.draft(self.player_ids[player], self.teams.index(team_id))
+        self.roster_trackers[team_id].add(player.position)
+        self.board_version += 1
         
         # Record the pick with correct round and pick information
         if self.current_pick <= len(self.draft_order):
@@ -752,58 +823,13 @@ class FantasyDraftAssistant:
     
     def get_roster_needs(self, team_name: str) -> Dict[str, int]:
         """Get the roster needs for a specific team, considering bench constraints."""
-        current_roster = self.drafted_players[team_name]
-        position_counts = defaultdict(int)
-        
-        for player in current_roster:
-            position_counts[player.position] += 1
-        
-        # Calculate how many players are actually starters vs bench
-        # First, determine which players fill starting positions
-        starters = []
-        bench_players = []
+        # The team's tracker already knows its position counts, FLEX usage and bench
+        tracker = self.roster_trackers[team_name]
+        bench_available = tracker.bench_available
         
-        # Track filled positions to determine who goes to bench
-        filled_positions = {
-            'QB': 0,
-            'WR': 0, 
-            'RB': 0,
-            'TE': 0,
-            'FLEX': 0,
-            'K': 0,
-            'DEF': 0
-        }
-        
-        # Sort players by projected points to prioritize starters
-        sorted_roster = sorted(current_roster, key=lambda p: p.projected_points, reverse=True)
-        
-        for player in sorted_roster:
-            pos = player.position
-            
-            # Check if we can fill a starting position
-            if pos in filled_positions and filled_positions[pos] < self.roster_constraints.get(pos, 0):
-                # Fill starting position
-                filled_positions[pos] += 1
-                starters.append(player)
-            elif pos in ['RB', 'WR', 'TE'] and filled_positions['FLEX'] < self.roster_constraints.get('FLEX', 0):
-                # Fill FLEX position
-                filled_positions['FLEX'] += 1
-                starters.append(player)
-            else:
-                # Player goes to bench
-                bench_players.append(player)
-        
-        # Calculate total bench spots used (only actual bench players)
-        bench_used = len(bench_players)
-        bench_available = max(0, self.roster_constraints.get('BN', 6) - bench_used)
-        
-        # Calculate needs for starting positions
-        needs = {}
-        for position, max_count in self.roster_constraints.items():
-            if position == 'FLEX':
-                continue
-            current = position_counts.get(position, 0)
-            needs[position] = max(0, max_count - current)
+        # Calculate needs for starting positions, then open FLEX/SUPERFLEX-style slots
+        needs = tracker.position_needs()
+        needs.update(tracker.open_flex_slots())
         
         # Add bench availability
         if bench_available > 0:
@@ -847,53 +873,29 @@ class FantasyDraftAssistant:
         # Filter out players on bye
         available = [p for p in roster if p.bye_week != week]
         
-        # Sort by weekly projection
-        available.sort(key=lambda p: p.weekly_projections[week-1] if week <= len(p.weekly_projections) else 0, reverse=True)
+        # Best lineup for the week's projections
+        weekly = self.get_weekly_projections()
+        in_season = week <= weekly.shape[1]
+        starters, _ = optimal_lineup(self.roster_constraints, available,
+                                     [weekly[self.player_ids[p], week-1] if in_season else 0 for p in available])
         
+        # Slots with several starters are numbered (WR1, WR2)
         lineup = {}
-        
-        # Fill QB, K, DEF
-        for pos in ['QB', 'K', 'DEF']:
-            for player in available:
-                if player.position == pos and pos not in lineup:
-                    lineup[pos] = player
-                    break
-        
-        # Fill WR, RB, TE, FLEX
-        wr_count = 0
-        rb_count = 0
-        te_count = 0
-        flex_filled = False
-        
-        for player in available:
-            if player in lineup.values():
-                continue
-                
-            if player.position == 'WR' and wr_count < self.roster_constraints['WR']:
-                lineup[f'WR{wr_count + 1}'] = player
-                wr_count += 1
-            elif player.position == 'RB' and rb_count < self.roster_constraints['RB']:
-                lineup[f'RB{rb_count + 1}'] = player
-                rb_count += 1
-            elif player.position == 'TE' and te_count < self.roster_constraints['TE']:
-                lineup['TE'] = player
-                te_count += 1
-            elif not flex_filled and player.position in ['RB', 'WR', 'TE']:
-                lineup['FLEX'] = player
-                flex_filled = True
+        filled = defaultdict(int)
+        for slot, player in starters:
+            filled[slot] += 1
+            lineup[f'{slot}{filled[slot]}' if self.roster_constraints.get(slot, 1) > 1 else slot] = player
         
         return lineup
     
     def calculate_team_score(self, team_name: str, week: int) -> float:
         """Calculate the projected score for a team in a specific week."""
         lineup = self.get_optimal_lineup(team_name, week)
-        total_score = 0.0
-        
-        for position, player in lineup.items():
-            if week <= len(player.weekly_projections):
-                total_score += player.weekly_projections[week-1]
+        weekly = self.get_weekly_projections()
+        if week > weekly.shape[1]:
+            return 0.0
         
-        return total_score
+        return float(weekly[[self.player_ids[player] for player in lineup.values()], week-1].sum())
     
     def calculate_season_score(self, team_name: str) -> float:
         """Calculate the projected season score for a team."""
@@ -902,8 +904,12 @@ class FantasyDraftAssistant:
             total_score += self.calculate_team_score(team_name, week)
         return total_score
     
-    def run_simulations(self, num_recommendations: int = 5) -> List[Dict]:
-        """Run optimized simulations to generate recommendations."""
+    def run_simulations(self, num_recommendations: int = 5, seed: Optional[int] = None) -> List[Dict]:
+        """Run optimized simulations to generate recommendations.
+
+        Simulation i of every position runs on the i-th stream spawned from seed, so a seeded
+        call is reproducible and the positions are compared on the same random numbers.
+        """
         if not self.draft_initialized:
             return []
         
@@ -926,6 +932,7 @@ class FantasyDraftAssistant:
         player_scores = {}
         
         print(f"Running simulations for top 1 player at each position...")
+        sim_seeds = np.random.SeedSequence(seed).spawn(50)
         
         for position, top_player in top_players_by_position.items():
             scores = []
@@ -934,7 +941,7 @@ class FantasyDraftAssistant:
             # Run 50 simulations for the top player at this position
             for sim in range(50):
                 try:
-                    score = self._simulate_draft_with_player_simple(top_player)
+                    score = self._simulate_draft_with_player_simple(top_player, rng=np.random.default_rng(sim_seeds[sim]))
                     scores.append(score)
                     successful_sims += 1
                 except Exception as e:
@@ -1037,66 +1044,67 @@ class FantasyDraftAssistant:
         self._cached_recommendations = recommendations
         return recommendations
     
-    def _simulate_draft_with_player_simple(self, candidate_player: Player) -> float:
+    def _simulate_draft_with_player_simple(self, candidate_player: Player, truncate_horizon: bool = True,
+                                           opponent_model: str = OPPONENT_ADP_WINDOW,
+                                           rng: Optional[np.random.Generator] = None) -> float:
         """
         Pure simulation: Draft the candidate player, then use ADP for remaining picks.
         Calculate season score by summing projected points for optimal lineup each week.
+        With truncate_horizon the simulation stops once the user's roster can no longer change.
+        opponent_model picks 'adp_window' (re-rank every pick) or 'noisy_adp' (one noisy ADP order per draft).
+        rng drives every random choice, so a seeded one replays the same draft.
         """
-        # Save current state
-        original_drafted_players = {team: roster.copy() for team, roster in self.drafted_players.items()}
-        original_available_players = set(self.available_players)
-        original_pick = self.current_pick
-        
-        # Setup sim state
-        sim_drafted_players = {team: roster.copy() for team, roster in self.drafted_players.items()}
-        sim_available_players = set(self.available_players)
-        sim_pick = self.current_pick
+        rng = rng if rng is not None else np.random.default_rng()
+        # Fork the compact board; the simulation only ever touches the copy
+        with self.lock:
+            sim_board = self.board.fork()
+            sim_pick = self.current_pick
+        user_team = self.user_draft_position - 1
         
         try:
             # Draft the candidate player
-            team_name = self.teams[self.user_draft_position - 1]
-            sim_drafted_players[team_name].append(candidate_player)
-            sim_available_players.remove(candidate_player)
+            sim_board.draft(self.player_ids[candidate_player], user_team)
             sim_pick += 1
             
+            # Noisy ADP opponents walk one perturbed ranking drawn up front
+            opponent_order = noisy_adp_order(sim_board.available_ids(), rng) if opponent_model == OPPONENT_NOISY_ADP else None
+            opponent_index = 0
+            
+            # Picks after the user's last relevant pick cannot change the user's season score
+            last_pick = self.total_picks
+            if truncate_horizon:
+                last_pick = self.get_user_last_relevant_pick(sim_pick, sim_board.roster_length(user_team))
+            
+            total_roster_size = sum(self.roster_constraints.values())
+            
             # Simulate the rest of the draft using ADP
-            while sim_pick <= self.total_picks:
+            while sim_pick <= last_pick:
                 # Determine which team is picking using snake draft logic
                 if sim_pick <= len(self.draft_order):
                     round_num, team_id = self.draft_order[sim_pick - 1]
-                    team_name = self.teams[team_id - 1]
+                    team_index = team_id - 1
                 else:
                     # Fallback for picks beyond draft order
                     team_index = (sim_pick - 1) % self.num_teams
-                    team_name = self.teams[team_index]
                 
                 # Check if team has roster space
-                team_roster = sim_drafted_players[team_name]
-                total_roster_size = sum(self.roster_constraints.values())
-                
-                if len(team_roster) >= total_roster_size:
+                if sim_board.roster_length(team_index) >= total_roster_size:
                     # Team is full, skip this pick
                     sim_pick += 1
                     continue
                 
-                # If it's the user's turn, use smart strategy
-                if sim_pick <= len(self.draft_order):
-                    round_num, team_id = self.draft_order[sim_pick - 1]
-                    is_user_turn = (team_id == self.user_draft_position)
-                else:
-                    # Fallback for picks beyond draft order
-                    team_index = (sim_pick - 1) % self.num_teams
-                    is_user_turn = (team_index == self.user_draft_position - 1)
-                
-                if is_user_turn:
+                if team_index == user_team:
                     # Get roster needs for user team
+                    team_roster = self.get_roster_from_board(sim_board, user_team)
                     roster_needs = self._get_roster_needs_for_simulation(team_roster)
                     
                     # Find best available player considering roster needs and bench constraints
                     best_player = None
                     best_score = -1
                     
-                    for player in sorted(sim_available_players, key=lambda p: p.adp):
+                    # Board IDs follow ADP order
+                    for player_id in sim_board.available_ids():
+                        player = self.player_by_id[player_id]
                         # Check if this player fills a need
                         need_bonus = 0
                         position_need = roster_needs.get(player.position, 0)
@@ -1121,38 +1129,39 @@ class FantasyDraftAssistant:
                             continue
                         
                         # Calculate player value (ADP-based with some variance)
-                        # Use custom projections if available
-                        player_projected = self.get_player_projected_points(player, self.scoring_format)
-                        player_value = (200 - player.adp) + need_bonus + random.randint(-10, 10)
+                        player_value = (200 - player.adp) + need_bonus + int(rng.integers(-10, 11))
                         
                         if player_value > best_score:
                             best_score = player_value
-                            best_player = player
+                            best_player = player_id
                     
-                    if best_player:
-                        sim_drafted_players[team_name].append(best_player)
-                        sim_available_players.remove(best_player)
-                    else:
-                        # No suitable player found, skip this pick
-                        pass
+                    if best_player is not None:
+                        sim_board.draft(best_player, user_team)
+                    elif truncate_horizon:
+                        # No suitable player found, skip this pick and wait for a later user pick
+                        last_pick = self.get_user_last_relevant_pick(sim_pick + 1, len(team_roster))
+                elif opponent_order is not None:
+                    # Other teams take the next available player in this draft's noisy ADP order
+                    while opponent_index < len(opponent_order) and not sim_board.is_available(opponent_order[opponent_index]):
+                        opponent_index += 1
+                    if opponent_index < len(opponent_order):
+                        sim_board.draft(opponent_order[opponent_index], team_index)
                 else:
                     # Other teams use ADP with some variance
-                    available_sorted = sorted(sim_available_players, key=lambda p: p.adp)
-                    if available_sorted:
+                    available_sorted = sim_board.available_ids()
+                    if len(available_sorted):
                         # 70% chance to follow ADP closely, 30% chance for variance
-                        if random.random() < 0.7:
+                        if rng.random() < 0.7:
                             pick_index = 0
                         else:
-                            pick_index = min(random.randint(0, 5), len(available_sorted) - 1)
+                            pick_index = min(int(rng.integers(0, 6)), len(available_sorted) - 1)
                         
-                        picked_player = available_sorted[pick_index]
-                        sim_drafted_players[team_name].append(picked_player)
-                        sim_available_players.remove(picked_player)
+                        sim_board.draft(available_sorted[pick_index], team_index)
                 
                 sim_pick += 1
             
             # Calculate season score for user team using the same method as get_user_roster_value
-            user_roster = sim_drafted_players[self.teams[self.user_draft_position - 1]]
+            user_roster = self.get_roster_from_board(sim_board, user_team)
             season_score = self._calculate_roster_value_for_simulation(user_roster)
             
             return season_score
@@ -1160,11 +1169,6 @@ class FantasyDraftAssistant:
         except Exception as e:
             print(f"Error in simulation for {candidate_player.name}: {e}")
             return 0.0
-        finally:
-            # Restore original state
-            self.drafted_players = original_drafted_players
-            self.available_players = list(original_available_players)
-            self.current_pick = original_pick
     
     def _get_roster_needs_for_simulation(self, roster: List[Player]) -> Dict[str, int]:
         """Get roster needs for simulation purposes, considering bench constraints."""
@@ -1252,39 +1256,8 @@ class FantasyDraftAssistant:
         if not roster:
             return 0.0
         
-        # Separate starters from bench players
-        starters = []
-        bench_players = []
-        
-        # Track filled positions to determine who goes to bench
-        filled_positions = {
-            'QB': 0,
-            'WR': 0, 
-            'RB': 0,
-            'TE': 0,
-            'FLEX': 0,
-            'K': 0,
-            'DEF': 0
-        }
-        
-        # Sort players by projected points to prioritize starters
-        sorted_roster = sorted(roster, key=lambda p: self.get_player_projected_points(p), reverse=True)
-        
-        for player in sorted_roster:
-            pos = player.position
-            
-            # Check if we can fill a starting position
-            if pos in filled_positions and filled_positions[pos] < self.roster_constraints.get(pos, 0):
-                # Fill starting position
-                filled_positions[pos] += 1
-                starters.append(player)
-            elif pos in ['RB', 'WR', 'TE'] and filled_positions['FLEX'] < self.roster_constraints.get('FLEX', 0):
-                # Fill FLEX position
-                filled_positions['FLEX'] += 1
-                starters.append(player)
-            else:
-                # Player goes to bench
-                bench_players.append(player)
+        # Separate starters from bench players with the optimal lineup
+        starters, bench_players = self._split_lineup(roster, [self.get_player_projected_points(p) for p in roster])
         
         # Check if bench is full
         max_bench = self.roster_constraints.get('BN', 6)
@@ -1382,37 +1355,13 @@ class FantasyDraftAssistant:
         if not roster:
             return 0.0
         
-        # Assign starters and bench as in optimal lineup calculation
-        starters = []
-        bench = []
-        filled = {k: 0 for k in self.roster_constraints}
-        sorted_players = sorted(roster, key=lambda p: p.projected_points, reverse=True)
-        
-        # Fill required positions
-        for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
-            needed = self.roster_constraints.get(pos, 0)
-            for p in sorted_players:
-                if p.position == pos and filled[pos] < needed and p not in starters:
-                    starters.append(p)
-                    filled[pos] += 1
-        
-        # Fill FLEX
-        needed = self.roster_constraints.get('FLEX', 0)
-        for p in sorted_players:
-            if p.position in ['RB', 'WR', 'TE'] and filled['FLEX'] < needed and p not in starters:
-                starters.append(p)
-                filled['FLEX'] += 1
-        
-        # Everything else is bench
-        for p in sorted_players:
-            if p not in starters:
-                bench.append(p)
-        
-        # Calculate value
+        # Assign starters and bench with the optimal lineup
+        starters, bench = self._split_lineup(roster, [p.projected_points for p in roster])
+        
         # Calculate value - K and DEF get 40% starting value, others get full value
         value = 0.0
         for p in starters:
-            if p.position in ['K', 'DEF']:
+            if canonical_position(p.position) in ['K', 'DST']:
                 value += p.projected_points * 0.40  # 40% starting value for K and DEF
             else:
                 value += p.projected_points  # Full value for other positions
@@ -1432,37 +1381,13 @@ class FantasyDraftAssistant:
         if not roster:
             return 0.0
         
-        # Assign starters and bench as in optimal lineup calculation
-        starters = []
-        bench = []
-        filled = {k: 0 for k in self.roster_constraints}
-        sorted_players = sorted(roster, key=lambda p: p.projected_points, reverse=True)
-        
-        # Fill required positions
-        for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
-            needed = self.roster_constraints.get(pos, 0)
-            for p in sorted_players:
-                if p.position == pos and filled[pos] < needed and p not in starters:
-                    starters.append(p)
-                    filled[pos] += 1
-        
-        # Fill FLEX
-        needed = self.roster_constraints.get('FLEX', 0)
-        for p in sorted_players:
-            if p.position in ['RB', 'WR', 'TE'] and filled['FLEX'] < needed and p not in starters:
-                starters.append(p)
-                filled['FLEX'] += 1
-        
-        # Everything else is bench
-        for p in sorted_players:
-            if p not in starters:
-                bench.append(p)
-        
-        # Calculate value
+        # Assign starters and bench with the optimal lineup
+        starters, bench = self._split_lineup(roster, [p.projected_points for p in roster])
+        
         # Calculate value - K and DEF get 40% starting value, others get full value
         value = 0.0
         for p in starters:
-            if p.position in ['K', 'DEF']:
+            if canonical_position(p.position) in ['K', 'DST']:
                 value += p.projected_points * 0.40  # 40% starting value for K and DEF
             else:
                 value += p.projected_points  # Full value for other positions
@@ -1477,18 +1402,22 @@ class FantasyDraftAssistant:
         
         return value
     
+    def _split_lineup(self, roster: List[Player], points: List[float]) -> Tuple[List[Player], List[Player]]:
+        """Starters of the optimal lineup under roster_constraints and the bench, both best first."""
+        starters, bench = optimal_lineup(self.roster_constraints, roster, points)
+        return [player for _, player in starters], bench
+    
     def _calculate_season_score(self, roster: List[Player]) -> float:
         """Calculate season score by summing optimal weekly lineups plus bench value."""
         if not roster:
             return 0.0
         
-        # Calculate weekly lineup scores
-        weekly_score_total = 0.0
-        
-        # Simulate each week (assuming 17 weeks)
-        for week in range(1, 18):
-            weekly_score = self._calculate_optimal_weekly_lineup(roster, week)
-            weekly_score_total += weekly_score
+        # Optimal lineups for all 17 weeks at once, from a (roster x weeks) matrix with byes masked
+        weekly = self.get_weekly_projections()[[self.player_ids[p] for p in roster], :SEASON_WEEKS].astype(np.float64)
+        weekly[np.array([p.bye_week or 0 for p in roster])[:, None] == np.arange(1, SEASON_WEEKS + 1)] = -np.inf
+        positions = np.array([position_code(p.position) for p in roster])
+        weekly_score_total = float(weekly_lineup_points(weekly[None], positions[None],
+                                                        engine_lineup_slots(self.roster_constraints))[0].sum())
         
         # Add bench value (insurance value for the season)
         bench_value = self._calculate_bench_value(roster)
@@ -1496,79 +1425,6 @@ class FantasyDraftAssistant:
         total_score = weekly_score_total + bench_value
         return total_score
     
-    def _calculate_optimal_weekly_lineup(self, roster: List[Player], week: int) -> float:
-        """Calculate optimal lineup for a specific week, properly handling roster constraints and bye weeks."""
-        # Filter players who are available this week (not on bye)
-        available_players = [p for p in roster if p.bye_week != week]
-        
-        if not available_players:
-            return 0.0
-        
-        # Get weekly projections for available players
-        weekly_scores = []
-        for player in available_players:
-            # Use projected points as a proxy for weekly performance
-            # In a real implementation, you'd use actual weekly projections
-            # Use custom projections if available
-            player_projected = self.get_player_projected_points(player, self.scoring_format)
-            weekly_score = player_projected / 17  # Divide season projection by weeks
-            weekly_scores.append((player, weekly_score))
-        
-        # Sort by weekly score
-        weekly_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Build optimal lineup based on roster constraints
-        lineup = {
-            'QB': [],
-            'WR': [],
-            'RB': [],
-            'TE': [],
-            'FLEX': [],
-            'K': [],
-            'DEF': []
-        }
-        
-        # Track which players have been assigned to avoid duplicates
-        assigned_players = set()
-        
-        # Fill required positions first (QB, K, DEF)
-        for player, score in weekly_scores:
-            if player.name in assigned_players:
-                continue
-                
-            pos = player.position
-            if pos in ['QB', 'K', 'DEF']:
-                max_slots = self.roster_constraints.get(pos, 1)
-                if len(lineup[pos]) < max_slots:
-                    lineup[pos].append(score)
-                    assigned_players.add(player.name)
-        
-        # Fill WR, RB, TE positions
-        for player, score in weekly_scores:
-            if player.name in assigned_players:
-                continue
-                
-            pos = player.position
-            if pos in ['WR', 'RB', 'TE']:
-                max_slots = self.roster_constraints.get(pos, 1)
-                if len(lineup[pos]) < max_slots:
-                    lineup[pos].append(score)
-                    assigned_players.add(player.name)
-        
-        # Fill FLEX position with best remaining WR/RB/TE
-                    flex_slots = self.roster_constraints.get('FLEX', 0)
-        for player, score in weekly_scores:
-            if player.name in assigned_players:
-                continue
-                
-            if player.position in ['WR', 'RB', 'TE'] and len(lineup['FLEX']) < flex_slots:
-                lineup['FLEX'].append(score)
-                assigned_players.add(player.name)
-        
-        # Sum up the lineup
-        total = sum(sum(pos_scores) for pos_scores in lineup.values())
-        return total
-    
     def get_draft_status(self) -> Dict:
         """Get overall draft status."""
         # If draft is not initialized, return a status indicating it's not started
@@ -1654,6 +1510,7 @@ class FantasyDraftAssistant:
         
         return results
     
+    @synchronized
     def reset_draft(self):
         """Reset the draft to initial state."""
         self.current_round = 1
@@ -1670,6 +1527,7 @@ class FantasyDraftAssistant:
         self.drafted_players = {f'Team {i+1}': [] for i in range(self.num_teams)}
         self.available_players = set(self.players)
         self.draft_history = []
+        self.reset_board()
         
         # Clear cached recommendations
         self._cached_recommendations = []
@@ -1679,6 +1537,26 @@ class FantasyDraftAssistant:
         
         print(f"Draft reset: {self.num_teams} teams, {self.total_picks} total picks ({total_picks_per_team} per team)")
     
+    @synchronized
+    def reset_board(self):
+        """Rebuild the integer-ID draft board from drafted_players, available_players and current_pick."""
+        # IDs follow ADP order so the available IDs are already ranked
+        self.player_by_id = sorted(self.players, key=lambda p: p.adp)
+        self.player_ids = {player: i for i, player in enumerate(self.player_by_id)}
+        rosters = [[self.player_ids[p] for p in self.drafted_players.get(team, [])] for team in self.teams]
+        self.board = DraftState.from_rosters(
+            len(self.player_by_id), rosters, sum(self.roster_constraints.values()), self.current_pick,
+            available=[self.player_ids[p] for p in self.available_players]
+        )
+        # Per-team roster needs, kept current by draft_player
+        self.roster_trackers = {team: RosterNeedsTracker(self.roster_constraints, self.drafted_players.get(team, []))
+                                for team in self.teams}
+        self.board_version += 1
+    
+    def get_roster_from_board(self, board: DraftState, team_index: int) -> List[Player]:
+        """Resolve a team's roster on a board back to Player objects."""
+        return [self.player_by_id[i] for i in board.roster(team_index)]
+    
     def _get_current_team(self) -> str:
         """Get the current team name based on the current pick."""
         pick_info = self.get_current_pick_info()
@@ -1687,6 +1565,7 @@ class FantasyDraftAssistant:
     def _advance_pick(self):
         """Advance to the next pick in the draft."""
         self.current_pick += 1
+        self.board.current_pick = self.current_pick
         
         # Update current round based on the draft order
         if self.current_pick <= len(self.draft_order):
@@ -1795,6 +1674,7 @@ class FantasyDraftAssistant:
         if player_name not in self.custom_stats:
             self.custom_stats[player_name] = {}
         self.custom_stats[player_name].update(custom_stats)
+        self.weekly_projections.clear_flat()
 
 # Example usage and testing
 if __name__ == "__main__":
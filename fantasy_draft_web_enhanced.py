@@ -1,8 +1,22 @@
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for
 from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+from simulation_engine import (BoardSnapshot, OPPONENT_ADP_WINDOW, OPPONENT_NOISY_ADP, OPPONENT_MODELS,
+                               LINEUP_SEASON, LINEUP_SCORING_MODES,
+                               SAMPLING_PAIRED, SAMPLING_MODES, RosterValueMemo, noisy_adp_order)
+from simulation_executor import simulation_executor
+from simulation_allocator import allocate_simulations, MIN_ROUND_SIMULATIONS
+from simulation_cache import simulation_cache, board_key, SimulationRecord
+from simulation_profile import profile_store
+from simulation_rollouts import rollout_store, StoredRollouts
+from simulation_jobs import simulation_jobs, JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_SPECULATIVE
+from simulation_speculation import (speculation_cache, predict_boards, board_difference, SpeculativeResult,
+                                    MAX_ADAPT_DISTANCE)
+from draft_planner import planner_store, best_plan, plan_summary, PLAN_DEPTH, MAX_PLAN_DEPTH, PLAN_BEAM, PLAN_SIMULATIONS
+from lineup_optimizer import canonical_position, optimal_lineup
+from roster_tracker import RosterNeedsTracker, NEED_DEFAULTS
 import json
 import os
-import random
+import numpy as np
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from functools import wraps
@@ -50,6 +64,16 @@ custom_projections_cache = {}
 # Persistent storage for completed drafts
 COMPLETED_DRAFTS_FILE = 'completed_drafts.json'
 
+# Simulated drafts per candidate for the batched simulation engine
+# Total simulations per recommendation run, raced across the top CANDIDATES_PER_POSITION players at each position
+SIMULATION_BUDGET = 12000
+CANDIDATES_PER_POSITION = 5
+# Recommendations kept per predicted board, deep enough to survive a few of them being drafted
+SPECULATIVE_RECOMMENDATIONS = 5 + MAX_ADAPT_DISTANCE
+
+# Roster values keyed by the sorted roster, its projections and the roster constraints
+roster_value_memo = RosterValueMemo()
+
 # Custom projections function removed
 
 def load_players_globally():
@@ -1027,6 +1051,10 @@ def initialize_draft():
                 draft_assistant.set_roster_constraints(roster_constraints)
             
             draft_assistant.reset_draft()
+            simulation_jobs.cancel_stale()
+            speculation_cache.clear()
+            rollout_store.clear()
+            start_speculation(draft_assistant)
             print(f"Draft reset: {num_teams} teams, {draft_assistant.total_picks} total picks")
             print(f"Draft initialized: {num_teams} teams, user position {user_position}")
             print(f"Roster constraints: {draft_assistant.roster_constraints}")
@@ -1187,6 +1215,10 @@ def draft_player():
             # Clear cached recommendations after drafting
             if hasattr(assistant, 'cached_recommendations'):
                 assistant.cached_recommendations = []
+            # Simulations still running for the previous pick are now stale
+            simulation_jobs.cancel_stale(assistant.board_version)
+            # Precompute the user's next pick while opponents are on the clock
+            start_speculation(assistant)
             
             return jsonify({
                 'success': True,
@@ -1243,7 +1275,14 @@ def get_recommendations():
                     'adp': rec['adp'],
                     'projected_points': projected_points,
                     'expected_season_score': rec['expected_season_score'],
-                    'is_customized': rec['name'] in custom_projections_cache
+                    'is_customized': rec['name'] in custom_projections_cache,
+                    'simulations': rec.get('simulations', 0),
+                    'std_error': rec.get('std_error'),
+                    'ci_low': rec.get('ci_low'),
+                    'ci_high': rec.get('ci_high'),
+                    'diff_vs_best': rec.get('diff_vs_best'),
+                    'diff_std_error': rec.get('diff_std_error'),
+                    'precomputed': rec.get('precomputed', False)
                 })
             
             return jsonify({
@@ -1253,6 +1292,16 @@ def get_recommendations():
                 'scoring_format': selected_scoring_format
             })
         
+        # Results land in the cache when the job for this board finishes
+        job = simulation_jobs.latest(assistant.board_version)
+        if job is not None and job.status in (JOB_QUEUED, JOB_RUNNING):
+            return jsonify({
+                'success': True,
+                'recommendations': [],
+                'simulation_status': 'Simulation running',
+                'job': job.to_dict()
+            })
+        
         # No cached results available
         return jsonify({
             'success': True,
@@ -1265,8 +1314,14 @@ def get_recommendations():
 
 @app.route('/api/run_simulation', methods=['POST'])
 def run_simulation():
-    """Run simulations using web app's projection system and cache the results."""
+    """Run simulations using web app's projection system and cache the results.
+    
+    With ?budget_ms= the simulations keep refining until the deadline and the best-so-far
+    ranking is returned with confidence intervals. ?seed= replays the same simulations.
+    """
     try:
+        # The deadline counts from when the request arrived
+        started = time.monotonic()
         assistant = get_draft_assistant()
         num_recommendations = request.args.get('num', 5, type=int)
         
@@ -1285,167 +1340,583 @@ def run_simulation():
                 'error': 'Simulations can only be run on user turn'
             })
         
+        options, error = get_simulation_options(started)
+        if error:
+            return jsonify({'success': False, 'error': error})
+        
         # Custom projections are disabled as requested
         print("Custom projections disabled - using OALFFL rankings only")
         
-        # Run simulations using web app's projection system
+        # Run simulations using web app's projection system, unless they were precomputed
         try:
-            recommendations = run_simulations_with_web_projections(assistant, num_recommendations)
+            precomputed = take_precomputed_recommendations(assistant, num_recommendations, options)
+            if precomputed is not None:
+                recommendations, summary = precomputed
+                simulation_status = 'Completed (precomputed, adapted)' if summary['adapted'] else 'Completed (precomputed)'
+            else:
+                recommendations, summary = run_simulations_with_web_projections(assistant, num_recommendations, **options)
+                simulation_status = 'Completed'
             assistant.cached_recommendations = recommendations
-            simulation_status = 'Completed'
         except Exception as sim_error:
             print(f"Error running simulation: {sim_error}")
             assistant.cached_recommendations = []
+            summary = {}
             simulation_status = f'Error: {str(sim_error)}'
         
         return jsonify({
             'success': True,
-            'simulation_status': simulation_status
+            'simulation_status': simulation_status,
+            'recommendations': assistant.cached_recommendations[:num_recommendations],
+            'simulations_completed': summary.get('simulations', 0),
+            'rounds': summary.get('rounds', 0),
+            'settled': summary.get('settled', False),
+            'precomputed': summary.get('precomputed', False),
+            'adapted': summary.get('adapted', False),
+            'profile': summary.get('profile'),
+            'elapsed_ms': round((time.monotonic() - started) * 1000)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def get_simulation_options(started):
+    """Read the simulation query parameters shared by /api/run_simulation and /api/simulation_jobs.
+    
+    Returns (options, error): keyword arguments for run_simulations_with_web_projections, or an
+    error message for an invalid parameter.
+    """
+    budget_ms = request.args.get('budget_ms', type=int)
+    deadline = started + budget_ms / 1000.0 if budget_ms else None
+    # A deadline alone lets the simulations run until time is up
+    simulation_budget = request.args.get('budget', None if deadline else SIMULATION_BUDGET, type=int)
+    opponent_model = request.args.get('opponent_model', OPPONENT_ADP_WINDOW)
+    if opponent_model not in OPPONENT_MODELS:
+        return None, f'Unknown opponent model: {opponent_model}'
+    sampling = request.args.get('sampling', SAMPLING_PAIRED)
+    if sampling not in SAMPLING_MODES:
+        return None, f'Unknown sampling mode: {sampling}'
+    antithetic = request.args.get('antithetic', 'false').lower() in ('1', 'true', 'yes')
+    lineup_scoring = request.args.get('scoring', LINEUP_SEASON)
+    if lineup_scoring not in LINEUP_SCORING_MODES:
+        return None, f'Unknown scoring mode: {lineup_scoring}'
+    # A seed makes the run reproducible (together with a simulation budget rather than a deadline)
+    seed = request.args.get('seed', type=int)
+    if seed is not None and seed < 0:
+        return None, 'seed must be a non-negative integer'
+    return {
+        'simulation_budget': simulation_budget,
+        'opponent_model': opponent_model,
+        'lineup_scoring': lineup_scoring,
+        'sampling': sampling,
+        'antithetic': antithetic,
+        'deadline': deadline,
+        'seed': seed
+    }, None
+
+def start_speculation(assistant):
+    """While opponents are on the clock, simulate the likeliest boards at the user's next pick.
+    
+    The ADP opponent model predicts the boards; each finished board goes into speculation_cache
+    so the user's pick can reuse it instead of waiting for a fresh simulation.
+    """
+    if not assistant.draft_initialized or assistant.user_draft_position == 0:
+        return None
+    if assistant.get_current_pick_info().get("is_user_turn", False):
+        return None
+    next_picks = assistant.get_user_pick_numbers(assistant.current_pick)
+    if not next_picks:
+        return None
+    
+    snapshot = BoardSnapshot.from_assistant(assistant, lambda name: get_player_projection(name, selected_scoring_format))
+    if snapshot.board.team_sizes[snapshot.settings.user_team] >= snapshot.settings.roster_size:
+        return None
+    
+    def run_job(job):
+        predicted = [board for board in predict_boards(snapshot, next_picks[0]) if not speculation_cache.has(board.snapshot)]
+        print(f"Speculating on {len(predicted)} likely boards for pick {next_picks[0]}")
+        for i, board in enumerate(predicted):
+            if job.cancelled:
+                break
+            job.report(boards_done=i, boards=len(predicted), board_probability=board.probability)
+            recommendations, summary = run_simulations_with_web_projections(
+                assistant, SPECULATIVE_RECOMMENDATIONS, SIMULATION_BUDGET, sampling=SAMPLING_PAIRED, antithetic=False,
+                job=job, snapshot=board.snapshot)
+            if recommendations and not job.cancelled:
+                speculation_cache.add(SpeculativeResult(board.snapshot, board.probability, recommendations, summary,
+                                                        SIMULATION_BUDGET, paired=True, antithetic=False))
+        return []
+    
+    return simulation_jobs.submit(assistant.board_version, run_job, kind=JOB_SPECULATIVE)
+
+def take_precomputed_recommendations(assistant, num_recommendations, options):
+    """Reuse recommendations simulated while opponents were on the clock.
+    
+    options are the request's get_simulation_options(). Only a request the speculative run
+    covers qualifies: unseeded, with its sampling mode and at most its simulation budget.
+    An exact board match is returned as is. A close match (a few different picks) drops the
+    recommendations that have since been drafted, as long as no player the prediction had
+    drafted would have been a candidate. Returns (recommendations, summary) or None; the
+    summary is the speculative run's own, marked precomputed and, for a close match, adapted.
+    """
+    # Precomputed boards came from unseeded simulations, so a seeded request always simulates
+    if options['seed'] is not None:
+        return None
+    snapshot = BoardSnapshot.from_assistant(assistant, lambda name: get_player_projection(name, selected_scoring_format),
+                                            options['opponent_model'], options['lineup_scoring'])
+    match = speculation_cache.take(snapshot, options['simulation_budget'], options['sampling'] == SAMPLING_PAIRED,
+                                   options['antithetic'])
+    if match is None:
+        return None
+    result, distance = match
+    table = snapshot.table
+    taken, reopened = board_difference(result.snapshot.board, snapshot.board)
+    
+    # Players the prediction had drafted were never simulated
+    if len(reopened):
+        available_players = assistant.get_available_players()
+        projection_cache = {p.name: float(table.projection[table.index[p.name]]) for p in available_players}
+        candidate_names = {p.name for players in get_simulation_candidates(available_players, projection_cache).values()
+                           for p in players}
+        if any(table.names[i] in candidate_names for i in reopened):
+            print(f"Precomputed board is {distance} picks off and missed a candidate; simulating fresh")
+            return None
+    
+    taken_names = {table.names[i] for i in taken}
+    still_available = [rec for rec in result.recommendations if rec['name'] not in taken_names]
+    recommendations = [dict(rec, precomputed=True) for rec in still_available][:num_recommendations]
+    if not recommendations:
+        return None
+    best = recommendations[0]
+    if best['diff_vs_best']:
+        # The precomputed leader is gone: rebase on the new best (summed standard errors bound the paired one)
+        base, base_error = best['diff_vs_best'], best['diff_std_error']
+        for rec in recommendations:
+            rec['diff_vs_best'] -= base
+            rec['diff_std_error'] = 0.0 if rec is best else rec['diff_std_error'] + base_error
+    
+    print(f"Using precomputed recommendations ({distance} picks off the predicted board, "
+          f"p={result.probability:.2f})")
+    # The speculative run's totals, marked as such; its profile stays with that run in profile_store
+    summary = {key: value for key, value in result.summary.items() if key != 'profile'}
+    summary.update(precomputed=True, adapted=distance > 0, board_distance=distance,
+                   board_probability=result.probability,
+                   dropped_recommendations=len(result.recommendations) - len(still_available))
+    return recommendations, summary
+
+@app.route('/api/simulation_cache')
+def get_simulation_cache():
+    """Board simulation cache size and hit/miss counters."""
+    try:
+        return jsonify({
+            'success': True,
+            'cache': simulation_cache.stats()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/diagnostics/simulation_profile', methods=['GET', 'POST'])
+def simulation_profile_diagnostics():
+    """Per-phase simulation timers and counters for recent requests, plus running totals.
+    
+    POST ?enabled=true|false switches profiling on or off at runtime (SIMULATION_PROFILE=1 turns
+    it on at start-up) and ?reset=true clears the stored profiles.
+    """
+    try:
+        if request.method == 'POST':
+            enabled = request.args.get('enabled')
+            if enabled is not None:
+                profile_store.set_enabled(enabled.lower() in ('1', 'true', 'yes'))
+            if request.args.get('reset', 'false').lower() in ('1', 'true', 'yes'):
+                profile_store.clear()
+        return jsonify({
+            'success': True,
+            'profile': profile_store.stats()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/availability')
+def get_availability():
+    """Probability that each player is still on the board at each of the user's upcoming picks.
+    
+    Only opponent picks count: a player the simulated user drafted at an earlier pick counts as
+    still available, so the odds do not depend on the simulated user's own policy. Read from
+    the simulations already run on the current board (same parameters as /api/run_simulation),
+    so no extra simulations are needed.
+    """
+    try:
+        assistant = get_draft_assistant()
+        num_players = request.args.get('num', 50, type=int)
+        
+        if not assistant.draft_initialized or assistant.user_draft_position == 0:
+            return jsonify({
+                'success': False,
+                'error': 'Draft must be initialized before checking availability'
+            })
+        
+        options, error = get_simulation_options(time.monotonic())
+        if error:
+            return jsonify({'success': False, 'error': error})
+        
+        snapshot = BoardSnapshot.from_assistant(assistant, lambda name: get_player_projection(name, selected_scoring_format),
+                                                options['opponent_model'], options['lineup_scoring'])
+        record = simulation_cache.peek(board_key(snapshot, options['sampling'] == SAMPLING_PAIRED, options['antithetic']))
+        availability = record.availability() if record else None
+        if availability is None:
+            return jsonify({
+                'success': True,
+                'picks': [],
+                'players': [],
+                'status': 'No simulations for this board - run simulation first'
+            })
+        
+        picks = []
+        for pick in assistant.get_user_pick_numbers(snapshot.board.current_pick + 1)[:availability.shape[0]]:
+            round_num, _ = assistant.draft_order[pick - 1]
+            picks.append({
+                'pick': pick,
+                'label': f"{round_num}.{(pick - 1) % assistant.num_teams + 1:02d}"
+            })
+        
+        players = []
+        for player in assistant.get_available_players()[:num_players]:
+            index = snapshot.table.index[player.name]
+            players.append({
+                'name': player.name,
+                'position': player.position,
+                'team': player.team,
+                'adp': player.adp,
+                'availability': [round(float(p), 4) for p in availability[:len(picks), index]]
+            })
+        
+        return jsonify({
+            'success': True,
+            'picks': picks,
+            'players': players,
+            'simulations': sum(record.survival_sims.values()),
+            'status': 'Cached simulations'
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@app.route('/api/draft_plan')
+def get_draft_plan():
+    """Plan the user's next picks by position ("RB now, WR at 4.08") with the expected value of every branch.
+    
+    Query parameters: depth (user picks planned, up to 3), beam (positions kept per branch),
+    sims (simulated drafts per branch), seed, plus opponent_model and scoring as for
+    /api/run_simulation. Rollouts are cached across requests, so replanning the same board is fast.
+    """
+    try:
+        assistant = get_draft_assistant()
+        
+        if not assistant.draft_initialized or assistant.user_draft_position == 0:
+            return jsonify({
+                'success': False,
+                'error': 'Draft must be initialized before planning'
+            })
+        
+        started = time.monotonic()
+        options, error = get_simulation_options(started)
+        if error:
+            return jsonify({'success': False, 'error': error})
+        depth = request.args.get('depth', PLAN_DEPTH, type=int)
+        if not 1 <= depth <= MAX_PLAN_DEPTH:
+            return jsonify({'success': False, 'error': f'depth must be between 1 and {MAX_PLAN_DEPTH}'})
+        beam = max(1, request.args.get('beam', PLAN_BEAM, type=int))
+        num_sims = max(2, request.args.get('sims', PLAN_SIMULATIONS, type=int))
+        
+        snapshot = BoardSnapshot.from_assistant(assistant, lambda name: get_player_projection(name, selected_scoring_format),
+                                                options['opponent_model'], options['lineup_scoring'])
+        planner = planner_store.get(snapshot)
+        root = planner.plan(snapshot.board, depth, beam, num_sims, options['seed'])
+        
+        def pick_label(pick):
+            round_num, _ = assistant.draft_order[pick - 1]
+            return f"{round_num}.{(pick - 1) % assistant.num_teams + 1:02d}"
+        
+        plan = []
+        for node in best_plan(root):
+            step = plan_summary(node, snapshot.table, pick_label)
+            del step['children']
+            plan.append(step)
+        
+        return jsonify({
+            'success': True,
+            'plan': plan,
+            'branches': [plan_summary(child, snapshot.table, pick_label) for child in root.children],
+            'depth': len(plan),
+            'simulations': num_sims,
+            'elapsed_ms': round((time.monotonic() - started) * 1000),
+            'transpositions': planner.transpositions.stats()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/simulation_jobs', methods=['POST'])
+def start_simulation_job():
+    """Start simulations in the background and return a job ID to poll.
+    
+    Accepts the same parameters as /api/run_simulation. When the job finishes on the board it
+    was started for, its ranking becomes the cached recommendations.
+    """
+    try:
+        started = time.monotonic()
+        assistant = get_draft_assistant()
+        num_recommendations = request.args.get('num', 5, type=int)
+        
+        if not assistant.draft_initialized or assistant.user_draft_position == 0:
+            return jsonify({
+                'success': False,
+                'error': 'Draft must be initialized before running simulations'
+            })
+        
+        pick_info = assistant.get_current_pick_info()
+        if not pick_info.get("is_user_turn", False):
+            return jsonify({
+                'success': False,
+                'error': 'Simulations can only be run on user turn'
+            })
+        
+        options, error = get_simulation_options(started)
+        if error:
+            return jsonify({'success': False, 'error': error})
+        
+        # A new job supersedes any run still in flight, including one for this board
+        simulation_jobs.cancel_stale()
+        board_version = assistant.board_version
+        
+        # Boards simulated while opponents were on the clock finish instantly
+        precomputed = take_precomputed_recommendations(assistant, num_recommendations, options)
+        if precomputed is not None:
+            recommendations, summary = precomputed
+            with assistant.lock:
+                assistant.cached_recommendations = recommendations
+            job = simulation_jobs.record(board_version, recommendations, summary)
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'job': job.to_dict()
+            })
+        
+        def run_job(job):
+            recommendations, job.summary = run_simulations_with_web_projections(assistant, num_recommendations, job=job,
+                                                                                **options)
+            # Publish only if no pick was made while the job ran
+            with assistant.lock:
+                if not job.cancelled and assistant.board_version == board_version:
+                    assistant.cached_recommendations = recommendations
+            return recommendations
+        
+        job = simulation_jobs.submit(board_version, run_job)
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'job': job.to_dict()
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
-def run_simulations_with_web_projections(assistant, num_recommendations=40):
-    """Run simulations using web app's projection system."""
+@app.route('/api/simulation_jobs/<job_id>')
+def get_simulation_job(job_id):
+    """Get a simulation job's progress, and its recommendations once it has completed."""
+    try:
+        job = simulation_jobs.get(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Unknown simulation job'}), 404
+        
+        num_recommendations = request.args.get('num', 5, type=int)
+        return jsonify({
+            'success': True,
+            'job': job.to_dict(),
+            'recommendations': (job.result or [])[:num_recommendations] if job.status == JOB_COMPLETED else []
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/simulation_jobs/<job_id>/cancel', methods=['POST'])
+def cancel_simulation_job(job_id):
+    """Cancel a queued or running simulation job."""
+    try:
+        job = simulation_jobs.cancel(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Unknown simulation job'}), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job.to_dict()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def run_simulations_with_web_projections(assistant, num_recommendations=40, simulation_budget=SIMULATION_BUDGET,
+                                         opponent_model=OPPONENT_ADP_WINDOW, sampling=SAMPLING_PAIRED, antithetic=False,
+                                         deadline=None, job=None, snapshot=None, lineup_scoring=LINEUP_SEASON,
+                                         seed=None):
+    """Run simulations using web app's projection system and the batched simulation engine.
+    
+    The top players at each position race for the simulation budget: candidates that can no
+    longer reach the top recommendations are dropped early. Paired sampling evaluates every
+    candidate against the same opponent scenarios, so the reported differences to the best
+    candidate carry much smaller standard errors. A deadline (time.monotonic() timestamp)
+    stops the race when time runs out and keeps the best-so-far ranking. Returns
+    (recommendations, summary), the summary holding the run's totals, so concurrent runs never
+    see each other's. A background job gets progress reports after every round and stops
+    early once it is cancelled. Passing a snapshot simulates that board
+    (e.g. a predicted board at the user's next pick) instead of the live one. lineup_scoring
+    'weekly' scores each simulated roster by its bye-aware optimal lineup in every week.
+    A seed derives every simulation's random stream from it, so the same board, options and
+    budget give the same recommendations; seeded runs neither reuse nor extend earlier
+    simulations of the board.
+    """
+    summary = {}
     try:
         if not assistant or not assistant.draft_initialized or assistant.user_draft_position == 0:
             print("Draft not initialized or assistant is None or user position not set")
-            return []
+            return [], summary
         
-        current_pick_info = assistant.get_current_pick_info()
-        if not current_pick_info or not current_pick_info.get("is_user_turn", False):
-            print("Not user's turn")
-            return []
+        if snapshot is None:
+            current_pick_info = assistant.get_current_pick_info()
+            if not current_pick_info or not current_pick_info.get("is_user_turn", False):
+                print("Not user's turn")
+                return [], summary
         
         recommendations = []
         
         # Pre-calculate all projections to avoid repeated calls
-        available_players = assistant.get_available_players()
+        if snapshot is None:
+            available_players = assistant.get_available_players()
+        else:
+            available_players = [p for p, is_open in zip(snapshot.table.players, snapshot.board.available) if is_open]
         if not available_players:
             print("No available players")
-            return []
+            return [], summary
             
         projection_cache = {}
-        players_with_projections = []
         
         print("Pre-calculating projections for all available players...")
         print("Using OALFFL rankings projections (custom projections disabled)")
         
         for player in available_players:
             # This will use custom projections from Supabase if available
-            projected_points = get_player_projection(player.name, selected_scoring_format)
-            projection_cache[player.name] = projected_points
-            players_with_projections.append({
-                'player': player,
-                'projected_points': projected_points
-            })
+            projection_cache[player.name] = get_player_projection(player.name, selected_scoring_format)
         
-        # Sort by web app's projection system (including custom projections)
-        sorted_players_with_projections = sorted(players_with_projections, key=lambda x: x['projected_points'], reverse=True)
-        sorted_players = [item['player'] for item in sorted_players_with_projections]
+        # Get the top players at each position (by web app's projections) - UPDATED to use current available players
+        candidates_by_position = get_simulation_candidates(available_players, projection_cache)
+        for position, position_players in candidates_by_position.items():
+            print(f"Top {position}: {position_players[0].name} ({projection_cache[position_players[0].name]} pts)")
         
-        # Get top 1 player at each position (by web app's projections) - UPDATED to use current available players
-        top_players_by_position = {}
-        for position in ['QB', 'RB', 'WR', 'TE', 'K', 'DST']:
-            # Handle DST position
-            if position == 'DST':
-                position_players = [p for p in sorted_players if p.position == 'DST']
-            else:
-                position_players = [p for p in sorted_players if p.position == position]
-            if position_players:
-                top_players_by_position[position] = position_players[0]  # Only the #1 player
-                web_projection = projection_cache.get(position_players[0].name, position_players[0].projected_points)
-                print(f"Top {position}: {position_players[0].name} ({web_projection} pts)")
-        
-        # Pre-calculate roster needs once
-        current_team = assistant._get_current_team()
+        # Pre-calculate roster needs once (a predicted board is always at the user's pick)
+        if snapshot is None:
+            current_team = assistant._get_current_team()
+        else:
+            current_team = assistant.teams[assistant.user_draft_position - 1]
         if not current_team:
             print("Could not get current team")
-            return []
+            return [], summary
             
         current_roster = assistant.drafted_players.get(current_team, [])
-        roster_needs = get_roster_needs_for_simulation_web_projections(assistant, current_roster, projection_cache)
-        
-        # Run simulations only for the top player at each position
-        player_scores = {}
-        
-        print(f"Running simulations for top 1 player at each position using web app projections...")
-        
-        for position, top_player in top_players_by_position.items():
-            scores = []
-            successful_sims = 0
-            
-            # Run 40 simulations for the top player at this position (increased for better accuracy)
-            for sim in range(40):
-                try:
-                    score = simulate_draft_with_player_web_projections(assistant, top_player, projection_cache)
-                    scores.append(score)
-                    successful_sims += 1
-                except Exception as e:
-                    print(f"Simulation {sim + 1} failed for {top_player.name}: {e}")
-                    continue
-            
-            if successful_sims > 0:
-                avg_score = sum(scores) / len(scores)
-                player_scores[top_player] = avg_score
-                print(f"{top_player.name} ({position}): {successful_sims} simulations, avg score: {avg_score:.1f}")
-            else:
-                print(f"All simulations failed for {top_player.name}")
-        
-        # Now calculate values for 4 other players at each position based on projected points difference
-        for position in ['QB', 'RB', 'WR', 'TE', 'K', 'DST']:
-            if position not in top_players_by_position:
-                continue
-                
-            top_player = top_players_by_position[position]
-            top_player_score = player_scores.get(top_player, 0)
-            top_player_projected = projection_cache[top_player.name]
-            
-            # Get next 4 players at this position
-            if position == 'DST':
-                position_players = [p for p in sorted_players if p.position == 'DST']
+        roster_needs = get_roster_needs_from_tracker(assistant.roster_trackers[current_team])
+        
+        # Snapshot the board once; simulations never touch the live assistant
+        live = snapshot is None
+        if live:
+            snapshot = BoardSnapshot.from_assistant(
+                assistant,
+                lambda name: projection_cache.get(name, get_player_projection(name, selected_scoring_format)),
+                opponent_model,
+                lineup_scoring
+            )
+        player_table = snapshot.table
+        
+        candidates = {}
+        offsets = {}
+        for position, position_players in candidates_by_position.items():
+            for player in position_players:
+                candidate = player_table.index[player.name]
+                candidates[candidate] = player
+                offsets[candidate] = get_bench_adjustment_web_projections(player, roster_needs, current_roster, projection_cache)
+        
+        # Race the candidates for the simulation budget across the worker pool
+        print(f"Racing {len(candidates)} candidates for {simulation_budget or 'unlimited'} simulations"
+              f"{' until the deadline' if deadline else ''} using web app projections...")
+        def report_progress(allocation):
+            # ETA is an upper bound: the race can settle before the budget or deadline runs out
+            rate = allocation.simulations / max(allocation.elapsed, 1e-6)
+            remaining = []
+            if remaining_budget:
+                remaining.append((remaining_budget - allocation.simulations) / rate)
+            if deadline:
+                remaining.append(deadline - time.monotonic())
+            job.report(simulations=allocation.simulations, rounds=allocation.rounds,
+                       leader=candidates[allocation.leader].name, eta_seconds=round(max(0.0, min(remaining)), 1))
+        
+        # Simulations already run on this exact board count toward the budget and are merged with new ones
+        paired = sampling == SAMPLING_PAIRED
+        cache_key = board_key(snapshot, paired, antithetic, seed)
+        if live and seed is None:
+            # Rollouts from the user's previous pick that led to exactly this board are reused as
+            # independent samples, so only the shortfall is simulated fresh
+            reused = {candidate: batch for candidate, batch in rollout_store.take(snapshot).items() if candidate in candidates}
+            if reused:
+                simulation_cache.add_run(cache_key, reused, paired=False, antithetic=antithetic)
+                print(f"Reusing {sum(len(batch) for batch in reused.values())} rollouts from the previous pick "
+                      f"for {len(reused)} candidates")
+        record = simulation_cache.get(cache_key) if seed is None else None
+        cached_simulations = record.simulations if record else 0
+        remaining_budget = None if simulation_budget is None else simulation_budget - cached_simulations
+        try:
+            if record and deadline is None and (record.settled or remaining_budget < MIN_ROUND_SIMULATIONS * len(candidates)):
+                print(f"Reusing {cached_simulations} cached simulations for this board")
+                summary = {'simulations': 0, 'rounds': 0, 'settled': record.settled}
             else:
-                position_players = [p for p in sorted_players if p.position == position]
-            other_players = position_players[1:5]  # Skip the top player, take next 4
-            
-            for other_player in other_players:
-                other_projected = projection_cache[other_player.name]
-                projected_diff = top_player_projected - other_projected
-                
-                # Calculate value: top_player_value - projected_points_difference
-                calculated_value = top_player_score - projected_diff
-                player_scores[other_player] = calculated_value
-                
-                print(f"{other_player.name} ({position}): calculated value: {calculated_value:.1f} (based on {top_player.name})")
+                profile = profile_store.new_profile()
+                allocation = allocate_simulations(simulation_executor, snapshot, list(candidates), remaining_budget,
+                                                  top_k=min(num_recommendations, len(candidates)), offsets=offsets,
+                                                  seed=seed, paired=paired, antithetic=antithetic, deadline=deadline,
+                                                  should_stop=(lambda: job.cancelled) if job else None,
+                                                  progress=report_progress if job else None,
+                                                  traced=live and not antithetic, profile=profile)
+                if seed is None:
+                    record = simulation_cache.add_run(cache_key, allocation.scores, paired, antithetic,
+                                                      allocation.settled, allocation.survival)
+                else:
+                    # Seeded runs stand alone, so replaying one gives the same statistics
+                    record = SimulationRecord(antithetic, [{candidate: batch for candidate, batch in allocation.scores.items()
+                                                            if len(batch)}], [paired], allocation.settled)
+                if allocation.traces:
+                    # Kept for the particle filter at the user's next pick
+                    rollout_store.put(StoredRollouts(snapshot, allocation.scores, allocation.traces))
+                summary = {
+                    'simulations': allocation.simulations,
+                    'rounds': allocation.rounds,
+                    'settled': allocation.settled
+                }
+                if profile is not None:
+                    summary['profile'] = profile_store.record(
+                        'live' if live else 'speculative', profile, allocation.elapsed, pick=snapshot.board.current_pick,
+                        candidates=len(candidates), simulations=allocation.simulations, rounds=allocation.rounds,
+                        workers=simulation_executor.processes)
+                print(f"Simulation race: {allocation.simulations} simulations over {allocation.rounds} rounds "
+                      f"in {allocation.elapsed:.2f}s ({'settled' if allocation.settled else 'cancelled' if allocation.cancelled else 'budget exhausted'})")
+            summary['cached_simulations'] = cached_simulations
+            candidate_stats = record.candidate_stats(offsets)
+        except Exception as e:
+            print(f"Simulations failed: {e}")
+            candidate_stats = {}
         
-        # Apply bench value adjustments to prioritize backup RBs/WRs over kickers
         adjusted_scores = {}
-        for player, score in player_scores.items():
-            # Check if this player would be a starter or bench player
-            would_be_starter = False
-            if player.position in roster_needs and roster_needs[player.position] > 0:
-                would_be_starter = True
-            elif player.position in ['RB', 'WR', 'TE'] and roster_needs.get('FLEX', 0) > 0:
-                would_be_starter = True
-            
-            # Apply bench value bonus for backup RBs/WRs/TEs over kickers
-            if not would_be_starter and player.position in ['RB', 'WR', 'TE']:
-                # This player would be a bench player - add bench value bonus
-                bench_bonus = calculate_bench_value_for_player_web_projections(player, current_roster, projection_cache)
-                adjusted_score = score + bench_bonus
-                print(f"{player.name} ({player.position}): bench bonus {bench_bonus:.1f}, adjusted score: {adjusted_score:.1f}")
-            elif player.position == 'K' and not would_be_starter:
-                # Kickers on bench have 0 value - heavily penalize
-                adjusted_score = score - 1000  # Large penalty for backup K
-                print(f"{player.name} ({player.position}): backup penalty, adjusted score: {adjusted_score:.1f}")
-            elif player.position == 'DST' and not would_be_starter:
-                # DST on bench - no penalty for now to test
-                adjusted_score = score  # No penalty for backup DST
-                print(f"{player.name} ({player.position}): no penalty, adjusted score: {adjusted_score:.1f}")
-            else:
-                adjusted_score = score
-            
-            adjusted_scores[player] = adjusted_score
+        simulation_stats = {}
+        for candidate, player in candidates.items():
+            stats = candidate_stats.get(candidate)
+            if not stats:
+                print(f"All simulations failed for {player.name}")
+                continue
+            # Stats already include the bench adjustment offset
+            adjusted_scores[player] = stats['mean']
+            simulation_stats[player] = stats
+            print(f"{player.name} ({player.position}): {stats['simulations']} simulations, adjusted score: {stats['mean']:.1f} "
+                  f"(±{stats['std_error']:.1f}, vs best {stats['diff_vs_best']:+.1f} ±{stats['diff_std_error']:.1f})")
         
         # Sort by adjusted value (highest first)
         sorted_players = sorted(adjusted_scores.items(), key=lambda x: x[1], reverse=True)
@@ -1453,6 +1924,7 @@ def run_simulations_with_web_projections(assistant, num_recommendations=40):
         # Convert to recommendations format
         recommendations = []
         for player, score in sorted_players[:num_recommendations]:
+            stats = simulation_stats[player]
             recommendations.append({
                 'name': player.name,
                 'position': player.position,
@@ -1460,129 +1932,134 @@ def run_simulations_with_web_projections(assistant, num_recommendations=40):
                 'adp': player.adp,
                 'projected_points': projection_cache[player.name],
                 'expected_season_score': score,
-                'is_customized': False  # Custom projections disabled
+                'is_customized': False,  # Custom projections disabled
+                'simulations': stats['simulations'],
+                'std_error': stats['std_error'],
+                'ci_low': stats['ci_low'],  # 95% confidence interval
+                'ci_high': stats['ci_high'],
+                'diff_vs_best': stats['diff_vs_best'],  # Paired difference to the best candidate
+                'diff_std_error': stats['diff_std_error']
             })
         
-        return recommendations
+        return recommendations, summary
         
     except Exception as e:
         print(f"Error in run_simulations_with_web_projections: {e}")
         import traceback
         traceback.print_exc()
-        return []
-
-def simulate_draft_with_player_web_projections(assistant, candidate_player, projection_cache=None):
-    """Simulate draft with player using web app's projection system."""
-    # Save current state
-    original_drafted_players = {team: roster.copy() for team, roster in assistant.drafted_players.items()}
-    original_available_players = set(assistant.available_players)
-    original_pick = assistant.current_pick
+        return [], summary
+
+def get_simulation_candidates(available_players, projection_cache):
+    """Top players at each position by web app projections, keyed by position."""
+    sorted_players = sorted(available_players, key=lambda p: projection_cache[p.name], reverse=True)
+    candidates_by_position = {}
+    for position in ['QB', 'RB', 'WR', 'TE', 'K', 'DST']:
+        position_players = [p for p in sorted_players if p.position == position]
+        if position_players:
+            candidates_by_position[position] = position_players[:CANDIDATES_PER_POSITION]
+    return candidates_by_position
+
+def get_bench_adjustment_web_projections(player, roster_needs, current_roster, projection_cache=None):
+    """Ranking adjustment that prioritizes backup RBs/WRs over kickers."""
+    # Check if this player would be a starter or bench player
+    would_be_starter = False
+    if player.position in roster_needs and roster_needs[player.position] > 0:
+        would_be_starter = True
+    elif player.position in ['RB', 'WR', 'TE'] and roster_needs.get('FLEX', 0) > 0:
+        would_be_starter = True
     
-    # Setup sim state
-    sim_drafted_players = {team: roster.copy() for team, roster in assistant.drafted_players.items()}
-    sim_available_players = set(assistant.available_players)
-    sim_pick = assistant.current_pick
+    if not would_be_starter and player.position in ['RB', 'WR', 'TE']:
+        # This player would be a bench player - add bench value bonus
+        return calculate_bench_value_for_player_web_projections(player, current_roster, projection_cache)
+    if player.position == 'K' and not would_be_starter:
+        # Kickers on bench have 0 value - heavily penalize
+        return -1000  # Large penalty for backup K
+    # DST on bench - no penalty for now to test
+    return 0.0
+
+def simulate_draft_with_player_web_projections(assistant, candidate_player, projection_cache=None, truncate_horizon=True,
+                                               opponent_model=OPPONENT_ADP_WINDOW, rng=None):
+    """Simulate draft with player using web app's projection system.
+    
+    With truncate_horizon the simulation stops once the user's roster can no longer change.
+    opponent_model picks 'adp_window' (re-rank every pick) or 'noisy_adp' (one noisy ADP order per draft).
+    rng (a numpy Generator) drives every random choice, so a seeded one replays the same draft.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    # Fork the compact board; the simulation only ever touches the copy
+    with assistant.lock:
+        sim_board = assistant.board.fork()
+        sim_pick = assistant.current_pick
+    user_team = assistant.user_draft_position - 1
     
     try:
         # Draft the candidate player
-        team_name = assistant.teams[assistant.user_draft_position - 1]
-        sim_drafted_players[team_name].append(candidate_player)
-        sim_available_players.remove(candidate_player)
+        sim_board.draft(assistant.player_ids[candidate_player], user_team)
         sim_pick += 1
         
+        # Noisy ADP opponents walk one perturbed ranking drawn up front
+        opponent_order = noisy_adp_order(sim_board.available_ids(), rng) if opponent_model == OPPONENT_NOISY_ADP else None
+        opponent_index = 0
+        
+        # Picks after the user's last relevant pick cannot change the user's season score
+        last_pick = assistant.total_picks
+        if truncate_horizon:
+            last_pick = assistant.get_user_last_relevant_pick(sim_pick, sim_board.roster_length(user_team))
+        
+        total_roster_size = sum(assistant.roster_constraints.values())
+        
+        # User roster needs, updated as the simulated user drafts instead of recounted every turn
+        user_tracker = RosterNeedsTracker(assistant.roster_constraints, assistant.get_roster_from_board(sim_board, user_team))
+        # Best projection in the pool bounds the bench bonus any player can earn
+        top_projection = max(projection_cache.values(), default=0.0)
+        
         # Simulate the rest of the draft using ADP
-        while sim_pick <= assistant.total_picks:
+        while sim_pick <= last_pick:
             # Determine which team is picking using snake draft logic
             if sim_pick <= len(assistant.draft_order):
                 round_num, team_id = assistant.draft_order[sim_pick - 1]
-                team_name = assistant.teams[team_id - 1]
+                team_index = team_id - 1
             else:
                 # Fallback for picks beyond draft order
                 team_index = (sim_pick - 1) % assistant.num_teams
-                team_name = assistant.teams[team_index]
             
             # Check if team has roster space
-            team_roster = sim_drafted_players[team_name]
-            total_roster_size = sum(assistant.roster_constraints.values())
-            
-            if len(team_roster) >= total_roster_size:
+            if sim_board.roster_length(team_index) >= total_roster_size:
                 # Team is full, skip this pick
                 sim_pick += 1
                 continue
             
-            # If it's the user's turn, use smart strategy
-            if sim_pick <= len(assistant.draft_order):
-                round_num, team_id = assistant.draft_order[sim_pick - 1]
-                is_user_turn = (team_id == assistant.user_draft_position)
-            else:
-                # Fallback for picks beyond draft order
-                team_index = (sim_pick - 1) % assistant.num_teams
-                is_user_turn = (team_index == assistant.user_draft_position - 1)
-            
-            if is_user_turn:
-                # Get roster needs for user team
-                roster_needs = get_roster_needs_for_simulation_web_projections(assistant, team_roster, projection_cache)
-                
-                # Find best available player considering roster needs and bench constraints
-                best_player = None
-                best_score = -1
-                
-                for player in sorted(sim_available_players, key=lambda p: p.adp):
-                    # Check if this player fills a need
-                    need_bonus = 0
-                    position_need = roster_needs.get(player.position, 0)
-                    
-                    if position_need > 0:
-                        # High bonus for filling a starting position need
-                        need_bonus = 100
-                    elif roster_needs.get('BN', 0) > 0:
-                        # Check if this player would be a valuable bench player
-                        if player.position in ['RB', 'WR', 'TE']:
-                            # Calculate bench value for this player
-                            bench_value = calculate_bench_value_for_player_web_projections(player, team_roster, projection_cache)
-                            need_bonus = bench_value  # Use actual bench value
-                        elif player.position in ['K', 'DST']:
-                            # Kickers/DST on bench have 0 value - skip them
-                            continue
-                        else:
-                            # QB on bench - moderate value
-                            need_bonus = 20
-                    else:
-                        # No roster space available
-                        continue
-                    
-                    # Calculate player value using cached projection
-                    player_projected = projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format))
-                    player_value = (200 - player.adp) + need_bonus + random.randint(-10, 10)
-                    
-                    if player_value > best_score:
-                        best_score = player_value
-                        best_player = player
-                
-                if best_player:
-                    sim_drafted_players[team_name].append(best_player)
-                    sim_available_players.remove(best_player)
-                else:
-                    # No suitable player found, skip this pick
-                    pass
+            if team_index == user_team:
+                best_player = choose_user_pick_web_projections(assistant, sim_board, user_tracker, projection_cache,
+                                                               top_projection, rng)
+                if best_player is not None:
+                    sim_board.draft(best_player, user_team)
+                    user_tracker.add(assistant.player_by_id[best_player].position)
+                elif truncate_horizon:
+                    # No suitable player found, skip this pick and wait for a later user pick
+                    last_pick = assistant.get_user_last_relevant_pick(sim_pick + 1, user_tracker.size)
+            elif opponent_order is not None:
+                # Other teams take the next available player in this draft's noisy ADP order
+                while opponent_index < len(opponent_order) and not sim_board.is_available(opponent_order[opponent_index]):
+                    opponent_index += 1
+                if opponent_index < len(opponent_order):
+                    sim_board.draft(opponent_order[opponent_index], team_index)
             else:
                 # Other teams use ADP with some variance
-                available_sorted = sorted(sim_available_players, key=lambda p: p.adp)
-                if available_sorted:
+                available_sorted = sim_board.available_ids()
+                if len(available_sorted):
                     # 70% chance to follow ADP closely, 30% chance for variance
-                    if random.random() < 0.7:
+                    if rng.random() < 0.7:
                         pick_index = 0
                     else:
-                        pick_index = min(random.randint(0, 5), len(available_sorted) - 1)
+                        pick_index = min(int(rng.integers(0, 6)), len(available_sorted) - 1)
                     
-                    picked_player = available_sorted[pick_index]
-                    sim_drafted_players[team_name].append(picked_player)
-                    sim_available_players.remove(picked_player)
+                    sim_board.draft(available_sorted[pick_index], team_index)
             
             sim_pick += 1
         
         # Calculate season score for user team using web app's projection system
-        user_roster = sim_drafted_players[assistant.teams[assistant.user_draft_position - 1]]
+        user_roster = assistant.get_roster_from_board(sim_board, user_team)
         season_score = calculate_roster_value_for_simulation_web_projections(assistant, user_roster, projection_cache)
         
         return season_score
@@ -1590,67 +2067,101 @@ def simulate_draft_with_player_web_projections(assistant, candidate_player, proj
     except Exception as e:
         print(f"Error in simulation for {candidate_player.name}: {e}")
         return 0.0
-    finally:
-        # Restore original state
-        assistant.drafted_players = original_drafted_players
-        assistant.available_players = list(original_available_players)
-        assistant.current_pick = original_pick
 
-def calculate_roster_value_for_simulation_web_projections(assistant, roster, projection_cache=None):
-    """Calculate roster value for simulation using web app's projection system."""
-    if not roster:
-        return 0.0
+def choose_user_pick_web_projections(assistant, sim_board, user_tracker, projection_cache, top_projection, rng):
+    """Simulated user's pick: best (200 - ADP) + need bonus + randint(-10, 10), or None if nothing fits.
     
-    # First, properly separate starters from bench players based on roster constraints
-    starters = []
-    bench = []
+    Players are walked in ADP order and the walk stops once even the largest bonus and noise
+    cannot beat the current best. Players skipped that way could never have been picked, so
+    the pick distribution is unchanged.
+    """
+    # Get roster needs for user team
+    roster_needs = get_roster_needs_from_tracker(user_tracker)
+    flex_positions = user_tracker.open_flex_positions
+    bonus_bound = get_user_pick_bonus_bound(roster_needs, user_tracker, top_projection)
     
-    # Sort players by projected points to prioritize best players as starters
-    players_with_projections = []
-    for player in roster:
-        projected_points = projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format))
-        players_with_projections.append({
-            'player': player,
-            'projected_points': projected_points
-        })
+    # Find best available player considering roster needs and bench constraints
+    best_player = None
+    best_score = -1
     
-    sorted_players_with_projections = sorted(players_with_projections, key=lambda x: x['projected_points'], reverse=True)
-    sorted_players = [item['player'] for item in sorted_players_with_projections]
+    # Board IDs follow ADP order
+    for player_id in sim_board.available_ids():
+        player = assistant.player_by_id[player_id]
+        # ADP only gets worse from here, so no later player can win either (ties keep the earlier one)
+        if (200 - player.adp) + bonus_bound + 10 <= best_score:
+            break
+        # Check if this player fills a need
+        need_bonus = 0
+        position_need = roster_needs.get(player.position, 0)
+        
+        if position_need > 0:
+            # High bonus for filling a starting position need
+            need_bonus = 100
+        elif roster_needs.get('BN', 0) > 0 or player.position in flex_positions:
+            # Bench space or an open FLEX/SUPERFLEX-style slot: value the player like a bench pick
+            if player.position in ['RB', 'WR', 'TE']:
+                # Calculate bench value for this player
+                player_projected = projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format))
+                bench_value = get_bench_value_at_depth(player.position, player_projected,
+                                                       user_tracker.bench_depth(player.position))
+                need_bonus = bench_value  # Use actual bench value
+            elif player.position in ['K', 'DST']:
+                # Kickers/DST on bench have 0 value - skip them
+                continue
+            else:
+                # QB on bench - moderate value
+                need_bonus = 20
+        else:
+            # No roster space available
+            continue
+        
+        # Calculate player value (ADP-based with some variance)
+        player_value = (200 - player.adp) + need_bonus + int(rng.integers(-10, 11))
+        
+        if player_value > best_score:
+            best_score = player_value
+            best_player = player_id
     
-    # Track filled positions
-    filled_positions = {
-        'QB': 0,
-        'RB': 0,
-        'WR': 0,
-        'TE': 0,
-        'FLEX': 0,
-        'K': 0,
-        'DST': 0
-    }
+    return best_player
+
+def get_user_pick_bonus_bound(roster_needs, user_tracker, top_projection):
+    """Largest need bonus any available player can earn at this user pick."""
+    bound = float('-inf')
+    if any(count > 0 for pos, count in roster_needs.items() if pos != 'BN'):
+        bound = 100
+    if roster_needs.get('BN', 0) > 0 or user_tracker.open_flex_positions:
+        # Bench QBs (and any other position) earn 20, bench RB/WR/TE at most their depth's share of the top projection
+        bound = max(bound, 20, *(get_bench_value_at_depth(pos, top_projection, user_tracker.bench_depth(pos))
+                                 for pos in ['RB', 'WR', 'TE']))
+    return bound
+
+def calculate_roster_value_for_simulation_web_projections(assistant, roster, projection_cache=None):
+    """Calculate roster value for simulation using web app's projection system.
     
-    # Assign starters first based on roster constraints
-    for player in sorted_players:
-        pos = player.position
-        
-        # Check if we can fill a starting position
-        if pos in ['QB', 'K', 'DST']:
-            if filled_positions[pos] < assistant.roster_constraints.get(pos, 0):
-                starters.append(player)
-                filled_positions[pos] += 1
-            else:
-                bench.append(player)
-        elif pos in ['RB', 'WR', 'TE']:
-            # First try to fill position-specific slots
-            if filled_positions[pos] < assistant.roster_constraints.get(pos, 0):
-                starters.append(player)
-                filled_positions[pos] += 1
-            elif filled_positions['FLEX'] < assistant.roster_constraints.get('FLEX', 0):
-                # Fill FLEX position
-                starters.append(player)
-                filled_positions['FLEX'] += 1
-            else:
-                # Player goes to bench
-                bench.append(player)
+    Repeated rosters are a memo lookup: the key is the roster sorted by player, with each
+    player's projection (so the scoring format is covered), plus the roster constraints.
+    """
+    if not roster:
+        return 0.0
+    
+    projection_cache = projection_cache if projection_cache is not None else {}
+    key = (tuple(sorted((player.name, player.position,
+                         projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format)))
+                        for player in roster)),
+           tuple(sorted(assistant.roster_constraints.items())))
+    value = roster_value_memo.get(key)
+    if value is None:
+        value = _value_roster_web_projections(assistant, roster, projection_cache)
+        roster_value_memo.put(key, value)
+    return value
+
+def _value_roster_web_projections(assistant, roster, projection_cache):
+    """Roster value behind calculate_roster_value_for_simulation_web_projections, without the memo."""
+    # First, separate starters from bench players with the optimal lineup for the roster constraints
+    projections = [projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format))
+                   for player in roster]
+    starters, bench = optimal_lineup(assistant.roster_constraints, roster, projections)
+    starters = [player for _, player in starters]
     
     # Calculate value: starters get full value, bench gets reduced value
     total_value = 0.0
@@ -1658,7 +2169,7 @@ def calculate_roster_value_for_simulation_web_projections(assistant, roster, pro
     # Starters get full projected points (except K and DST get 40%)
     for player in starters:
         projected_points = projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format))
-        if player.position in ['K', 'DST']:
+        if canonical_position(player.position) in ['K', 'DST']:
             total_value += projected_points * 0.40  # 40% starting value for K and DST
         else:
             total_value += projected_points  # Full value for other positions
@@ -1674,71 +2185,13 @@ def calculate_roster_value_for_simulation_web_projections(assistant, roster, pro
 
 def get_roster_needs_for_simulation_web_projections(assistant, roster, projection_cache=None):
     """Get roster needs for simulation purposes using web app's projection system."""
-    # Count current players by position
-    position_counts = {'QB': 0, 'WR': 0, 'RB': 0, 'TE': 0, 'K': 0, 'DST': 0}
-    for player in roster:
-        if player.position in position_counts:
-            position_counts[player.position] += 1
-    
-    # Calculate how many players are actually starters vs bench
-    # First, determine which players fill starting positions
-    starters = []
-    bench_players = []
-    
-    # Track filled positions to determine who goes to bench
-    filled_positions = {
-        'QB': 0,
-        'WR': 0, 
-        'RB': 0,
-        'TE': 0,
-        'FLEX': 0,
-        'K': 0,
-        'DST': 0
-    }
-    
-    # Sort players by web app's projected points to prioritize starters
-    players_with_projections = []
-    for player in roster:
-        projected_points = projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format))
-        players_with_projections.append({
-            'player': player,
-            'projected_points': projected_points
-        })
-    
-    sorted_players_with_projections = sorted(players_with_projections, key=lambda x: x['projected_points'], reverse=True)
-    sorted_roster = [item['player'] for item in sorted_players_with_projections]
-    
-    for player in sorted_roster:
-        pos = player.position
-        
-        # Check if we can fill a starting position
-        if pos in filled_positions and filled_positions[pos] < assistant.roster_constraints.get(pos, 0):
-            # Fill starting position
-            filled_positions[pos] += 1
-            starters.append(player)
-        elif pos in ['RB', 'WR', 'TE'] and filled_positions['FLEX'] < assistant.roster_constraints.get('FLEX', 0):
-            # Fill FLEX position
-            filled_positions['FLEX'] += 1
-            starters.append(player)
-        else:
-            # Player goes to bench
-            bench_players.append(player)
-    
-    # Calculate total bench spots used (only actual bench players)
-    total_bench_used = len(bench_players)
-    
-    max_bench = assistant.roster_constraints.get('BN', 6)
-    bench_available = max(0, max_bench - total_bench_used)
-    
+    return get_roster_needs_from_tracker(RosterNeedsTracker(assistant.roster_constraints, roster))
+
+def get_roster_needs_from_tracker(tracker):
+    """Roster needs for the simulations, read from a team's RosterNeedsTracker."""
     # Calculate needs for starting positions
-    needs = {
-        'QB': max(0, assistant.roster_constraints.get('QB', 1) - position_counts['QB']),
-        'WR': max(0, assistant.roster_constraints.get('WR', 2) - position_counts['WR']),
-        'RB': max(0, assistant.roster_constraints.get('RB', 2) - position_counts['RB']),
-        'TE': max(0, assistant.roster_constraints.get('TE', 1) - position_counts['TE']),
-        'K': max(0, assistant.roster_constraints.get('K', 1) - position_counts['K']),
-        'DST': max(0, assistant.roster_constraints.get('DST', 1) - position_counts['DST'])
-    }
+    needs = tracker.position_needs(NEED_DEFAULTS)
+    bench_available = tracker.bench_available
     
     # If bench is full, prioritize filling remaining roster slots
     if bench_available == 0:
@@ -1757,7 +2210,7 @@ def calculate_bench_value_for_player_web_projections(player, team_roster, projec
         return 0.0
     
     # Get player's projected points using cached value or web app's system
-    player_projected = projection_cache.get(player.name, get_player_projection(player.name, selected_scoring_format))
+    player_projected = (projection_cache or {}).get(player.name, get_player_projection(player.name, selected_scoring_format))
     
     # Count current bench players by position (excluding current player)
     bench_counts = {'QB': 0, 'RB': 0, 'WR': 0, 'TE': 0, 'K': 0, 'DST': 0}
@@ -1767,13 +2220,16 @@ def calculate_bench_value_for_player_web_projections(player, team_roster, projec
     
     # Get bench depth for the player's position
     bench_depth = bench_counts.get(player.position, 0)
-    
-    if player.position == 'QB':
+    return get_bench_value_at_depth(player.position, player_projected, bench_depth)
+
+def get_bench_value_at_depth(position, player_projected, bench_depth):
+    """Bench value of a player with bench_depth other players at their position on the roster."""
+    if position == 'QB':
         if bench_depth == 0:
             return player_projected * 0.35  # 35% for 1st bench QB
         else:
             return 0.0  # All following QBs worth 0%
-    elif player.position == 'RB':
+    elif position == 'RB':
         if bench_depth == 0:
             return player_projected * 0.22  # 22% for 1st bench RB
         elif bench_depth == 1:
@@ -1784,7 +2240,7 @@ def calculate_bench_value_for_player_web_projections(player, team_roster, projec
             return player_projected * 0.05  # 5% for 4th bench RB
         else:
             return player_projected * 0.05  # 5% for 5th+ bench RB
-    elif player.position == 'WR':
+    elif position == 'WR':
         if bench_depth == 0:
             return player_projected * 0.22  # 22% for 1st bench WR
         elif bench_depth == 1:
@@ -1795,11 +2251,11 @@ def calculate_bench_value_for_player_web_projections(player, team_roster, projec
             return player_projected * 0.05  # 5% for 4th bench WR
         else:
             return player_projected * 0.05  # 5% for 5th+ bench WR
-    elif player.position == 'TE':
+    elif position == 'TE':
         return 0.0  # All TEs have 0% bench value
-    elif player.position == 'K':
+    elif position == 'K':
         return 0.0  # Kickers have 0% bench value
-    elif player.position == 'DST':
+    elif position == 'DST':
         return 0.0  # Defense has 0% bench value
     else:
         return 0.0
@@ -1833,147 +2289,29 @@ def get_user_roster():
         team_name = assistant.teams[assistant.user_draft_position - 1]
         roster = assistant.drafted_players[team_name]
         
-        # Initialize roster slots
-        roster_display = {
-            'QB': [],
-            'WR': [],
-            'RB': [],
-            'TE': [],
-            'FLEX': [],
-            'K': [],
-            'DST': [],
-            'BN': []
-        }
-        
-        # Sort players by web app's projected points for optimal assignment
-        players_with_projections = []
-        for player in roster:
-            projected_points = get_player_projection(player.name, selected_scoring_format)
-            players_with_projections.append({
-                'player': player,
-                'projected_points': projected_points
-            })
+        # One list per starting slot in roster_constraints, plus the bench
+        roster_display = {slot: [] for slot in assistant.roster_constraints}
+        roster_display.setdefault('BN', [])
         
-        sorted_players_with_projections = sorted(players_with_projections, key=lambda x: x['projected_points'], reverse=True)
-        sorted_players = [item['player'] for item in sorted_players_with_projections]
-        assigned_players = set()  # Track which players have been assigned
-        
-        # First, fill required positions
-        for player_data in sorted_players_with_projections:
-            player = player_data['player']
-            projected_points = player_data['projected_points']
-            
-            if player.name in assigned_players:
-                continue
-                
-            if player.position == 'QB' and len(roster_display['QB']) < assistant.roster_constraints['QB']:
-                roster_display['QB'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
-            elif player.position == 'K' and len(roster_display['K']) < assistant.roster_constraints['K']:
-                roster_display['K'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
-            elif player.position == 'DST' and len(roster_display['DST']) < assistant.roster_constraints['DST']:
-                roster_display['DST'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
-        
-        # Then fill WR, RB, TE positions
-        for player_data in sorted_players_with_projections:
-            player = player_data['player']
-            projected_points = player_data['projected_points']
-            
-            if player.name in assigned_players:
-                continue
-                
-            if player.position == 'WR' and len(roster_display['WR']) < assistant.roster_constraints['WR']:
-                roster_display['WR'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
-            elif player.position == 'RB' and len(roster_display['RB']) < assistant.roster_constraints['RB']:
-                roster_display['RB'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
-            elif player.position == 'TE' and len(roster_display['TE']) < assistant.roster_constraints['TE']:
-                roster_display['TE'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
+        def player_entry(player, projected_points):
+            return {
+                'name': player.name,
+                'position': player.position,
+                'team': player.team,
+                'projected_points': projected_points,
+                'bye_week': player.bye_week,
+                'is_customized': False  # Custom projections disabled
+            }
         
-        # Fill FLEX position with best remaining RB/WR/TE
-        for player_data in sorted_players_with_projections:
-            player = player_data['player']
-            projected_points = player_data['projected_points']
-            
-            if player.name in assigned_players:
-                continue
-                
-            if player.position in ['RB', 'WR', 'TE'] and len(roster_display['FLEX']) < assistant.roster_constraints['FLEX']:
-                roster_display['FLEX'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
-                break
+        # Optimal assignment using web app's projected points
+        projections = {player.name: get_player_projection(player.name, selected_scoring_format) for player in roster}
+        starters, bench = optimal_lineup(assistant.roster_constraints, roster, [projections[p.name] for p in roster])
+        for slot, player in starters:
+            roster_display[slot].append(player_entry(player, projections[player.name]))
         
         # Put remaining players on bench
-        for player_data in sorted_players_with_projections:
-            player = player_data['player']
-            projected_points = player_data['projected_points']
-            
-            if player.name in assigned_players:
-                continue
-                
-            if len(roster_display['BN']) < assistant.roster_constraints['BN']:
-                roster_display['BN'].append({
-                    'name': player.name,
-                    'position': player.position,
-                    'team': player.team,
-                    'projected_points': projected_points,
-                    'bye_week': player.bye_week,
-                    'is_customized': False  # Custom projections disabled
-                })
-                assigned_players.add(player.name)
+        for player in bench[:assistant.roster_constraints.get('BN', len(bench))]:
+            roster_display['BN'].append(player_entry(player, projections[player.name]))
         
         return jsonify({
             'success': True,
@@ -2009,56 +2347,10 @@ def get_user_roster_detailed():
                 }
             })
         
-        # Properly separate starters and bench based on roster constraints
-        starters = []
-        bench = []
-        
-        # Sort players by projected points to prioritize best players as starters
-        players_with_projections = []
-        for player in roster:
-            projected_points = get_player_projection(player.name, selected_scoring_format)
-            players_with_projections.append({
-                'player': player,
-                'projected_points': projected_points
-            })
-        
-        sorted_players_with_projections = sorted(players_with_projections, key=lambda x: x['projected_points'], reverse=True)
-        sorted_players = [item['player'] for item in sorted_players_with_projections]
-        
-        # Track filled positions
-        filled_positions = {
-            'QB': 0,
-            'RB': 0,
-            'WR': 0,
-            'TE': 0,
-            'FLEX': 0,
-            'K': 0,
-            'DST': 0
-        }
-        
-        # Assign starters first based on roster constraints
-        for player in sorted_players:
-            pos = player.position
-            
-            # Check if we can fill a starting position
-            if pos in ['QB', 'K', 'DST']:
-                if filled_positions[pos] < assistant.roster_constraints.get(pos, 0):
-                    starters.append(player)
-                    filled_positions[pos] += 1
-                else:
-                    bench.append(player)
-            elif pos in ['RB', 'WR', 'TE']:
-                # First try to fill position-specific slots
-                if filled_positions[pos] < assistant.roster_constraints.get(pos, 0):
-                    starters.append(player)
-                    filled_positions[pos] += 1
-                elif filled_positions['FLEX'] < assistant.roster_constraints.get('FLEX', 0):
-                    # Fill FLEX position
-                    starters.append(player)
-                    filled_positions['FLEX'] += 1
-                else:
-                    # Player goes to bench
-                    bench.append(player)
+        # Separate starters and bench with the optimal lineup for the roster constraints
+        starters, bench = optimal_lineup(assistant.roster_constraints, roster,
+                                         [get_player_projection(p.name, selected_scoring_format) for p in roster])
+        starters = [player for _, player in starters]
         
         # Convert players to serializable format with projections
         def player_to_dict(player_data):
@@ -2151,22 +2443,28 @@ def end_draft():
     try:
         assistant = get_draft_assistant()
         
-        # Mark draft as not initialized
-        assistant.draft_initialized = False
-        
-        # Clear all drafted players
-        assistant.drafted_players = {f'Team {i+1}': [] for i in range(assistant.num_teams)}
-        
-        # Reset draft state
-        assistant.current_round = 1
-        assistant.current_pick = 1
-        assistant.draft_history = []
-        
-        # Reset available players to all players
-        assistant.available_players = set(assistant.players)
+        # Reset under the draft lock so in-flight simulations never see a half-cleared board
+        with assistant.lock:
+            # Mark draft as not initialized
+            assistant.draft_initialized = False
+            
+            # Clear all drafted players
+            assistant.drafted_players = {f'Team {i+1}': [] for i in range(assistant.num_teams)}
+            
+            # Reset draft state
+            assistant.current_round = 1
+            assistant.current_pick = 1
+            assistant.draft_history = []
+            
+            # Reset available players to all players
+            assistant.available_players = set(assistant.players)
+            assistant.reset_board()
         
-        # Clear cached recommendations
+        # Clear cached recommendations and stop simulations for the old board
         assistant._cached_recommendations = []
+        simulation_jobs.cancel_stale()
+        speculation_cache.clear()
+        rollout_store.clear()
         
         return jsonify({
             'success': True,
@@ -2190,6 +2488,10 @@ def reset_draft():
             })
         
         assistant.reset_draft()
+        simulation_jobs.cancel_stale()
+        speculation_cache.clear()
+        rollout_store.clear()
+        start_speculation(assistant)
         
         return jsonify({
             'success': True,
@@ -2288,15 +2590,18 @@ def get_simulation_status():
         
         pick_info = assistant.get_current_pick_info()
         
-        # Only run simulation if it's user's turn
-        is_running = pick_info.get("is_user_turn", False)
+        # Progress of the latest simulation job for the current board, if any
+        job = simulation_jobs.latest(assistant.board_version)
+        speculation = simulation_jobs.latest(assistant.board_version, kind=JOB_SPECULATIVE)
         
         return jsonify({
             'success': True,
-            'is_running': is_running,
+            'is_running': job is not None and job.status in (JOB_QUEUED, JOB_RUNNING),
             'is_user_turn': pick_info.get("is_user_turn", False),
             'draft_initialized': True,
-            'status': pick_info.get("status", "Unknown")
+            'status': pick_info.get("status", "Unknown"),
+            'job': job.to_dict() if job else None,
+            'speculation': speculation.to_dict() if speculation else None
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -0,0 +1,206 @@
+import functools
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Roster entries that hold players without starting them
+NON_STARTING_SLOTS = ('BN', 'IR')
+
+# Positions accepted by multi-position slots. Any other slot accepts its own position, and
+# slash-separated names ('WR/TE', 'QB/RB/WR/TE') accept each listed position.
+SLOT_ELIGIBILITY = {
+    'FLEX': ('RB', 'WR', 'TE'),
+    'SUPERFLEX': ('QB', 'RB', 'WR', 'TE'),
+    'SFLEX': ('QB', 'RB', 'WR', 'TE'),
+    'OP': ('QB', 'RB', 'WR', 'TE'),
+    'REC_FLEX': ('WR', 'TE'),
+    'DL': ('DL', 'DE', 'DT'),
+    'DB': ('DB', 'CB', 'S'),
+    'IDP': ('DL', 'DE', 'DT', 'LB', 'DB', 'CB', 'S'),
+    'IDP_FLEX': ('DL', 'DE', 'DT', 'LB', 'DB', 'CB', 'S')
+}
+
+# Spellings of the same position; DEF slots take the DST players in the rankings
+POSITION_ALIASES = {'DEF': 'DST', 'D/ST': 'DST'}
+
+# Solved lineups remembered before the least recently used are evicted
+LINEUP_MEMO_SIZE = 100000
+
+
+def canonical_position(position: str) -> str:
+    return POSITION_ALIASES.get(position, position)
+
+
+def slot_eligibility(slot: str) -> Tuple[str, ...]:
+    """Positions a roster_constraints slot accepts."""
+    if slot in SLOT_ELIGIBILITY:
+        return SLOT_ELIGIBILITY[slot]
+    return tuple(slot.split('/')) if '/' in slot and slot != 'D/ST' else (slot,)
+
+
+@dataclass(frozen=True)
+class LineupSlots:
+    """A league's starting slots as (name, count, eligible positions), most specific slots first.
+
+    Solving a lineup picks the starters that maximise total points. A player set can start when
+    every player gets a distinct slot that accepts them, and those sets form a matroid, so taking
+    players best first and keeping each one an augmenting path can seat is exact for any slot
+    definition. When the eligibility sets are laminar (any two are nested or disjoint, as with
+    position slots, FLEX, SUPERFLEX and IDP slots) filling the most specific slots first gives
+    the same lineups, which is what the vectorized starting_mask uses.
+    """
+    slots: Tuple[Tuple[str, int, frozenset], ...]
+
+    @classmethod
+    def from_constraints(cls, roster_constraints: Dict[str, int]) -> 'LineupSlots':
+        return _slots_from_constraints(tuple(roster_constraints.items()))
+
+    @classmethod
+    def from_definition(cls, slots: Sequence[Tuple[str, int, Sequence[Hashable]]]) -> 'LineupSlots':
+        """Build from (name, count, eligible positions) triples, in any order."""
+        slots = [(name, int(count), frozenset(eligible)) for name, count, eligible in slots if count > 0 and eligible]
+        # Stable sort keeps the league's own order between equally specific slots
+        return cls(tuple(sorted(slots, key=lambda slot: len(slot[2]))))
+
+    def map_positions(self, mapping: Callable[[Hashable], Optional[Hashable]]) -> 'LineupSlots':
+        """Same slots with eligible positions translated (e.g. to engine codes); None drops one."""
+        return LineupSlots.from_definition(
+            [(name, count, {mapping(pos) for pos in eligible} - {None}) for name, count, eligible in self.slots])
+
+    @property
+    def num_starters(self) -> int:
+        return sum(count for _, count, _ in self.slots)
+
+    @functools.cached_property
+    def laminar(self) -> bool:
+        eligible = [positions for _, _, positions in self.slots]
+        return all(a <= b or b <= a or not (a & b) for i, a in enumerate(eligible) for b in eligible[i + 1:])
+
+    @functools.cached_property
+    def _position_slots(self) -> Dict[Hashable, Tuple[int, ...]]:
+        return {}
+
+    def eligible_slots(self, position: Hashable) -> Tuple[int, ...]:
+        """Slot indices a position can start in, most specific first."""
+        eligible = self._position_slots.get(position)
+        if eligible is None:
+            eligible = self._position_slots[position] = tuple(
+                i for i, (_, _, positions) in enumerate(self.slots) if position in positions)
+        return eligible
+
+    def solve(self, positions: Sequence[Hashable], points: Sequence[float]) -> Tuple[Optional[str], ...]:
+        """Exact best lineup: the slot each player starts in, or None for the bench.
+
+        Players whose points are None, NaN or -inf (e.g. on bye) never start. Results are
+        memoized on the roster's (position, points) pairs, so a roster/week is solved once.
+        """
+        entries = [(positions[i], float(points[i])) for i in range(len(positions))]
+        order = sorted(range(len(entries)), key=lambda i: -_playable(entries[i][1]))
+        assigned = _solve_sorted(self, tuple(entries[i] for i in order))
+        result = [None] * len(entries)
+        for i, slot in zip(order, assigned):
+            result[i] = slot
+        return tuple(result)
+
+    def starting_mask(self, positions: np.ndarray, playing: Optional[np.ndarray] = None) -> np.ndarray:
+        """Starters for rosters already sorted best first along the last axis.
+
+        positions holds engine codes (or anything map_positions produced), -1 for empty slots,
+        and playing masks out players that cannot start (byes). Works on any leading shape.
+        """
+        playing = positions >= 0 if playing is None else playing & (positions >= 0)
+        starters = np.zeros(positions.shape, dtype=bool)
+        if starters.size == 0:
+            return starters
+        if self.laminar:
+            for _, count, eligible in self.slots:
+                if len(eligible) == 1:
+                    is_eligible = positions == next(iter(eligible))
+                else:
+                    is_eligible = np.isin(positions, list(eligible))
+                open_slots = playing & ~starters & is_eligible
+                starters |= open_slots & (open_slots.cumsum(axis=-1, dtype=np.int16) <= count)
+            return starters
+        # Overlapping eligibility sets need the exact solver row by row
+        rank = -np.arange(positions.shape[-1], dtype=np.float64)
+        flat_positions = positions.reshape(-1, positions.shape[-1])
+        flat_playing = playing.reshape(-1, positions.shape[-1])
+        flat_starters = starters.reshape(-1, positions.shape[-1])
+        for row in range(flat_positions.shape[0]):
+            points = np.where(flat_playing[row], rank, -np.inf)
+            lineup = self.solve(flat_positions[row].tolist(), points)
+            flat_starters[row] = [slot is not None for slot in lineup]
+        return starters
+
+
+def _playable(points: float) -> float:
+    return points if points is not None and not math.isnan(points) else -math.inf
+
+
+@functools.lru_cache(maxsize=32)
+def _slots_from_constraints(items: tuple) -> LineupSlots:
+    return LineupSlots.from_definition(
+        [(slot, count, {canonical_position(pos) for pos in slot_eligibility(slot)})
+         for slot, count in items if slot not in NON_STARTING_SLOTS])
+
+
+@functools.lru_cache(maxsize=LINEUP_MEMO_SIZE)
+def _solve_sorted(slots: LineupSlots, entries: tuple) -> Tuple[Optional[int], ...]:
+    """Slot names for (position, points) entries sorted best first."""
+    capacity = [count for _, count, _ in slots.slots]
+    seated: List[List[int]] = [[] for _ in slots.slots]
+    assignment: List[Optional[int]] = [None] * len(entries)
+
+    def seat(player: int, visited: set) -> bool:
+        # Augmenting path: take a free eligible slot, or move someone seated there elsewhere
+        eligible = slots.eligible_slots(canonical_position(entries[player][0]))
+        for slot in eligible:
+            if slot not in visited and len(seated[slot]) < capacity[slot]:
+                seated[slot].append(player)
+                assignment[player] = slot
+                return True
+        for slot in eligible:
+            if slot in visited:
+                continue
+            visited.add(slot)
+            for i, other in enumerate(seated[slot]):
+                if seat(other, visited):
+                    seated[slot][i] = player
+                    assignment[player] = slot
+                    return True
+        return False
+
+    open_slots = sum(capacity)
+    for player, (_, points) in enumerate(entries):
+        if open_slots == 0 or _playable(points) == -math.inf:
+            break
+        if seat(player, set()):
+            open_slots -= 1
+    return tuple(None if slot is None else slots.slots[slot][0] for slot in assignment)
+
+
+def optimal_lineup(roster_constraints: Dict[str, int], players: Sequence, points: Sequence[float]):
+    """Best lineup for players under roster_constraints.
+
+    Returns (starters, bench): starters as (slot name, player) pairs and bench players, both
+    ordered best first with ties in roster order.
+    """
+    slots = LineupSlots.from_constraints(roster_constraints)
+    lineup = slots.solve([player.position for player in players], points)
+    order = sorted(range(len(players)), key=lambda i: -_playable(points[i]))
+    starters = [(lineup[i], players[i]) for i in order if lineup[i] is not None]
+    bench = [players[i] for i in order if lineup[i] is None]
+    return starters, bench
+
+
+def lineup_memo_stats() -> dict:
+    info = _solve_sorted.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'lineups': info.currsize,
+        'max_entries': info.maxsize,
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': info.hits / lookups if lookups else 0.0
+    }
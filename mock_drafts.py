@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Simulate complete mock drafts offline, every team picking, across all cores.
+
+Every team drafts with the simulated user policy (ADP + roster needs, --policy assistant) or
+with the opponent model (--policy adp). Results are streamed to CSV as chunks finish:
+
+  --output      one row per draft and slot: final roster value and position counts
+  --runs-output one row per draft: longest position run and runs of RUN_LENGTH+ picks per position
+  --adp-output  one row per player: realized ADP (mean and std of the pick number) and drafted share
+
+Usage: python mock_drafts.py [--drafts 100000] [--teams 12] [--policy assistant] [--workers 8]
+"""
+
+import argparse
+import contextlib
+import csv
+import dataclasses
+import io
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+from simulation_engine import (BatchDraftSimulator, BoardSnapshot, DEFAULT_CHUNK_SIZE, LINEUP_SCORING_MODES,
+                               LINEUP_SEASON, OPPONENT_ADP_WINDOW, OPPONENT_MODELS, OTHER, POSITIONS, USER_NOISE,
+                               ScenarioStream)
+
+POLICY_ASSISTANT = 'assistant'
+POLICY_ADP = 'adp'
+POLICIES = (POLICY_ASSISTANT, POLICY_ADP)
+
+# Consecutive picks at one position that count as a positional run
+RUN_LENGTH = 3
+
+# Positions reported per roster and per run (OTHER never starts)
+REPORT_POSITIONS = POSITIONS[:OTHER]
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '09042025LEAGUE_Rankings_2.csv')
+
+# Draft drivers installed in each worker by the pool initializer
+_worker_drafter = None
+
+
+class MockDraftRunner:
+    """Plays complete drafts for a batch of sims, with every team's picks recorded.
+
+    Each team drafts through its own BatchDraftSimulator (the same policy code the web
+    simulations use, with that team as the "user"), acting on its slice of a shared
+    (sims, teams, roster slots) array.
+    """
+
+    def __init__(self, snapshot: BoardSnapshot, policy: str = POLICY_ASSISTANT):
+        self.table = snapshot.table
+        self.settings = snapshot.settings
+        self.policy = policy
+        self.simulators = [BatchDraftSimulator(self.table, dataclasses.replace(self.settings, user_team=team))
+                           for team in range(self.settings.num_teams)]
+
+    def run(self, num_drafts: int, rng: np.random.Generator) -> dict:
+        """Play num_drafts drafts and return per-draft, per-slot and per-player results."""
+        settings = self.settings
+        num_players, num_teams = len(self.table), settings.num_teams
+        num_picks = len(settings.draft_order)
+        stream = ScenarioStream(rng)
+
+        available = np.ones((num_drafts, num_players), dtype=bool)
+        team_sizes = np.zeros((num_drafts, num_teams), dtype=np.int32)
+        remaining = np.full(num_drafts, num_players, dtype=np.int32)
+        roster = np.full((num_drafts, num_teams, settings.roster_size), -1, dtype=np.int32)
+        roster_len = np.zeros((num_drafts, num_teams), dtype=np.int32)
+        counts = np.zeros((num_drafts, num_teams, len(POSITIONS)), dtype=np.int32)
+        pick_of = np.zeros((num_drafts, num_players), dtype=np.int16)  # 0 while undrafted
+        pick_position = np.full((num_drafts, num_picks), -1, dtype=np.int8)
+
+        rows = np.arange(num_drafts)
+        pool_slot = np.arange(num_players)
+        frontier = np.zeros(num_drafts, dtype=np.int64)
+        scenarios = None
+        if self.policy == POLICY_ADP:
+            scenarios = self.simulators[0]._opponent_scenarios(stream, num_drafts, num_picks)
+
+        for step, team in enumerate(settings.draft_order):
+            active = rows[(team_sizes[:, team] < settings.roster_size) & (remaining > 0)]
+            if active.size == 0:
+                continue
+            state = (available, team_sizes, remaining, roster[:, team], roster_len[:, team], counts[:, team])
+            simulator = self.simulators[team]
+            if scenarios is None:
+                noise = stream.integers(-USER_NOISE, USER_NOISE + 1, (num_drafts, num_players), dtype=np.int8)
+                picked, players = simulator._user_pick(state, active, noise, pool_slot)
+            else:
+                picked, players = simulator._opponent_step(state, active, team, step, frontier, scenarios)
+                roster[picked, team, roster_len[picked, team]] = players
+                roster_len[picked, team] += 1
+                counts[picked, team, self.table.position[players]] += 1
+            pick_of[picked, players] = step + 1
+            pick_position[picked, step] = self.table.position[players]
+
+        values = self.simulators[0].roster_values(roster.reshape(num_drafts * num_teams, -1))
+        longest, longest_position, runs = position_runs(pick_position)
+        drafted = pick_of > 0
+        picks = pick_of.astype(np.float64)
+        return {
+            'values': values.reshape(num_drafts, num_teams),
+            'counts': counts[:, :, :OTHER],
+            'longest_run': longest,
+            'longest_run_position': longest_position,
+            'runs': runs,
+            'drafted': drafted.sum(axis=0),
+            'pick_sum': picks.sum(axis=0),
+            'pick_sq_sum': (picks * picks).sum(axis=0)
+        }
+
+
+def position_runs(pick_position: np.ndarray) -> tuple:
+    """Longest run (length, position code) and RUN_LENGTH+ runs per position for each draft.
+
+    pick_position holds the position code of every pick in draft order, -1 for skipped picks.
+    """
+    num_drafts, num_picks = pick_position.shape
+    index = np.arange(num_picks)
+    # Run length ending at each pick: distance back to the last position change
+    starts = np.ones(pick_position.shape, dtype=bool)
+    starts[:, 1:] = pick_position[:, 1:] != pick_position[:, :-1]
+    run_start = np.maximum.accumulate(np.where(starts, index, 0), axis=1)
+    length = np.where(pick_position >= 0, index - run_start + 1, 0)
+
+    end = length.argmax(axis=1)
+    longest = length[np.arange(num_drafts), end]
+    longest_position = pick_position[np.arange(num_drafts), end]
+    # A run is counted once, at the pick that makes it RUN_LENGTH long
+    reached = length == RUN_LENGTH
+    runs = np.stack([(reached & (pick_position == code)).sum(axis=1) for code in range(len(REPORT_POSITIONS))], axis=1)
+    return longest, longest_position, runs
+
+
+def build_snapshot(csv_path: str, num_teams: int, scoring_format: str, opponent_model: str,
+                   lineup_scoring: str) -> BoardSnapshot:
+    """Board at pick 1 of a fresh draft, with the assistant's league settings and projections."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        assistant = FantasyDraftAssistant(csv_path)
+        assistant.set_num_teams(num_teams)
+        assistant.set_scoring_format(scoring_format)
+        assistant.reset_draft()
+    return BoardSnapshot.from_assistant(assistant, opponent_model=opponent_model, lineup_scoring=lineup_scoring)
+
+
+def _init_worker(runner: MockDraftRunner):
+    """Pool initializer: keep the draft runner (table and simulators) resident in the worker."""
+    global _worker_drafter
+    _worker_drafter = runner
+
+
+def _run_task(task) -> tuple:
+    start, num_drafts, seed = task
+    return start, _worker_drafter.run(num_drafts, np.random.default_rng(seed))
+
+
+def _get_context():
+    # Fork shares the player table with the workers instead of pickling it
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+def run_mock_drafts(runner: MockDraftRunner, num_drafts: int, seed: int = 0, processes: int = 1,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield (first draft number, results) per chunk as workers finish, in completion order.
+
+    Every chunk has its own seed spawned from seed, so results do not depend on processes.
+    """
+    starts = list(range(0, num_drafts, chunk_size))
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [(start, min(chunk_size, num_drafts - start), chunk_seed) for start, chunk_seed in zip(starts, seeds)]
+    if processes <= 1 or len(tasks) == 1:
+        for task in tasks:
+            yield task[0], runner.run(task[1], np.random.default_rng(task[2]))
+        return
+    with _get_context().Pool(min(processes, len(tasks)), initializer=_init_worker, initargs=(runner,)) as pool:
+        yield from pool.imap_unordered(_run_task, tasks)
+
+
+def write_slot_rows(writer, start: int, results: dict):
+    values, counts = results['values'], results['counts']
+    num_drafts, num_teams = values.shape
+    draft = np.repeat(np.arange(start + 1, start + num_drafts + 1), num_teams)
+    slot = np.tile(np.arange(1, num_teams + 1), num_drafts)
+    writer.writerows(zip(draft.tolist(), slot.tolist(), np.round(values.reshape(-1), 2).tolist(),
+                         *counts.reshape(-1, counts.shape[2]).T.tolist()))
+
+
+def write_run_rows(writer, start: int, results: dict):
+    num_drafts = len(results['longest_run'])
+    positions = [REPORT_POSITIONS[code] if 0 <= code < OTHER else '' for code in results['longest_run_position']]
+    writer.writerows(zip(range(start + 1, start + num_drafts + 1), results['longest_run'].tolist(), positions,
+                         *results['runs'].T.tolist()))
+
+
+def write_adp_rows(path: str, table, num_drafts: int, drafted: np.ndarray, pick_sum: np.ndarray,
+                   pick_sq_sum: np.ndarray):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = pick_sum / drafted
+        std = np.sqrt(np.maximum(pick_sq_sum / drafted - mean * mean, 0.0))
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['player', 'position', 'adp', 'realized_adp', 'realized_adp_std', 'drafted_share'])
+        for i in np.argsort(np.where(drafted > 0, mean, np.inf), kind='stable'):
+            player = table.players[i]
+            writer.writerow([player.name, player.position, player.adp,
+                             round(float(mean[i]), 2) if drafted[i] else '', round(float(std[i]), 2) if drafted[i] else '',
+                             round(float(drafted[i] / num_drafts), 4)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--drafts', type=int, default=10000, help='Complete drafts to simulate')
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--policy', choices=POLICIES, default=POLICY_ASSISTANT,
+                        help='assistant: every team drafts for roster needs; adp: every team follows the opponent model')
+    parser.add_argument('--opponent-model', choices=OPPONENT_MODELS, default=OPPONENT_ADP_WINDOW)
+    parser.add_argument('--lineup-scoring', choices=LINEUP_SCORING_MODES, default=LINEUP_SEASON)
+    parser.add_argument('--scoring-format', default='ppr')
+    parser.add_argument('--rankings', default=CSV_PATH, help='Rankings CSV to load the players from')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SIMULATION_WORKERS', os.cpu_count() or 1)))
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Drafts per worker task')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='mock_drafts.csv')
+    parser.add_argument('--runs-output', default='mock_draft_runs.csv')
+    parser.add_argument('--adp-output', default='mock_draft_adp.csv')
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(args.rankings, args.teams, args.scoring_format, args.opponent_model, args.lineup_scoring)
+    runner = MockDraftRunner(snapshot, args.policy)
+    table, num_teams = snapshot.table, snapshot.settings.num_teams
+    print(f"Simulating {args.drafts} drafts: {num_teams} teams, {len(table)} players, policy {args.policy}, "
+          f"{args.workers} workers")
+
+    drafted = np.zeros(len(table), dtype=np.int64)
+    pick_sum = np.zeros(len(table), dtype=np.float64)
+    pick_sq_sum = np.zeros(len(table), dtype=np.float64)
+    slot_sum = np.zeros(num_teams, dtype=np.float64)
+    slot_sq_sum = np.zeros(num_teams, dtype=np.float64)
+    done = 0
+    started = time.perf_counter()
+    with open(args.output, 'w', newline='') as slots_file, open(args.runs_output, 'w', newline='') as runs_file:
+        slot_writer, run_writer = csv.writer(slots_file), csv.writer(runs_file)
+        slot_writer.writerow(['draft', 'slot', 'value'] + list(REPORT_POSITIONS))
+        run_writer.writerow(['draft', 'longest_run', 'longest_run_position']
+                            + [f"runs_{pos}" for pos in REPORT_POSITIONS])
+        for start, results in run_mock_drafts(runner, args.drafts, args.seed, args.workers, args.chunk_size):
+            write_slot_rows(slot_writer, start, results)
+            write_run_rows(run_writer, start, results)
+            slots_file.flush()
+            runs_file.flush()
+            drafted += results['drafted']
+            pick_sum += results['pick_sum']
+            pick_sq_sum += results['pick_sq_sum']
+            slot_sum += results['values'].sum(axis=0)
+            slot_sq_sum += (results['values'] ** 2).sum(axis=0)
+            done += len(results['values'])
+            elapsed = time.perf_counter() - started
+            print(f"  {done}/{args.drafts} drafts, {elapsed:.1f}s ({done / elapsed:.0f} drafts/s)")
+    write_adp_rows(args.adp_output, table, args.drafts, drafted, pick_sum, pick_sq_sum)
+
+    elapsed = time.perf_counter() - started
+    print(f"Done in {elapsed:.1f}s ({args.drafts / elapsed:.0f} drafts/s)")
+    mean = slot_sum / args.drafts
+    std = np.sqrt(np.maximum(slot_sq_sum / args.drafts - mean * mean, 0.0))
+    print(f"{'slot':>4} {'mean value':>11} {'std':>8}")
+    for slot in range(num_teams):
+        print(f"{slot + 1:>4} {mean[slot]:>11.1f} {std[slot]:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
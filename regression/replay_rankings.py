@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Golden-output regression harness for the simulation recommendations.
+
+Replays every recorded draft in regression/fixtures (the draft_history layout written by
+FantasyDraftAssistant.export_draft_results) pick by pick. Each time the user is on the clock,
+it runs seeded simulations through run_simulations_with_web_projections and compares the
+ranking and scores with regression/golden. Seeded runs do not depend on the worker count, so
+a mismatch means the simulation results changed.
+
+Usage: python regression/replay_rankings.py [--update] [--budget 2000] [--seed 2025] [fixture ...]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+
+CSV_PATH = os.path.join(ROOT, '09042025LEAGUE_Rankings_2.csv')
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+# Recommendations compared at every checkpoint
+NUM_RECOMMENDATIONS = 10
+
+# Scores may drift by float rounding (e.g. another BLAS), rankings may not
+SCORE_TOLERANCE = 1e-6
+
+
+def build_assistant(league_settings: dict) -> FantasyDraftAssistant:
+    """Fresh draft with a fixture's league settings."""
+    assistant = FantasyDraftAssistant(CSV_PATH)
+    assistant.set_num_teams(league_settings['num_teams'])
+    if league_settings.get('roster_constraints'):
+        assistant.set_roster_constraints(league_settings['roster_constraints'])
+    assistant.set_user_draft_position(league_settings['user_draft_position'])
+    assistant.reset_draft()
+    return assistant
+
+
+def replay(fixture: dict, budget: int, seed: int) -> list:
+    """Rankings at every user pick in the fixture's draft history."""
+    settings = fixture['league_settings']
+    with contextlib.redirect_stdout(io.StringIO()):
+        import fantasy_draft_web_enhanced as web
+        web.selected_scoring_format = settings.get('scoring_format', 'non-ppr')
+        assistant = build_assistant(settings)
+    checkpoints = []
+    for entry in fixture['draft_history']:
+        if entry['pick'] != assistant.current_pick:
+            raise ValueError(f"Draft history skips to pick {entry['pick']} at pick {assistant.current_pick}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            if assistant.get_current_pick_info().get('is_user_turn', False):
+                recommendations, _ = web.run_simulations_with_web_projections(
+                    assistant, NUM_RECOMMENDATIONS, simulation_budget=budget, seed=seed)
+                checkpoints.append({
+                    'pick': assistant.current_pick,
+                    'ranking': [rec['name'] for rec in recommendations],
+                    'scores': [round(rec['expected_season_score'], 6) for rec in recommendations],
+                    'simulations': [rec['simulations'] for rec in recommendations]
+                })
+            if not assistant.draft_player(entry['player']['name']):
+                raise ValueError(f"Could not draft {entry['player']['name']} at pick {entry['pick']}")
+    return checkpoints
+
+
+def compare(name: str, golden: list, checkpoints: list) -> list:
+    """Differences between a replay and its golden output, one message per mismatch."""
+    problems = []
+    if len(golden) != len(checkpoints):
+        problems.append(f"{name}: {len(checkpoints)} checkpoints, golden has {len(golden)}")
+    for expected, actual in zip(golden, checkpoints):
+        pick = expected['pick']
+        if expected['ranking'] != actual['ranking']:
+            problems.append(f"{name} pick {pick}: ranking {actual['ranking']} != golden {expected['ranking']}")
+            continue
+        if expected['simulations'] != actual['simulations']:
+            problems.append(f"{name} pick {pick}: simulations {actual['simulations']} != golden {expected['simulations']}")
+        for player, want, got in zip(expected['ranking'], expected['scores'], actual['scores']):
+            if abs(want - got) > SCORE_TOLERANCE * max(1.0, abs(want)):
+                problems.append(f"{name} pick {pick}: {player} scored {got} != golden {want}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fixtures', nargs='*', help='Fixture files (default: every file in regression/fixtures)')
+    parser.add_argument('--update', action='store_true', help='Rewrite the golden outputs instead of checking them')
+    parser.add_argument('--budget', type=int, default=2000, help='Simulation budget per checkpoint')
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.json')))
+    failures = []
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as f:
+            fixture = json.load(f)
+        checkpoints = replay(fixture, args.budget, args.seed)
+        golden_path = os.path.join(GOLDEN_DIR, f"{name}.json")
+        if args.update:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            with open(golden_path, 'w') as f:
+                json.dump({'budget': args.budget, 'seed': args.seed, 'checkpoints': checkpoints}, f, indent=1)
+            print(f"{name}: wrote {len(checkpoints)} checkpoints")
+            continue
+        if not os.path.exists(golden_path):
+            failures.append(f"{name}: no golden output (run with --update)")
+            continue
+        with open(golden_path) as f:
+            golden = json.load(f)
+        if (golden['budget'], golden['seed']) != (args.budget, args.seed):
+            failures.append(f"{name}: golden output was recorded with budget {golden['budget']} and seed {golden['seed']}")
+            continue
+        problems = compare(name, golden['checkpoints'], checkpoints)
+        failures.extend(problems)
+        print(f"{name}: {len(checkpoints)} checkpoints, {'OK' if not problems else f'{len(problems)} mismatches'}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from lineup_optimizer import NON_STARTING_SLOTS, LineupSlots, canonical_position, slot_eligibility
+
+# Starting needs used by the simulations when roster_constraints has no entry for a position
+NEED_DEFAULTS = {'QB': 1, 'WR': 2, 'RB': 2, 'TE': 1, 'K': 1, 'DST': 1}
+
+# Bench size when roster_constraints has no BN entry
+DEFAULT_BENCH = 6
+
+
+def dedicated_limits(roster_constraints: Dict[str, int], defaults: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Starting slots that take a single position, per canonical position (DEF counts as DST).
+
+    With defaults, returns the defaults' positions, using the default count for any position
+    roster_constraints has no single-position slot entry for.
+    """
+    limits: Dict[str, int] = {}
+    for slot, count in roster_constraints.items():
+        eligible = slot_eligibility(slot)
+        if slot not in NON_STARTING_SLOTS and len(eligible) == 1:
+            position = canonical_position(eligible[0])
+            limits[position] = limits.get(position, 0) + count
+    if defaults is None:
+        return limits
+    return {pos: limits.get(pos, count) for pos, count in defaults.items()}
+
+
+class RosterNeedsTracker:
+    """Position counts, starting slot usage and bench depth for one team.
+
+    Slots come from LineupSlots, the same definition the lineup scoring uses: players fill
+    their position's own slots first, then multi-position slots (FLEX, SUPERFLEX, ...) most
+    specific first, and everyone else is bench. Only the counts decide how many players land
+    in each group, so adding or removing a player is O(1) and the fill is redone over the
+    handful of slots the next time it is read.
+    """
+
+    def __init__(self, roster_constraints: Dict[str, int], players: Iterable = ()):
+        self.roster_constraints = roster_constraints
+        self.slots = LineupSlots.from_constraints(roster_constraints)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.size = 0
+        self._fill = None
+        for player in players:
+            self.add(player.position)
+
+    def add(self, position: str):
+        self.counts[canonical_position(position)] += 1
+        self.size += 1
+        self._fill = None
+
+    def remove(self, position: str):
+        position = canonical_position(position)
+        if self.counts[position] == 0:
+            raise ValueError(f"No {position} on this roster")
+        self.counts[position] -= 1
+        self.size -= 1
+        self._fill = None
+
+    def _filled(self) -> tuple:
+        """(starters, flex starters, open slots per multi-position slot name) for the current counts."""
+        if self._fill is None:
+            remaining = dict(self.counts)
+            starters = flex_used = 0
+            open_flex: Dict[str, int] = {}
+            for name, count, eligible in self.slots.slots:
+                free = count
+                for position in eligible:
+                    take = min(remaining.get(position, 0), free)
+                    remaining[position] = remaining.get(position, 0) - take
+                    free -= take
+                if len(eligible) == 1:
+                    starters += count - free
+                else:
+                    flex_used += count - free
+                    if free:
+                        open_flex[name] = open_flex.get(name, 0) + free
+            self._fill = (starters, flex_used, open_flex)
+        return self._fill
+
+    @property
+    def starters(self) -> int:
+        """Players in their own position's starting slots."""
+        return self._filled()[0]
+
+    @property
+    def flex_used(self) -> int:
+        """Players starting in multi-position slots."""
+        return self._filled()[1]
+
+    @property
+    def bench_used(self) -> int:
+        return self.size - self.starters - self.flex_used
+
+    @property
+    def bench_available(self) -> int:
+        return max(0, self.roster_constraints.get('BN', DEFAULT_BENCH) - self.bench_used)
+
+    def open_flex_slots(self) -> Dict[str, int]:
+        """Unfilled multi-position slots by slot name."""
+        return dict(self._filled()[2])
+
+    @property
+    def open_flex_positions(self) -> FrozenSet[str]:
+        """Positions that would start in an open multi-position slot."""
+        open_flex = self._filled()[2]
+        return frozenset(pos for name, _, eligible in self.slots.slots if name in open_flex for pos in eligible)
+
+    def bench_depth(self, position: str) -> int:
+        """Players already rostered at a position, i.e. the bench depth a new one would take."""
+        return self.counts.get(canonical_position(position), 0)
+
+    def position_needs(self, defaults: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """Open single-position starting slots per position (every one the league has, or the defaults' positions)."""
+        return {pos: max(0, limit - self.counts.get(pos, 0))
+                for pos, limit in dedicated_limits(self.roster_constraints, defaults).items()}
@@ -0,0 +1,156 @@
+import math
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from simulation_engine import BoardSnapshot, RolloutTrace, compare_candidates, difference_stats
+from simulation_profile import SimulationProfile
+
+# Every candidate gets at least this many simulations per round it survives
+MIN_ROUND_SIMULATIONS = 100
+
+# Under a deadline the first round is a small probe that measures throughput
+PROBE_SIMULATIONS = 20
+
+# Share of the remaining time a round may plan to use (pool overhead and stragglers eat the rest)
+DEADLINE_SAFETY = 0.85
+
+# A candidate is out once it trails the k-th best by this many standard errors
+ELIMINATION_Z = 2.0
+
+
+@dataclass
+class AllocationResult:
+    """Scores and per-candidate statistics from an adaptive simulation race."""
+    scores: Dict[int, np.ndarray]
+    stats: Dict[int, dict]
+    rounds: int = 0
+    simulations: int = 0
+    settled: bool = False
+    elapsed: float = 0.0  # seconds
+    eliminated: Dict[int, int] = field(default_factory=dict)  # candidate -> round it was dropped in
+    leader: Optional[int] = None  # best candidate after the latest round
+    cancelled: bool = False
+    traces: Dict[int, RolloutTrace] = field(default_factory=dict)  # aligned with scores when traced
+    survival: Dict[int, np.ndarray] = field(default_factory=dict)  # candidate -> RolloutTrace.survival counts
+
+
+def _ranking_settled(ranked: List[int], scores, offsets, top_k: int, paired: bool, antithetic: bool, z: float) -> bool:
+    # Settled once each of the top k is separated from the next candidate down
+    for better, worse in zip(ranked[:top_k], ranked[1:top_k + 1]):
+        diff, error = difference_stats(scores[better], scores[worse], paired, antithetic)
+        diff += offsets.get(better, 0.0) - offsets.get(worse, 0.0)
+        if diff <= z * error:
+            return False
+    return True
+
+
+def _round_size(result: AllocationResult, survivors: int, planned_rounds: int, budget: Optional[int],
+                deadline: Optional[float], started: float) -> int:
+    """Simulations per survivor for the next round, or 0 when nothing more fits."""
+    rounds_left = max(1, planned_rounds - result.rounds)
+    per_candidate = None
+    if budget is not None:
+        remaining = budget - result.simulations
+        per_candidate = max(MIN_ROUND_SIMULATIONS, remaining // (rounds_left * survivors))
+        if result.rounds and per_candidate * survivors > remaining:
+            return 0
+    if deadline is not None:
+        if not result.rounds:
+            return PROBE_SIMULATIONS
+        # Size the round from the throughput measured so far, leaving time for later rounds to prune
+        rate = result.simulations / max(time.monotonic() - started, 1e-6)
+        time_left = deadline - time.monotonic()
+        affordable = int(rate * time_left * DEADLINE_SAFETY / rounds_left) // survivors
+        if affordable < PROBE_SIMULATIONS:
+            return 0
+        per_candidate = affordable if per_candidate is None else min(per_candidate, affordable)
+    return per_candidate
+
+
+def allocate_simulations(executor, snapshot: BoardSnapshot, candidates: Sequence[int], budget: Optional[int] = None,
+                         top_k: int = 5, offsets: Optional[Dict[int, float]] = None, seed: Optional[int] = None,
+                         paired: bool = True, antithetic: bool = False, z: float = ELIMINATION_Z,
+                         deadline: Optional[float] = None, should_stop: Optional[Callable[[], bool]] = None,
+                         progress: Optional[Callable[[AllocationResult], None]] = None,
+                         traced: bool = False, profile: Optional[SimulationProfile] = None) -> AllocationResult:
+    """Race candidates with successive halving and spend the budget on the ones still in contention.
+
+    Each round simulates every survivor, drops candidates that trail the k-th best by more than z
+    standard errors, keeps at most half of the field (never fewer than top_k) and stops early once
+    the top-k ordering is settled. offsets are added to each candidate's mean before ranking.
+
+    budget caps the number of simulations and deadline (a time.monotonic() timestamp) caps the
+    wall clock; with a deadline the race returns its best-so-far ranking when time runs out.
+    should_stop is checked before every round and ends the race early (result.cancelled), and
+    progress is called with the running result after every round. traced keeps each score's
+    RolloutTrace in result.traces. profile collects phase timers and counters across every round.
+    """
+    if budget is None and deadline is None:
+        raise ValueError("allocate_simulations needs a simulation budget or a deadline")
+    started = time.monotonic()
+    offsets = offsets or {}
+    candidates = list(dict.fromkeys(candidates))
+    top_k = max(1, min(top_k, len(candidates)))
+    scores = {candidate: np.empty(0) for candidate in candidates}
+    result = AllocationResult(scores, {})
+    if not candidates:
+        return result
+
+    # Halving from n candidates down to top_k takes about log2(n / k) rounds, plus a final one
+    planned_rounds = max(1, math.ceil(math.log2(max(len(candidates) / top_k, 1)))) + 1
+    if deadline is not None:
+        planned_rounds += 1  # the throughput probe
+    root_seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    survivors = candidates
+
+    while survivors:
+        if should_stop is not None and should_stop():
+            result.cancelled = True
+            break
+        per_candidate = _round_size(result, len(survivors), planned_rounds, budget, deadline, started)
+        if per_candidate <= 0:
+            break
+
+        batch, batch_traces = executor.run_traced(snapshot, survivors, per_candidate, seed=root_seed.spawn(1)[0],
+                                                  paired=paired, antithetic=antithetic, profile=profile)
+        for candidate, batch_scores in batch.items():
+            scores[candidate] = np.concatenate([scores[candidate], batch_scores])
+            result.simulations += len(batch_scores)
+            result.survival[candidate] = result.survival.get(candidate, 0) + batch_traces[candidate].survival
+            if traced:
+                previous = result.traces.get(candidate)
+                trace = batch_traces[candidate]
+                result.traces[candidate] = trace if previous is None else RolloutTrace.concatenate([previous, trace])
+        result.rounds += 1
+
+        means = {candidate: scores[candidate].mean() + offsets.get(candidate, 0.0) for candidate in survivors}
+        ranked = sorted(survivors, key=means.get, reverse=True)
+        result.leader = ranked[0]
+        survivors = ranked[:top_k]
+        if len(ranked) > top_k:
+            # Keep whoever can still reach the k-th best, but at most half of the field
+            cutoff = ranked[top_k - 1]
+            for candidate in ranked[top_k:]:
+                diff, error = difference_stats(scores[candidate], scores[cutoff], paired, antithetic)
+                if diff + offsets.get(candidate, 0.0) - offsets.get(cutoff, 0.0) + z * error >= 0:
+                    survivors.append(candidate)
+            # The deadline probe is too small to halve on
+            if deadline is None or result.rounds > 1:
+                survivors = survivors[:max(top_k, math.ceil(len(ranked) / 2))]
+            for candidate in ranked:
+                if candidate not in survivors:
+                    result.eliminated[candidate] = result.rounds
+
+        result.settled = len(survivors) <= top_k and _ranking_settled(
+            survivors, scores, offsets, top_k, paired, antithetic, z)
+        if progress is not None:
+            result.elapsed = time.monotonic() - started
+            progress(result)
+        if result.settled:
+            break
+
+    result.stats = compare_candidates(scores, paired, antithetic, offsets)
+    result.elapsed = time.monotonic() - started
+    return result
@@ -0,0 +1,152 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from simulation_engine import BoardSnapshot, merge_candidate_stats
+
+# Stored simulation scores across all boards before the least recently used are evicted
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def board_key(snapshot: BoardSnapshot, paired: bool = True, antithetic: bool = False,
+              seed: Optional[int] = None) -> str:
+    """Canonical hash of everything a simulation result depends on.
+
+    Covers the players and their projections (so the scoring format and custom projections),
+    the league settings and draft slot, the board itself, the sampling mode and the seed.
+    """
+    table, board = snapshot.table, snapshot.board
+    digest = hashlib.sha256()
+    digest.update(repr(snapshot.settings).encode())
+    digest.update('\n'.join(table.names).encode())
+    for array in (table.projection, table.adp, table.position, table.bye):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    if table.weekly is not None:
+        digest.update(np.ascontiguousarray(table.weekly).tobytes())
+    digest.update(np.packbits(board.available).tobytes())
+    digest.update(np.ascontiguousarray(board.team_sizes, dtype=np.int32).tobytes())
+    digest.update(repr((sorted(board.user_roster), board.current_pick, paired, antithetic, seed)).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class SimulationRecord:
+    """Every simulation run stored for one board."""
+    antithetic: bool
+    runs: List[Dict[int, np.ndarray]] = field(default_factory=list)
+    run_paired: List[bool] = field(default_factory=list)  # whether each run used common random numbers
+    settled: bool = False  # the latest run settled the top of the ranking
+    survival: Dict[int, np.ndarray] = field(default_factory=dict)  # candidate -> summed RolloutTrace.survival
+    survival_sims: Dict[int, int] = field(default_factory=dict)  # simulations behind each candidate's survival
+
+    @property
+    def simulations(self) -> int:
+        return sum(len(scores) for run in self.runs for scores in run.values())
+
+    @property
+    def nbytes(self) -> int:
+        return (sum(scores.nbytes for run in self.runs for scores in run.values())
+                + sum(counts.nbytes for counts in self.survival.values()))
+
+    def candidate_stats(self, offsets: Optional[Dict[int, float]] = None) -> Dict[int, dict]:
+        """Per-candidate statistics merged across every stored run."""
+        return merge_candidate_stats(self.runs, self.run_paired, self.antithetic, offsets)
+
+    def availability(self) -> Optional[np.ndarray]:
+        """Probability that the opponents leave each player for each of the user's upcoming picks.
+
+        The user's own simulated picks before then do not count against a player. Rows follow
+        the upcoming picks and columns the player table. A candidate is never on the
+        board in its own simulations, so its probability comes from the other candidates' sims.
+        """
+        if not self.survival:
+            return None
+        counts = np.sum(list(self.survival.values()), axis=0).astype(np.float64)
+        sims = np.full(counts.shape[1], float(sum(self.survival_sims.values())))
+        for candidate, num_sims in self.survival_sims.items():
+            sims[candidate] -= num_sims
+        return np.divide(counts, sims, out=np.zeros_like(counts), where=sims > 0)
+
+
+class SimulationCache:
+    """Size-bounded LRU map from board_key() to the simulations run on that board."""
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._records: 'OrderedDict[str, SimulationRecord]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[SimulationRecord]:
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._records.move_to_end(key)
+            return record
+
+    def peek(self, key: str) -> Optional[SimulationRecord]:
+        """Look up a board without touching the counters or the LRU order."""
+        with self._lock:
+            return self._records.get(key)
+
+    def add_run(self, key: str, scores: Dict[int, np.ndarray], paired: bool = True, antithetic: bool = False,
+                settled: bool = False, survival: Optional[Dict[int, np.ndarray]] = None) -> SimulationRecord:
+        """Store one run's scores for a board, merging with earlier runs on it.
+
+        paired marks runs whose candidates shared scenarios; reused rollouts are independent.
+        """
+        run = {candidate: np.asarray(batch, dtype=np.float64) for candidate, batch in scores.items() if len(batch)}
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                record = self._records[key] = SimulationRecord(antithetic)
+            self._records.move_to_end(key)
+            record.settled = settled
+            if run:
+                record.runs.append(run)
+                record.run_paired.append(paired)
+                self._bytes += sum(batch.nbytes for batch in run.values())
+            for candidate, counts in (survival or {}).items():
+                if candidate in record.survival:
+                    record.survival[candidate] = record.survival[candidate] + counts
+                else:
+                    record.survival[candidate] = counts
+                    self._bytes += counts.nbytes
+                record.survival_sims[candidate] = record.survival_sims.get(candidate, 0) + len(run.get(candidate, ()))
+            # Evict least recently used boards, never the one just stored
+            while self._bytes > self.max_bytes and len(self._records) > 1:
+                _, evicted = self._records.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+            return record
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'boards': len(self._records),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+
+# Global instance
+simulation_cache = SimulationCache()
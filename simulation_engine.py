@@ -0,0 +1,943 @@
+import contextlib
+import functools
+import time
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from lineup_optimizer import LineupSlots
+from roster_tracker import DEFAULT_BENCH, NEED_DEFAULTS, dedicated_limits
+from simulation_profile import SimulationProfile
+
+# Position codes used by the array engine. DEF is accepted as an alias for DST
+# and anything unrecognised is treated as OTHER (drafted, but never started).
+POSITIONS = ('QB', 'RB', 'WR', 'TE', 'K', 'DST', 'OTHER')
+POSITION_CODES = {pos: code for code, pos in enumerate(POSITIONS)}
+POSITION_CODES['DEF'] = POSITION_CODES['DST']
+QB, RB, WR, TE, K, DST, OTHER = range(len(POSITIONS))
+
+# Bench value multipliers by bench depth (same rules as calculate_bench_value_for_player_web_projections)
+BENCH_MULTIPLIERS = {
+    QB: (0.35,),
+    RB: (0.22, 0.14, 0.12, 0.05),
+    WR: (0.22, 0.14, 0.12, 0.05),
+}
+BENCH_TAIL_MULTIPLIERS = {RB: 0.05, WR: 0.05}
+
+# Starting K and DST only count for 40% of their projection
+STARTER_WEIGHTS = {K: 0.40, DST: 0.40, OTHER: 0.0}
+
+# Simulated user pick policy: (200 - adp) + need bonus + randint(-10, 10)
+USER_ADP_BASE = 200
+USER_NEED_BONUS = 100
+USER_BENCH_QB_BONUS = 20
+USER_NOISE = 10
+INELIGIBLE = -1e6  # bonus that keeps a position below the -1 pick threshold
+
+# Opponent models: 'adp_window' re-ranks the board every pick (70% best ADP,
+# otherwise one of the top 6 available); 'noisy_adp' draws one perturbed ADP
+# ranking per simulation and walks it with a pointer.
+OPPONENT_ADP_WINDOW = 'adp_window'
+OPPONENT_NOISY_ADP = 'noisy_adp'
+OPPONENT_MODELS = (OPPONENT_ADP_WINDOW, OPPONENT_NOISY_ADP)
+OPPONENT_ADP_PROBABILITY = 0.7
+OPPONENT_WINDOW = 6
+
+# Noisy ADP: each player is pulled forward 1..NOISY_ADP_MAX_REACH ranking slots
+# with probability NOISY_ADP_REACH_PROBABILITY. Calibrated with
+# benchmarks/opponent_models.py so the pick-distance distribution matches the
+# adp_window rule (75% best available, 5% each for the next five).
+NOISY_ADP_REACH_PROBABILITY = 0.3
+NOISY_ADP_MAX_REACH = 6
+
+# Sampling modes across candidates: 'paired' runs every candidate against the
+# same pre-drawn scenarios (common random numbers), 'independent' gives each
+# candidate its own draws.
+SAMPLING_PAIRED = 'paired'
+SAMPLING_INDEPENDENT = 'independent'
+SAMPLING_MODES = (SAMPLING_PAIRED, SAMPLING_INDEPENDENT)
+
+# Roster scoring: 'season' values each starter's full season projection; 'weekly' sums the
+# optimal lineup of every regular-season week, so bench players cover starters on bye.
+LINEUP_SEASON = 'season'
+LINEUP_WEEKLY = 'weekly'
+LINEUP_SCORING_MODES = (LINEUP_SEASON, LINEUP_WEEKLY)
+SEASON_WEEKS = 17
+
+# Default number of simulated drafts advanced together
+DEFAULT_CHUNK_SIZE = 2048
+
+# Normal quantile for the reported 95% confidence intervals
+CONFIDENCE_Z = 1.96
+
+# Fixed seed for the per-player keys behind availability_hash, so hashes agree across processes
+BOARD_HASH_SEED = 90425
+
+# Roster values remembered by each simulator before the least recently used are evicted
+ROSTER_MEMO_SIZE = 200000
+
+
+def position_code(position: str) -> int:
+    """Map a position string to its engine code."""
+    return POSITION_CODES.get(position, OTHER)
+
+
+def engine_lineup_slots(roster_constraints: Dict[str, int]) -> LineupSlots:
+    """A league's starting slots in engine position codes (positions the engine maps to OTHER never start)."""
+    return LineupSlots.from_constraints(roster_constraints).map_positions(
+        lambda pos: None if position_code(pos) == OTHER else position_code(pos))
+
+
+def noisy_adp_keys(num_players: int, rng: np.random.Generator, size: Optional[int] = None,
+                   reach_probability: float = NOISY_ADP_REACH_PROBABILITY,
+                   max_reach: int = NOISY_ADP_MAX_REACH) -> np.ndarray:
+    """Perturbed sort keys for players already ordered by ADP (lower key is drafted first)."""
+    shape = (num_players,) if size is None else (size, num_players)
+    reach = np.where(rng.random(shape) < reach_probability, rng.integers(1, max_reach + 1, size=shape), 0)
+    # Sub-slot jitter breaks ties between players pulled onto the same slot
+    return np.arange(num_players) - reach + rng.random(shape) * 0.5
+
+
+def noisy_adp_order(ranked: Sequence[int], rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Reorder player IDs already ranked by ADP by one noisy ADP draw (used by the scalar simulations)."""
+    keys = noisy_adp_keys(len(ranked), rng if rng is not None else np.random.default_rng())
+    return np.asarray(ranked)[np.argsort(keys)]
+
+
+@functools.lru_cache(maxsize=8)
+def _player_hash_keys(num_players: int) -> np.ndarray:
+    keys = np.random.default_rng(BOARD_HASH_SEED).integers(
+        np.iinfo(np.int64).min, np.iinfo(np.int64).max, num_players, dtype=np.int64)
+    keys.setflags(write=False)
+    return keys
+
+
+def availability_hash(available: np.ndarray) -> np.ndarray:
+    """Order-independent 64-bit hash of availability flags (one per row for a batch of boards)."""
+    # Sums of random 64-bit keys wrap around, which keeps them uniformly spread
+    return np.where(available, _player_hash_keys(available.shape[-1]), 0).sum(axis=-1)
+
+
+def roster_signature(roster: np.ndarray, num_players: int) -> np.ndarray:
+    """Order-independent 64-bit signature of each roster row (table indices, -1 for empty)."""
+    keys = _player_hash_keys(num_players)
+    return np.where(roster >= 0, keys[np.maximum(roster, 0)], 0).sum(axis=-1)
+
+
+class RosterValueMemo:
+    """LRU map from a roster signature to its season value, with hit and miss counters."""
+
+    def __init__(self, max_entries: int = ROSTER_MEMO_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._values: 'OrderedDict[object, float]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key) -> Optional[float]:
+        value = self._values.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._values.move_to_end(key)
+        return value
+
+    def put(self, key, value: float):
+        self._values[key] = value
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Values for a batch of keys, NaN where the roster has not been valued yet."""
+        values = np.empty(len(keys), dtype=np.float64)
+        for i, key in enumerate(keys.tolist()):
+            value = self.get(key)
+            values[i] = np.nan if value is None else value
+        return values
+
+    def store(self, keys: np.ndarray, values: np.ndarray):
+        for key, value in zip(keys.tolist(), values.tolist()):
+            self.put(key, value)
+
+    def clear(self):
+        self._values.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'rosters': len(self._values),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class ScenarioStream:
+    """Random draws laid out with simulations on the first axis, optionally as antithetic pairs.
+
+    The engine draws the same shapes in the same order whatever the board looks like, so every
+    candidate run from one seed faces the same opponent scenarios.
+    """
+
+    def __init__(self, rng: np.random.Generator, antithetic: bool = False):
+        self.rng = rng
+        self.antithetic = antithetic
+
+    def random(self, size, dtype=np.float64) -> np.ndarray:
+        if not self.antithetic:
+            return self.rng.random(size, dtype=dtype)
+        size = (size,) if np.isscalar(size) else tuple(size)
+        # Sims 2i and 2i + 1 see mirrored uniforms u and 1 - u
+        u = self.rng.random(((size[0] + 1) // 2,) + size[1:], dtype=dtype)
+        return np.stack([u, 1 - u], axis=1).reshape((-1,) + size[1:])[:size[0]]
+
+    def integers(self, low: int, high: int, size, dtype=np.int64) -> np.ndarray:
+        if not self.antithetic:
+            return self.rng.integers(low, high, size=size, dtype=dtype)
+        scaled = (self.random(size, dtype=np.float32) * (high - low)).astype(dtype)
+        return low + np.minimum(scaled, high - low - 1)
+
+
+def weekly_projection_matrix(projection: np.ndarray, bye: np.ndarray, num_weeks: int = SEASON_WEEKS,
+                             weekly: Optional[np.ndarray] = None) -> np.ndarray:
+    """(players x weeks) points: each season projection split evenly (or the given per-week
+    projections), -inf in the player's bye week."""
+    weeks = np.arange(1, num_weeks + 1)
+    if weekly is None:
+        weekly = np.repeat((np.asarray(projection, dtype=np.float64) / num_weeks)[:, None], num_weeks, axis=1)
+    else:
+        weekly = np.array(weekly[:, :num_weeks], dtype=np.float64)
+    weekly[np.asarray(bye)[:, None] == weeks] = -np.inf
+    return weekly
+
+
+def weekly_lineup_points(points: np.ndarray, positions: np.ndarray, lineup_slots: LineupSlots,
+                         starter_weights: Optional[np.ndarray] = None, presorted: bool = False) -> np.ndarray:
+    """Optimal lineup points for every roster and week of a batch.
+
+    points is (rosters, slots, weeks) with -inf for empty slots and byes, positions is (rosters,
+    slots) engine codes and lineup_slots the league's starting slots in engine codes.
+    presorted skips the per-week sort when every week already ranks the slots best first.
+    Returns (rosters, weeks).
+    """
+    points = np.ascontiguousarray(np.swapaxes(points, 1, 2))  # (rosters, weeks, slots)
+    positions = np.broadcast_to(positions[:, None, :], points.shape)
+    if not presorted:
+        order = np.argsort(-points, axis=2)
+        points = np.take_along_axis(points, order, axis=2)
+        positions = np.take_along_axis(positions, order, axis=2)
+    starters = lineup_slots.starting_mask(positions, points > -np.inf)
+
+    lineup = np.where(starters, points, 0.0)
+    if starter_weights is not None:
+        lineup *= starter_weights[np.maximum(positions, 0)]
+    return lineup.sum(axis=2)
+
+
+def bench_multiplier_table(max_depth: int) -> np.ndarray:
+    """Build a (positions x depth) table of bench value multipliers."""
+    table = np.zeros((len(POSITIONS), max_depth + 1), dtype=np.float64)
+    for code, multipliers in BENCH_MULTIPLIERS.items():
+        tail = BENCH_TAIL_MULTIPLIERS.get(code, 0.0)
+        for depth in range(max_depth + 1):
+            table[code, depth] = multipliers[depth] if depth < len(multipliers) else tail
+    return table
+
+
+class PlayerTable:
+    """Column-oriented player pool, ordered by ADP, used by the batched engine."""
+
+    def __init__(self, players: Sequence, projections: Dict[str, float]):
+        # Stable sort keeps the original order for equal ADP values
+        self.players = sorted(players, key=lambda p: p.adp)
+        self.names = [p.name for p in self.players]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.adp = np.array([p.adp for p in self.players], dtype=np.float64)
+        self.projection = np.array([projections.get(p.name, p.projected_points) or 0.0 for p in self.players], dtype=np.float64)
+        self.position = np.array([position_code(p.position) for p in self.players], dtype=np.int8)
+        self.bye = np.array([p.bye_week or 0 for p in self.players], dtype=np.int8)
+        self.weekly: Optional[np.ndarray] = None  # (player x week) projections when weekly ones were loaded
+
+    @classmethod
+    def from_players(cls, players: Sequence, projection_lookup: Callable[[str], float]) -> 'PlayerTable':
+        """Build a table, resolving each player's projection through projection_lookup."""
+        return cls(players, {p.name: projection_lookup(p.name) for p in players})
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def indices(self, players: Sequence) -> List[int]:
+        """Get table indices for a list of players."""
+        return [self.index[p.name] for p in players]
+
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    """League settings resolved into the arrays the engine needs."""
+    draft_order: tuple  # 0-based team index for every pick
+    num_teams: int
+    user_team: int
+    roster_size: int
+    need_limits: tuple  # single-position starting slots per position code, for the simulated user's needs
+    bench_limit: int
+    lineup_slots: LineupSlots  # starting slots in engine position codes, also what the user's needs fill
+    opponent_model: str = OPPONENT_ADP_WINDOW
+    lineup_scoring: str = LINEUP_SEASON
+
+    @classmethod
+    def from_assistant(cls, assistant, opponent_model: str = OPPONENT_ADP_WINDOW,
+                       lineup_scoring: str = LINEUP_SEASON) -> 'SimulationSettings':
+        """Resolve settings the same way the web simulation helpers read roster_constraints."""
+        constraints = assistant.roster_constraints
+        limits = dedicated_limits(constraints, NEED_DEFAULTS)
+        need_limits = [limits.get(pos, 0) for pos in POSITIONS]
+        need_limits[OTHER] = 0
+        return cls(
+            draft_order=tuple(team_id - 1 for _, team_id in assistant.draft_order),
+            num_teams=assistant.num_teams,
+            user_team=assistant.user_draft_position - 1,
+            roster_size=sum(constraints.values()),
+            need_limits=tuple(need_limits),
+            bench_limit=constraints.get('BN', DEFAULT_BENCH),
+            lineup_slots=engine_lineup_slots(constraints),
+            opponent_model=opponent_model,
+            lineup_scoring=lineup_scoring
+        )
+
+
+@dataclass(frozen=True)
+class BoardState:
+    """Compact snapshot of a live draft in table indices."""
+    available: np.ndarray  # bool per table index
+    team_sizes: np.ndarray  # roster length per team
+    user_roster: tuple  # table indices on the user's roster
+    current_pick: int  # 1-based pick that is on the clock
+
+    def __post_init__(self):
+        # Snapshots are shared between simulations and threads, so freeze the arrays too
+        self.available.setflags(write=False)
+        self.team_sizes.setflags(write=False)
+
+    @classmethod
+    def from_assistant(cls, assistant, table: PlayerTable) -> 'BoardState':
+        """Capture the assistant's current draft state."""
+        # Hold the draft lock so a concurrent pick cannot land halfway through the copy
+        with getattr(assistant, 'lock', None) or contextlib.nullcontext():
+            if table.players == getattr(assistant, 'player_by_id', None):
+                # Table and board share the ADP ordering, so board IDs are table indices
+                available = assistant.board.available.astype(bool)
+            else:
+                available = np.zeros(len(table), dtype=bool)
+                available[table.indices(assistant.available_players)] = True
+            team_sizes = np.array([len(assistant.drafted_players.get(team, [])) for team in assistant.teams], dtype=np.int32)
+            user_team = assistant.teams[assistant.user_draft_position - 1]
+            user_roster = tuple(table.indices(assistant.drafted_players.get(user_team, [])))
+            return cls(available, team_sizes, user_roster, assistant.current_pick)
+
+
+@dataclass(frozen=True)
+class RolloutTrace:
+    """Where each simulated draft stood when the user was next on the clock.
+
+    survival counts, for each of the user's upcoming picks (rows) and every player (columns),
+    how many of the sims still had that player on the board when the user was on the clock.
+    """
+    next_board: np.ndarray  # availability_hash of that board, 0 if the user never picked again
+    next_pick: np.ndarray  # table index the simulated user drafted there, -1 if none
+    survival: np.ndarray
+
+    @classmethod
+    def concatenate(cls, traces: Sequence['RolloutTrace']) -> 'RolloutTrace':
+        return cls(np.concatenate([t.next_board for t in traces]), np.concatenate([t.next_pick for t in traces]),
+                   np.sum([t.survival for t in traces], axis=0))
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    """Everything a simulation needs, detached from the live FantasyDraftAssistant."""
+    table: PlayerTable
+    settings: SimulationSettings
+    board: BoardState
+
+    @classmethod
+    def from_assistant(cls, assistant, projection_lookup: Optional[Callable[[str], float]] = None,
+                       opponent_model: str = OPPONENT_ADP_WINDOW, lineup_scoring: str = LINEUP_SEASON) -> 'BoardSnapshot':
+        """Capture the assistant's draft, resolving projections through projection_lookup (default: the assistant's own)."""
+        with getattr(assistant, 'lock', None) or contextlib.nullcontext():
+            if projection_lookup is None:
+                table = PlayerTable(assistant.players, {p.name: assistant.get_player_projected_points(p) for p in assistant.players})
+            else:
+                table = PlayerTable.from_players(assistant.players, projection_lookup)
+            settings = SimulationSettings.from_assistant(assistant, opponent_model, lineup_scoring)
+            weekly_store = getattr(assistant, 'weekly_projections', None)
+            if weekly_store is not None and weekly_store.has_weekly(assistant.scoring_format):
+                # Store rows follow the assistant's ADP order, the same stable sort as the table
+                table.weekly = weekly_store.overlay(assistant.scoring_format, table.projection)
+            return cls(table, settings, BoardState.from_assistant(assistant, table))
+
+    def candidate_index(self, candidate) -> int:
+        """Resolve a table index, player name or Player to a table index."""
+        if isinstance(candidate, (int, np.integer)):
+            return int(candidate)
+        return self.table.index[candidate if isinstance(candidate, str) else candidate.name]
+
+
+class BatchDraftSimulator:
+    """Advance many simulated drafts together, one pick slot at a time."""
+
+    def __init__(self, table: PlayerTable, settings: SimulationSettings, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 truncate_horizon: bool = True):
+        self.table = table
+        self.settings = settings
+        self.chunk_size = chunk_size
+        self.truncate_horizon = truncate_horizon
+
+        # Nothing after the user's final slot in the draft order can change the user's roster
+        user_picks = [pick for pick, team in enumerate(settings.draft_order, 1) if team == settings.user_team]
+        self.last_user_pick = user_picks[-1] if user_picks else 0
+
+        self.need_limits = np.array(settings.need_limits, dtype=np.int32)
+        # Starting slots in fill order (most specific first), as (count, eligible codes)
+        self.slot_fill = [(count, np.array(sorted(eligible), dtype=np.intp))
+                          for _, count, eligible in settings.lineup_slots.slots]
+        self.bench_multipliers = bench_multiplier_table(settings.roster_size)
+        self.starter_weights = np.ones(len(POSITIONS), dtype=np.float64)
+        for code, weight in STARTER_WEIGHTS.items():
+            self.starter_weights[code] = weight
+        self.adp_value = (USER_ADP_BASE - table.adp).astype(np.float32)
+
+        # One-hot position matrix so per-position bonuses expand to players with a matmul
+        self.position_onehot = np.zeros((len(POSITIONS), len(table)), dtype=np.float32)
+        self.position_onehot[table.position, np.arange(len(table))] = 1.0
+        self.position_projection = self.position_onehot * table.projection.astype(np.float32)
+        if settings.lineup_scoring == LINEUP_WEEKLY:
+            self.weekly_points = weekly_projection_matrix(table.projection, table.bye, weekly=table.weekly)
+
+        # End-of-draft rosters repeat across sims and batches, so each distinct roster is valued once
+        self.roster_memo = RosterValueMemo()
+
+        # Phase timers and counters; None (the default) skips all profiling
+        self.profile: Optional[SimulationProfile] = None
+
+    def run(self, board: BoardState, candidate: int, num_sims: int, rng: np.random.Generator,
+            antithetic: bool = False) -> np.ndarray:
+        """Draft candidate for the user, simulate the rest of the draft and return season scores.
+
+        Runs from equal rng states share their scenarios, so scores line up sim by sim across candidates.
+        """
+        return self.run_traced(board, candidate, num_sims, rng, antithetic)[0]
+
+    def run_traced(self, board: BoardState, candidate: int, num_sims: int, rng: np.random.Generator,
+                   antithetic: bool = False) -> Tuple[np.ndarray, RolloutTrace]:
+        """Like run(), plus a trace of the board and pick at the user's next turn in each sim."""
+        stream = ScenarioStream(rng, antithetic)
+        scores = np.empty(num_sims, dtype=np.float64)
+        next_board = np.zeros(num_sims, dtype=np.int64)
+        next_pick = np.full(num_sims, -1, dtype=np.int32)
+        survival = np.zeros((len(self.upcoming_user_picks(board)), len(self.table)), dtype=np.int64)
+        for start in range(0, num_sims, self.chunk_size):
+            stop = min(start + self.chunk_size, num_sims)
+            scores[start:stop] = self._run_chunk(board, candidate, stop - start, stream,
+                                                 next_board[start:stop], next_pick[start:stop], survival)
+        return scores, RolloutTrace(next_board, next_pick, survival)
+
+    def upcoming_user_picks(self, board: BoardState) -> List[int]:
+        """The user's picks after the current one that the simulations play out."""
+        last_pick = self.last_user_pick if self.truncate_horizon else len(self.settings.draft_order)
+        return [pick for pick in range(board.current_pick + 1, last_pick + 1)
+                if self.settings.draft_order[pick - 1] == self.settings.user_team]
+
+    def _run_chunk(self, board: BoardState, candidate: int, num_sims: int, stream: ScenarioStream,
+                   next_board: np.ndarray, next_pick: np.ndarray, survival: np.ndarray) -> np.ndarray:
+        available = np.repeat(board.available[None, :], num_sims, axis=0)
+        team_sizes = np.repeat(board.team_sizes[None, :].astype(np.int32), num_sims, axis=0)
+        # User roster as fixed slots plus position counts
+        roster = np.full((num_sims, max(self.settings.roster_size, len(board.user_roster)) + 1), -1, dtype=np.int32)
+        roster[:, :len(board.user_roster)] = board.user_roster
+        state = self._batch_state(available, team_sizes, roster)
+        # User noise is only drawn for players on the board when the chunk starts
+        pool = np.flatnonzero(board.available)
+        scenarios = self._opponent_scenarios(stream, num_sims, len(self._horizon(board.current_pick + 1)))
+
+        self._draft_user(state, np.arange(num_sims), np.full(num_sims, candidate, dtype=np.int64))
+        trace = (next_board, next_pick, survival, len(board.user_roster) + 1)
+        return self._play_out(state, board.current_pick + 1, stream, pool, scenarios, trace)
+
+    def run_states(self, available: np.ndarray, team_sizes: np.ndarray, roster: np.ndarray, first_pick: int,
+                   rng: np.random.Generator) -> np.ndarray:
+        """Season scores for drafts that each resume from their own board at first_pick.
+
+        available, team_sizes and roster (table indices, -1 for empty) hold one row per draft;
+        the user's later picks follow the simulated user policy.
+        """
+        num_drafts = len(available)
+        scores = np.empty(num_drafts, dtype=np.float64)
+        stream = ScenarioStream(rng)
+        width = max(self.settings.roster_size, roster.shape[1]) + 1
+        for start in range(0, num_drafts, self.chunk_size):
+            stop = min(start + self.chunk_size, num_drafts)
+            chunk_roster = np.full((stop - start, width), -1, dtype=np.int32)
+            chunk_roster[:, :roster.shape[1]] = roster[start:stop]
+            state = self._batch_state(available[start:stop].copy(), team_sizes[start:stop].astype(np.int32),
+                                      chunk_roster)
+            pool = np.flatnonzero(available[start:stop].any(axis=0))
+            scenarios = self._opponent_scenarios(stream, stop - start, len(self._horizon(first_pick)))
+            scores[start:stop] = self._play_out(state, first_pick, stream, pool, scenarios)
+        return scores
+
+    def _horizon(self, first_pick: int) -> range:
+        last_pick = self.last_user_pick if self.truncate_horizon else len(self.settings.draft_order)
+        return range(first_pick, last_pick + 1)
+
+    def _batch_state(self, available: np.ndarray, team_sizes: np.ndarray, roster: np.ndarray) -> tuple:
+        """Engine state for a batch of drafts; roster is padded with -1 and takes the user's picks."""
+        remaining = available.sum(axis=1).astype(np.int32)
+        roster_len = (roster >= 0).sum(axis=1).astype(np.int32)
+        counts = np.zeros((len(roster), len(POSITIONS)), dtype=np.int32)
+        filled = roster >= 0
+        np.add.at(counts, (np.nonzero(filled)[0], self.table.position[roster[filled]]), 1)
+        return available, team_sizes, remaining, roster, roster_len, counts
+
+    def _play_out(self, state, first_pick: int, stream: ScenarioStream, pool: np.ndarray, scenarios: tuple,
+                  trace: Optional[tuple] = None) -> np.ndarray:
+        """Play every pick from first_pick on and value the user's rosters.
+
+        trace is (next_board, next_pick, survival, next_slot) to record where each draft stood at
+        the user's next turn and which players the opponents had left at each of the user's
+        picks. Players the simulated user drafted along the way count as left, so survival
+        measures the opponents alone rather than the simulated user's own policy.
+        """
+        settings = self.settings
+        profile = self.profile
+        available, team_sizes, remaining, roster, roster_len, counts = state
+        num_sims = len(available)
+        rows = np.arange(num_sims)
+        horizon = self._horizon(first_pick)
+        if profile is not None:
+            profile.count('simulations', num_sims)
+        user_picks = [pick for pick in horizon if settings.draft_order[pick - 1] == settings.user_team]
+        next_user_pick = user_picks[0] if user_picks else None
+        # Opponent cursor: frontier into ADP order, or pointer into each sim's noisy ADP order
+        frontier = np.zeros(num_sims, dtype=np.int64)
+        pool_slot = np.zeros(len(self.table), dtype=np.int64)
+        pool_slot[pool] = np.arange(pool.size)
+        # Players the simulated user took during the play-out, added back for survival
+        user_taken = np.zeros(available.shape, dtype=bool) if trace is not None else None
+
+        for step, pick in enumerate(horizon):
+            team = settings.draft_order[pick - 1]
+            open_rows = team_sizes[:, team] < settings.roster_size
+            if self.truncate_horizon:
+                # Sims whose user roster is already full have nothing left to decide
+                user_open = team_sizes[:, settings.user_team] < settings.roster_size
+                if not user_open.any():
+                    break
+                open_rows &= user_open
+            # Draw the user's noise before skipping so the stream stays aligned across candidates
+            noise = None
+            if team == settings.user_team:
+                noise = stream.integers(-USER_NOISE, USER_NOISE + 1, (num_sims, pool.size), dtype=np.int16)
+                if trace is not None:
+                    # Who the opponents have left when the user is back on the clock
+                    trace[2][user_picks.index(pick)] += (available | user_taken).sum(axis=0)
+            active = rows[open_rows]
+            if active.size == 0:
+                continue
+            if noise is not None:
+                if trace is not None and pick == next_user_pick:
+                    trace[0][active] = availability_hash(available[active])
+                picked, players = self._user_pick(state, active, noise, pool_slot)
+                if user_taken is not None:
+                    user_taken[picked, players] = True
+                if trace is not None and pick == next_user_pick and trace[3] < roster.shape[1]:
+                    trace[1][active] = roster[active, trace[3]]
+            elif profile is None:
+                self._opponent_step(state, active, team, step, frontier, scenarios)
+            else:
+                started = time.perf_counter()
+                self._opponent_step(state, active, team, step, frontier, scenarios)
+                profile.add_time('opponent_picks', started)
+
+        return self.roster_values(roster)
+
+    def advance_opponents(self, board: BoardState, stop_pick: int, num_sims: int,
+                          rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulate the opponent picks from the current pick up to (not including) stop_pick.
+
+        Returns every sim's availability flags and team sizes at stop_pick, which predicts the
+        boards the user may face at their next pick. Picks by the user's team are left alone.
+        """
+        available = np.repeat(board.available[None, :], num_sims, axis=0)
+        team_sizes = np.repeat(board.team_sizes[None, :].astype(np.int32), num_sims, axis=0)
+        return self.advance_states(available, team_sizes, board.current_pick, stop_pick, rng)
+
+    def advance_states(self, available: np.ndarray, team_sizes: np.ndarray, first_pick: int, stop_pick: int,
+                       rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """advance_opponents() for drafts that each start from their own board (updated in place)."""
+        settings = self.settings
+        stream = ScenarioStream(rng)
+        num_sims = len(available)
+        rows = np.arange(num_sims)
+        horizon = range(first_pick, max(stop_pick, first_pick))
+
+        remaining = available.sum(axis=1).astype(np.int32)
+        frontier = np.zeros(num_sims, dtype=np.int64)
+        scenarios = self._opponent_scenarios(stream, num_sims, len(horizon))
+        state = (available, team_sizes, remaining, None, None, None)
+
+        for step, pick in enumerate(horizon):
+            team = settings.draft_order[pick - 1]
+            if team == settings.user_team:
+                continue
+            active = rows[team_sizes[:, team] < settings.roster_size]
+            if active.size:
+                started = time.perf_counter() if self.profile is not None else 0.0
+                self._opponent_step(state, active, team, step, frontier, scenarios)
+                if self.profile is not None:
+                    self.profile.add_time('opponent_picks', started)
+        return available, team_sizes
+
+    def _opponent_scenarios(self, stream: ScenarioStream, num_sims: int, num_picks: int) -> tuple:
+        """Draw every opponent decision up front so the stream does not depend on the board."""
+        started = time.perf_counter() if self.profile is not None else 0.0
+        if self.settings.opponent_model == OPPONENT_NOISY_ADP:
+            scenarios = np.argsort(noisy_adp_keys(len(self.table), stream, size=num_sims), axis=1).astype(np.int32), None, None
+            if self.profile is not None:
+                self.profile.count('sorts', num_sims)
+        else:
+            # Opponent scenario for every (sim, pick), drawn before the board can diverge
+            follow_adp = stream.random((num_sims, num_picks), dtype=np.float32) < OPPONENT_ADP_PROBABILITY
+            window_pick = stream.integers(0, OPPONENT_WINDOW, (num_sims, num_picks), dtype=np.int8)
+            scenarios = None, follow_adp, window_pick
+        if self.profile is not None:
+            self.profile.add_time('opponent_scenarios', started)
+        return scenarios
+
+    def _opponent_step(self, state, rows: np.ndarray, team: int, step: int, frontier: np.ndarray,
+                       scenarios: tuple) -> Tuple[np.ndarray, np.ndarray]:
+        """One opponent pick in every sim in rows; returns the sims that picked and who they took."""
+        noisy_order, follow_adp, window_pick = scenarios
+        if noisy_order is None:
+            pick_index = np.where(follow_adp[:, step], 0, window_pick[:, step])
+            return self._opponent_pick(state, rows, team, frontier, pick_index)
+        return self._opponent_pick_noisy(state, rows, team, frontier, noisy_order)
+
+    def _draft_user(self, state, rows: np.ndarray, players: np.ndarray):
+        available, team_sizes, remaining, roster, roster_len, counts = state
+        available[rows, players] = False
+        remaining[rows] -= 1
+        team_sizes[rows, self.settings.user_team] += 1
+        roster[rows, roster_len[rows]] = players
+        roster_len[rows] += 1
+        counts[rows, self.table.position[players]] += 1
+
+    def _user_pick(self, state, rows: np.ndarray, noise: np.ndarray,
+                   pool_slot: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized version of the simulated user's ADP + roster need policy.
+
+        Returns the sims that drafted a player and who they took.
+        """
+        available, team_sizes, remaining, roster, roster_len, counts = state
+        profile = self.profile
+        started = time.perf_counter() if profile is not None else 0.0
+        user_counts = counts[rows]
+
+        # Starters fill position slots first, then FLEX/SUPERFLEX-style slots, the rest is bench
+        # (the same fill as RosterNeedsTracker). Open multi-position slots make room like the bench.
+        remaining = user_counts.copy()
+        starters = np.zeros(rows.size, dtype=np.int32)
+        flex_open = np.zeros(user_counts.shape, dtype=bool)
+        for count, eligible in self.slot_fill:
+            free = np.full(rows.size, count, dtype=np.int32)
+            for code in eligible:
+                take = np.minimum(remaining[:, code], free)
+                remaining[:, code] -= take
+                free -= take
+            starters += count - free
+            if eligible.size > 1:
+                flex_open[:, eligible] |= (free > 0)[:, None]
+        bench_open = (self.settings.bench_limit - (roster_len[rows] - starters)) > 0
+        needs = (self.need_limits - user_counts) > 0
+
+        # Per (sim, position): constant bonus and projection coefficient, ineligible positions sink
+        depth = np.minimum(user_counts, self.bench_multipliers.shape[1] - 1)
+        bench_coef = self.bench_multipliers[np.arange(len(POSITIONS)), depth]
+        bench_coef[:, [QB, OTHER, TE]] = 0.0
+        bench_const = np.zeros_like(bench_coef)
+        bench_const[:, [QB, OTHER]] = USER_BENCH_QB_BONUS
+        bench_const[:, [K, DST]] = INELIGIBLE
+
+        room = bench_open[:, None] | flex_open
+        const = np.where(needs, USER_NEED_BONUS, np.where(room, bench_const, INELIGIBLE)).astype(np.float32)
+        coef = np.where(needs, 0.0, np.where(room, bench_coef, 0.0)).astype(np.float32)
+
+        if profile is not None:
+            started = profile.add_time('roster_needs', started)
+
+        # Only score players that are still available in at least one of these sims
+        user_available = available[rows]
+        columns = np.flatnonzero(user_available.any(axis=0))
+        if columns.size == 0:
+            if profile is not None:
+                profile.add_time('user_picks', started)
+            return rows[:0], columns
+        user_available = user_available[:, columns]
+
+        value = const @ self.position_onehot[:, columns]
+        value += coef @ self.position_projection[:, columns]
+        value += self.adp_value[columns]
+        value += noise[rows][:, pool_slot[columns]]
+        value[~user_available] = -np.inf
+
+        best = value.argmax(axis=1)
+        picked = value[np.arange(rows.size), best] > -1
+        if profile is not None:
+            profile.count('players_scanned', rows.size * columns.size)
+        rows, players = rows[picked], columns[best[picked]]
+        if rows.size:
+            self._draft_user(state, rows, players)
+        if profile is not None:
+            profile.count('picks', rows.size)
+            profile.add_time('user_picks', started)
+        return rows, players
+
+    def _opponent_pick(self, state, rows: np.ndarray, team: int, frontier: np.ndarray,
+                       pick_index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized version of the 70% best ADP / 30% top-6 opponent policy."""
+        available, team_sizes, remaining, roster, roster_len, counts = state
+        num_players = available.shape[1]
+        rows = rows[remaining[rows] > 0]
+        if rows.size == 0:
+            return rows, rows
+
+        pick_index = np.minimum(pick_index[rows], remaining[rows] - 1)
+
+        # Look for the k-th available player in a short window starting at the sim's
+        # frontier (a lower bound on its first available player)
+        window = np.arange(OPPONENT_WINDOW * 2)
+        columns = frontier[rows][:, None] + window
+        in_range = columns < num_players
+        columns = np.minimum(columns, num_players - 1)
+        found = available[rows[:, None], columns] & in_range
+        cumulative = found.cumsum(axis=1, dtype=np.int8)
+        hit = cumulative > pick_index[:, None]
+        in_window = hit[:, -1]
+        chosen = columns[np.arange(rows.size), hit.argmax(axis=1)]
+        first = columns[np.arange(rows.size), found.argmax(axis=1)]
+
+        # Fall back to a full scan for sims whose window was too sparse
+        if not in_window.all():
+            sparse = np.flatnonzero(~in_window)
+            sparse_available = available[rows[sparse]]
+            chosen[sparse] = (sparse_available.cumsum(axis=1) > pick_index[sparse, None]).argmax(axis=1)
+            first[sparse] = sparse_available.argmax(axis=1)
+            if self.profile is not None:
+                self.profile.count('players_scanned', sparse_available.size)
+        frontier[rows] = first
+        if self.profile is not None:
+            self.profile.count('players_scanned', found.size)
+            self.profile.count('picks', rows.size)
+
+        available[rows, chosen] = False
+        remaining[rows] -= 1
+        team_sizes[rows, team] += 1
+        return rows, chosen
+
+    def _opponent_pick_noisy(self, state, rows: np.ndarray, team: int, pointer: np.ndarray,
+                             order: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Each opponent takes the next still-available player in the sim's noisy ADP order."""
+        available, team_sizes, remaining, roster, roster_len, counts = state
+        num_players = available.shape[1]
+        rows = rows[remaining[rows] > 0]
+        if rows.size == 0:
+            return rows, rows
+
+        # Skip past players the user (or earlier opponents) already took
+        scanned = rows.size
+        while True:
+            stale = rows[~available[rows, order[rows, pointer[rows]]]]
+            if stale.size == 0:
+                break
+            pointer[stale] += 1
+            scanned += stale.size
+        if self.profile is not None:
+            self.profile.count('players_scanned', scanned)
+            self.profile.count('picks', rows.size)
+
+        chosen = order[rows, pointer[rows]]
+        pointer[rows] = np.minimum(pointer[rows] + 1, num_players - 1)
+        available[rows, chosen] = False
+        remaining[rows] -= 1
+        team_sizes[rows, team] += 1
+        return rows, chosen
+
+    def roster_values(self, roster: np.ndarray) -> np.ndarray:
+        """Value a batch of rosters (table indices, -1 for empty) like calculate_roster_value_for_simulation_web_projections.
+
+        Rosters are looked up by signature, so only ones this simulator has not seen are valued.
+        """
+        started = time.perf_counter() if self.profile is not None else 0.0
+        signature = roster_signature(roster, len(self.table))
+        unique, first, inverse = np.unique(signature, return_index=True, return_inverse=True)
+        values = self.roster_memo.lookup(unique)
+        missing = np.flatnonzero(np.isnan(values))
+        if missing.size:
+            values[missing] = self._value_rosters(roster[first[missing]])
+            self.roster_memo.store(unique[missing], values[missing])
+        if self.profile is not None:
+            self.profile.count('roster_memo_hits', unique.size - missing.size)
+            self.profile.count('roster_memo_misses', missing.size)
+            self.profile.add_time('valuation', started)
+        return values[inverse.reshape(-1)]
+
+    def _value_rosters(self, roster: np.ndarray) -> np.ndarray:
+        table = self.table
+        valid = roster >= 0
+        safe = np.where(valid, roster, 0)
+        projection = np.where(valid, table.projection[safe], -np.inf)
+
+        # Highest projection first, ties keep draft order
+        order = np.argsort(-projection, axis=1, kind='stable')
+        valid = np.take_along_axis(valid, order, axis=1)
+        projection = np.take_along_axis(projection, order, axis=1)
+        positions = np.where(valid, table.position[np.take_along_axis(safe, order, axis=1)], -1)
+
+        starters = self.settings.lineup_slots.starting_mask(positions)
+        bench = valid & ~starters & (positions != OTHER)
+
+        safe_positions = np.maximum(positions, 0)
+        points = np.where(valid, projection, 0.0)
+        if self.settings.lineup_scoring == LINEUP_WEEKLY:
+            # Every week starts its own best lineup from the players not on bye
+            weekly = np.where(valid[:, :, None], self.weekly_points[np.take_along_axis(safe, order, axis=1)], -np.inf)
+            # Even weekly splits keep the season ranking every week, byes only drop players out;
+            # loaded weekly projections can reorder the roster week to week
+            value = weekly_lineup_points(weekly, positions, self.settings.lineup_slots, self.starter_weights,
+                                         presorted=self.table.weekly is None).sum(axis=1)
+        else:
+            value = (points * self.starter_weights[safe_positions] * starters).sum(axis=1)
+
+        # Bench depth counts the other bench players at the same position
+        bench_depth = np.zeros(positions.shape, dtype=np.int32)
+        for code in range(len(POSITIONS)):
+            is_bench = bench & (positions == code)
+            bench_depth += is_bench * (is_bench.sum(axis=1, keepdims=True) - 1)
+        bench_depth = np.clip(bench_depth, 0, self.bench_multipliers.shape[1] - 1)
+        value += (points * self.bench_multipliers[safe_positions, bench_depth] * bench).sum(axis=1)
+        return value
+
+
+def simulate(snapshot: BoardSnapshot, candidate, rng: np.random.Generator, num_sims: int = 1,
+             truncate_horizon: bool = True, antithetic: bool = False) -> np.ndarray:
+    """Season scores for num_sims drafts where the user takes candidate now.
+
+    Pure function of its arguments: it only reads the snapshot, so it is safe to call from
+    threads or worker processes while the live draft keeps taking picks.
+    """
+    simulator = BatchDraftSimulator(snapshot.table, snapshot.settings, truncate_horizon=truncate_horizon)
+    return simulator.run(snapshot.board, snapshot.candidate_index(candidate), num_sims, rng, antithetic)
+
+
+def _sampling_units(scores: np.ndarray, antithetic: bool) -> np.ndarray:
+    # Antithetic pairs are correlated, so each pair's mean is one independent sample
+    if antithetic:
+        return scores[:len(scores) // 2 * 2].reshape(-1, 2).mean(axis=1)
+    return scores
+
+
+def _std_error(units: np.ndarray) -> float:
+    return float(units.std(ddof=1) / np.sqrt(len(units))) if len(units) > 1 else 0.0
+
+
+def difference_stats(a: np.ndarray, b: np.ndarray, paired: bool = True, antithetic: bool = False) -> tuple:
+    """Mean difference a - b and its standard error.
+
+    Paired runs share scenarios index by index, so the error comes from per-sim differences
+    over the scenarios both have seen.
+    """
+    units_a, units_b = _sampling_units(a, antithetic), _sampling_units(b, antithetic)
+    diff = float(units_a.mean() - units_b.mean())
+    if paired:
+        shared = min(len(units_a), len(units_b))
+        return diff, _std_error(units_a[:shared] - units_b[:shared])
+    return diff, float(np.hypot(_std_error(units_a), _std_error(units_b)))
+
+
+def compare_candidates(scores: Dict[int, np.ndarray], paired: bool = True, antithetic: bool = False,
+                       offsets: Optional[Dict[int, float]] = None) -> Dict[int, dict]:
+    """Mean, standard error and difference to the leader for each candidate's simulated scores.
+
+    Paired scores come from common random numbers and are compared sim by sim, so the
+    shared opponent noise cancels out of the differences. offsets shift a candidate's
+    mean (e.g. ranking adjustments) without changing its errors.
+    """
+    offsets = offsets or {}
+    scores = {candidate: np.asarray(batch, dtype=np.float64) for candidate, batch in scores.items() if len(batch)}
+    if not scores:
+        return {}
+    means = {candidate: float(batch.mean()) + offsets.get(candidate, 0.0) for candidate, batch in scores.items()}
+    leader = max(means, key=means.get)
+
+    summary = {}
+    for candidate, batch in scores.items():
+        if candidate == leader:
+            diff_error = 0.0
+        else:
+            diff_error = difference_stats(batch, scores[leader], paired, antithetic)[1]
+        std_error = _std_error(_sampling_units(batch, antithetic))
+        summary[candidate] = {
+            'mean': means[candidate],
+            'std_error': std_error,
+            'ci_low': means[candidate] - CONFIDENCE_Z * std_error,
+            'ci_high': means[candidate] + CONFIDENCE_Z * std_error,
+            'simulations': int(len(batch)),
+            'diff_vs_best': means[candidate] - means[leader],
+            'diff_std_error': diff_error,
+        }
+    return summary
+
+
+def merge_candidate_stats(runs: Sequence[Dict[int, np.ndarray]], paired=True, antithetic: bool = False,
+                          offsets: Optional[Dict[int, float]] = None) -> Dict[int, dict]:
+    """compare_candidates over several independent runs of the same board.
+
+    paired is one flag for every run or a flag per run. Means and standard errors pool every
+    run's scores. Paired differences are only valid within a run (each run has its own
+    scenarios), so the difference to the leader is pooled from per-run errors weighted by the
+    scenarios each run shares. A single run gives the same numbers as compare_candidates.
+    """
+    flags = [paired] * len(runs) if isinstance(paired, bool) else list(paired)
+    runs, flags = [run for run in runs if run], [flag for run, flag in zip(runs, flags) if run]
+    if len(runs) == 1:
+        return compare_candidates(runs[0], flags[0], antithetic, offsets)
+    pooled = {}
+    for run in runs:
+        for candidate, batch in run.items():
+            if len(batch):
+                pooled.setdefault(candidate, []).append(np.asarray(batch, dtype=np.float64))
+    summary = compare_candidates({candidate: np.concatenate(batches) for candidate, batches in pooled.items()},
+                                 False, antithetic, offsets)
+    if not any(flags) or not summary:
+        return summary
+
+    leader = max(summary, key=lambda candidate: summary[candidate]['mean'])
+    for candidate, stats in summary.items():
+        if candidate == leader:
+            continue
+        weights, errors = [], []
+        for run, flag in zip(runs, flags):
+            if len(run.get(candidate, ())) and len(run.get(leader, ())):
+                weights.append(min(len(run[candidate]), len(run[leader])))
+                errors.append(difference_stats(run[candidate], run[leader], flag, antithetic)[1])
+        if weights:
+            weights = np.asarray(weights, dtype=np.float64)
+            stats['diff_std_error'] = float(np.sqrt(np.sum((weights * np.asarray(errors)) ** 2)) / weights.sum())
+        else:
+            stats['diff_std_error'] = float(np.hypot(stats['std_error'], summary[leader]['std_error']))
+    return summary
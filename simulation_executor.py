@@ -0,0 +1,148 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from simulation_engine import PlayerTable, BoardSnapshot, BatchDraftSimulator, RolloutTrace
+from simulation_profile import SimulationProfile
+
+# Simulations per random stream. Batches are cut from the simulation count alone, never the
+# worker count, so a seeded run gives the same scores on any number of workers.
+SIMULATIONS_PER_STREAM = 1024
+
+# Simulators (each with its roster memo) kept per worker, one per league settings, before the
+# least recently used are evicted
+WORKER_SIMULATORS = 8
+
+# Player table installed in each worker by the pool initializer
+_worker_table = None
+_worker_simulators: 'OrderedDict[object, BatchDraftSimulator]' = OrderedDict()
+
+
+def _init_worker(table: PlayerTable):
+    """Pool initializer: keep the player table resident in the worker."""
+    global _worker_table, _worker_simulators
+    _worker_table = table
+    _worker_simulators = OrderedDict()
+
+
+def _run_task(task) -> tuple:
+    """Run one batch of simulations for a candidate inside a worker."""
+    settings, board, candidate, num_sims, seed, antithetic, profiled = task
+    simulator = _worker_simulators.get(settings)
+    if simulator is None:
+        simulator = _worker_simulators[settings] = BatchDraftSimulator(_worker_table, settings)
+        while len(_worker_simulators) > WORKER_SIMULATORS:
+            _worker_simulators.popitem(last=False)
+    _worker_simulators.move_to_end(settings)
+    simulator.profile = SimulationProfile() if profiled else None
+    scores, trace = simulator.run_traced(board, candidate, num_sims, np.random.default_rng(seed), antithetic)
+    profile = simulator.profile.to_dict() if profiled else None
+    simulator.profile = None
+    return candidate, scores, trace, profile
+
+
+def _table_fingerprint(table: PlayerTable) -> tuple:
+    """Identify a player table by its contents so the pool is only rebuilt when it changes."""
+    weekly = table.weekly.tobytes() if table.weekly is not None else None
+    return (tuple(table.names), table.adp.tobytes(), table.projection.tobytes(), table.position.tobytes(), weekly)
+
+
+class SimulationExecutor:
+    """Persistent worker pool that spreads candidate simulation batches across cores."""
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes or int(os.environ.get('SIMULATION_WORKERS', os.cpu_count() or 1))
+        self._pool = None
+        self._fingerprint = None
+        self._table = None
+        self._lock = threading.Lock()
+
+    def _get_context(self):
+        # Fork keeps worker start-up cheap and avoids re-importing the Flask app
+        methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+    def load_table(self, table: PlayerTable):
+        """Make sure the workers hold this player table, restarting the pool if it changed."""
+        fingerprint = _table_fingerprint(table)
+        if fingerprint == self._fingerprint and (self._pool is not None or self.processes <= 1):
+            return
+        self.shutdown()
+        self._table = table
+        self._fingerprint = fingerprint
+        if self.processes > 1:
+            self._pool = self._get_context().Pool(self.processes, initializer=_init_worker, initargs=(table,))
+            print(f"Started simulation pool with {self.processes} workers")
+
+    def run(self, snapshot: BoardSnapshot, candidates: Sequence[int], num_sims: int, seed: Optional[int] = None,
+            paired: bool = True, antithetic: bool = False,
+            profile: Optional[SimulationProfile] = None) -> Dict[int, np.ndarray]:
+        """Simulate every candidate num_sims times and return their scores keyed by table index.
+
+        With paired sampling every candidate's i-th score comes from the same opponent scenario.
+        """
+        return self.run_traced(snapshot, candidates, num_sims, seed, paired, antithetic, profile)[0]
+
+    def run_traced(self, snapshot: BoardSnapshot, candidates: Sequence[int], num_sims: int, seed: Optional[int] = None,
+                   paired: bool = True, antithetic: bool = False, profile: Optional[SimulationProfile] = None
+                   ) -> Tuple[Dict[int, np.ndarray], Dict[int, RolloutTrace]]:
+        """Like run(), plus each candidate's rollout trace aligned with its scores.
+
+        A profile collects the phase timers and counters of every worker that ran a batch.
+        """
+        with self._lock:
+            self.load_table(snapshot.table)
+            tasks = self._build_tasks(snapshot.settings, snapshot.board, candidates, num_sims, seed, paired, antithetic,
+                                      profile is not None)
+
+            if self._pool is None:
+                # In-process simulators and their memos last until the loaded table changes
+                if _worker_table is not self._table:
+                    _init_worker(self._table)
+                results = [_run_task(task) for task in tasks]
+            else:
+                results = self._pool.map(_run_task, tasks, chunksize=1)
+
+        scores = {candidate: [] for candidate in candidates}
+        traces = {candidate: [] for candidate in candidates}
+        for candidate, batch, trace, batch_profile in results:
+            scores[candidate].append(batch)
+            traces[candidate].append(trace)
+            if profile is not None:
+                profile.merge(batch_profile)
+        return ({candidate: np.concatenate(batches) for candidate, batches in scores.items() if batches},
+                {candidate: RolloutTrace.concatenate(batches) for candidate, batches in traces.items() if batches})
+
+    def _build_tasks(self, settings, board, candidates, num_sims, seed, paired=True, antithetic=False,
+                     profiled=False) -> List[tuple]:
+        batches_per_candidate = max(1, num_sims // SIMULATIONS_PER_STREAM)
+
+        # Paired candidates reuse one seed per batch; independent candidates each get their own
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        seeds = root.spawn(batches_per_candidate if paired else len(candidates) * batches_per_candidate)
+        # Antithetic pairs must not straddle two batches
+        unit = 2 if antithetic else 1
+        tasks = []
+        for i, candidate in enumerate(candidates):
+            for b, batch in enumerate(np.array_split(np.arange(-(-num_sims // unit)), batches_per_candidate)):
+                if batch.size:
+                    batch_seed = seeds[b] if paired else seeds[i * batches_per_candidate + b]
+                    tasks.append((settings, board, candidate, int(batch.size) * unit, batch_seed, antithetic, profiled))
+        return tasks
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._fingerprint = None
+
+
+# Global instance
+simulation_executor = SimulationExecutor()
+atexit.register(simulation_executor.shutdown)
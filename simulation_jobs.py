@@ -0,0 +1,170 @@
+import atexit
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_CANCELLED = 'cancelled'
+JOB_FAILED = 'failed'
+JOB_FINISHED = (JOB_COMPLETED, JOB_CANCELLED, JOB_FAILED)
+
+# Recommendations for the board on the clock, or speculative runs for the user's next pick
+JOB_RECOMMENDATIONS = 'recommendations'
+JOB_SPECULATIVE = 'speculative'
+
+# Finished jobs kept around for status lookups before the oldest are dropped
+MAX_FINISHED_JOBS = 20
+
+
+@dataclass
+class SimulationJob:
+    """A background simulation run tied to the board it was started on."""
+    id: str
+    board_version: int
+    kind: str = JOB_RECOMMENDATIONS
+    status: str = JOB_QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    progress: dict = field(default_factory=dict)
+    result: Optional[list] = None
+    summary: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.status == JOB_QUEUED:
+            self.status = JOB_CANCELLED
+            self.finished = time.time()
+
+    def report(self, **progress):
+        """Record progress from the running simulation (simulations, leader, eta_seconds, ...)."""
+        self.progress = dict(self.progress, **progress)
+
+    def to_dict(self) -> dict:
+        elapsed = ((self.finished or time.time()) - self.started) if self.started else 0.0
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'kind': self.kind,
+            'board_version': self.board_version,
+            'simulations': self.progress.get('simulations', 0),
+            'rounds': self.progress.get('rounds', 0),
+            'leader': self.progress.get('leader'),
+            'eta_seconds': self.progress.get('eta_seconds') if self.status == JOB_RUNNING else None,
+            'elapsed_ms': round(elapsed * 1000),
+            'settled': self.summary.get('settled', False),
+            'precomputed': self.summary.get('precomputed', False),
+            'adapted': self.summary.get('adapted', False),
+            'error': self.error
+        }
+
+
+class SimulationJobManager:
+    """Runs simulation jobs on a background thread so requests return immediately.
+
+    Jobs share one worker thread (the simulations themselves already fan out over the process
+    pool), so a new job queues behind the current one. Cancelling a job is cooperative: the
+    simulation checks job.cancelled between rounds.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='simulation-job')
+        self._jobs: Dict[str, SimulationJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, board_version: int, target: Callable[[SimulationJob], list],
+               kind: str = JOB_RECOMMENDATIONS) -> SimulationJob:
+        """Queue target(job) for the board at board_version; its return value becomes job.result."""
+        job = SimulationJob(uuid.uuid4().hex, board_version, kind)
+        self._add(job)
+        self._executor.submit(self._run, job, target)
+        return job
+
+    def record(self, board_version: int, result: list, summary: dict) -> SimulationJob:
+        """Register an already finished job, e.g. recommendations that were precomputed."""
+        now = time.time()
+        job = SimulationJob(uuid.uuid4().hex, board_version, status=JOB_COMPLETED, started=now, finished=now,
+                            progress={'simulations': summary.get('simulations', 0), 'rounds': summary.get('rounds', 0)},
+                            result=result, summary=summary)
+        if result:
+            job.progress['leader'] = result[0]['name']
+        self._add(job)
+        return job
+
+    def _add(self, job: SimulationJob):
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+
+    def _run(self, job: SimulationJob, target: Callable[[SimulationJob], list]):
+        if job.cancelled:
+            return
+        job.status = JOB_RUNNING
+        job.started = time.time()
+        try:
+            result = target(job)
+            # A job cancelled mid-run stops early; its partial ranking is discarded
+            if job.cancelled:
+                job.status = JOB_CANCELLED
+            else:
+                job.result = result
+                job.status = JOB_COMPLETED
+        except Exception as e:
+            print(f"Simulation job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished = time.time()
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.status in JOB_FINISHED]
+        for job in sorted(finished, key=lambda j: j.created)[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[SimulationJob]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.status not in JOB_FINISHED:
+            job.cancel()
+        return job
+
+    def cancel_stale(self, board_version: Optional[int] = None) -> int:
+        """Cancel unfinished jobs started on any other board (every unfinished job when board_version
+        is None); returns how many were cancelled."""
+        with self._lock:
+            stale = [job for job in self._jobs.values()
+                     if job.board_version != board_version and job.status not in JOB_FINISHED]
+        for job in stale:
+            job.cancel()
+        return len(stale)
+
+    def latest(self, board_version: int, status: Optional[str] = None,
+               kind: str = JOB_RECOMMENDATIONS) -> Optional[SimulationJob]:
+        """Most recently created job of a kind for a board, optionally only in the given status."""
+        with self._lock:
+            jobs = [job for job in self._jobs.values()
+                    if job.board_version == board_version and job.kind == kind
+                    and (status is None or job.status == status)]
+        return max(jobs, key=lambda j: j.created, default=None)
+
+    def shutdown(self):
+        self.cancel_stale()
+        self._executor.shutdown(wait=False)
+
+
+# Global instance
+simulation_jobs = SimulationJobManager()
+atexit.register(simulation_jobs.shutdown)
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+# Profiling is off unless SIMULATION_PROFILE=1 (or switched on at runtime). When off, simulators
+# hold no profile and skip every timer and counter.
+PROFILE_ENABLED = os.environ.get('SIMULATION_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+# Where simulation time goes, in the order a pick runs through them
+PHASES = ('opponent_scenarios', 'opponent_picks', 'roster_needs', 'user_picks', 'valuation')
+
+COUNTERS = (
+    'simulations',
+    'picks',  # simulated picks, user and opponents
+    'players_scanned',  # (sim, player) cells looked at to make those picks
+    'sorts',  # per-sim sorts (noisy ADP orders)
+    'roster_memo_hits',
+    'roster_memo_misses'
+)
+
+# Per-request profiles kept for the diagnostics endpoint before the oldest are dropped
+RECENT_PROFILES = 50
+
+
+class SimulationProfile:
+    """Phase timers (seconds) and counters for one request's simulations.
+
+    Workers fill their own profile per task and the executor merges them back, so a request's
+    profile covers every process it ran on. Phase times are summed across workers (CPU time
+    spent in the phase), so with several workers they can exceed the wall-clock time.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def add_time(self, phase: str, started: float) -> float:
+        """Charge the time since started (a time.perf_counter() value) to phase; returns now."""
+        now = time.perf_counter()
+        self.seconds[phase] += now - started
+        return now
+
+    def count(self, counter: str, amount: int = 1):
+        self.counts[counter] += int(amount)
+
+    def merge(self, other: dict):
+        """Add a to_dict() from another process."""
+        for phase, seconds in other['seconds'].items():
+            self.seconds[phase] += seconds
+        for counter, amount in other['counts'].items():
+            self.counts[counter] += amount
+
+    def to_dict(self) -> dict:
+        return {'seconds': dict(self.seconds), 'counts': dict(self.counts)}
+
+
+class ProfileStore:
+    """Recent per-request profiles plus running totals, for /api/diagnostics/simulation_profile."""
+
+    def __init__(self, max_recent: int = RECENT_PROFILES):
+        self.enabled = PROFILE_ENABLED
+        self._recent = deque(maxlen=max_recent)
+        self._totals = SimulationProfile()
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def new_profile(self) -> Optional[SimulationProfile]:
+        """A profile for a request, or None when profiling is off."""
+        return SimulationProfile() if self.enabled else None
+
+    def record(self, kind: str, profile: SimulationProfile, elapsed: float, **details) -> dict:
+        """Keep a finished request's profile and write it as one structured log line."""
+        entry = dict(profile.to_dict(), kind=kind, elapsed_ms=round(elapsed * 1000, 1), timestamp=time.time(), **details)
+        with self._lock:
+            self._recent.append(entry)
+            self._totals.merge(entry)
+            self._requests += 1
+        print(f"SIMULATION_PROFILE {json.dumps(entry, sort_keys=True)}")
+        return entry
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._totals = SimulationProfile()
+            self._requests = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'requests': self._requests,
+                'totals': self._totals.to_dict(),
+                'recent': list(self._recent)
+            }
+
+
+# Global instance
+profile_store = ProfileStore()
@@ -0,0 +1,76 @@
+import threading
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from simulation_engine import BoardSnapshot, RolloutTrace, SimulationSettings, availability_hash
+
+
+@dataclass(frozen=True)
+class StoredRollouts:
+    """Simulations from one of the user's picks, kept so the next pick can reuse them."""
+    snapshot: BoardSnapshot
+    scores: Dict[int, np.ndarray]
+    traces: Dict[int, RolloutTrace]
+
+
+def next_user_pick(settings: SimulationSettings, after_pick: int) -> Optional[int]:
+    """The user's first pick after after_pick, if any."""
+    return next((pick for pick, team in enumerate(settings.draft_order, 1)
+                 if pick > after_pick and team == settings.user_team), None)
+
+
+def filter_rollouts(stored: StoredRollouts, snapshot: BoardSnapshot) -> Dict[int, np.ndarray]:
+    """Particle filter step from the user's previous pick to the current one.
+
+    Only rollouts of the player the user actually drafted whose opponents left exactly the
+    real board survive; every survivor is equally likely, so no reweighting is needed. Each
+    one is a sample of the player its simulated user took here, keyed by that player.
+    """
+    previous, board = stored.snapshot, snapshot.board
+    if (previous.settings != snapshot.settings or previous.table.names != snapshot.table.names
+            or not np.array_equal(previous.table.projection, snapshot.table.projection)):
+        return {}
+    user_roster = previous.board.user_roster
+    if len(board.user_roster) != len(user_roster) + 1 or board.user_roster[:-1] != user_roster:
+        return {}
+    if board.current_pick != next_user_pick(snapshot.settings, previous.board.current_pick):
+        return {}
+    drafted = board.user_roster[-1]
+    trace = stored.traces.get(drafted)
+    if trace is None:
+        return {}
+
+    consistent = (trace.next_board == availability_hash(board.available)) & (trace.next_pick >= 0)
+    scores, picks = stored.scores[drafted][consistent], trace.next_pick[consistent]
+    return {int(player): scores[picks == player] for player in np.unique(picks)}
+
+
+class RolloutStore:
+    """Holds the latest pick's rollouts until the user's next pick consumes them."""
+
+    def __init__(self):
+        self._stored: Optional[StoredRollouts] = None
+        self._lock = threading.Lock()
+
+    def put(self, stored: StoredRollouts):
+        with self._lock:
+            self._stored = stored
+
+    def take(self, snapshot: BoardSnapshot) -> Dict[int, np.ndarray]:
+        """Surviving rollouts for this board; the stored pick is dropped once it has been used."""
+        with self._lock:
+            if self._stored is None:
+                return {}
+            reused = filter_rollouts(self._stored, snapshot)
+            if reused:
+                self._stored = None
+            return reused
+
+    def clear(self):
+        with self._lock:
+            self._stored = None
+
+
+# Global instance
+rollout_store = RolloutStore()
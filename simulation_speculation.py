@@ -0,0 +1,132 @@
+import threading
+import numpy as np
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+from simulation_engine import BatchDraftSimulator, BoardSnapshot, BoardState
+
+# Opponent rollouts used to estimate which boards the user will face at their next pick
+SPECULATION_SAMPLES = 2000
+
+# Most likely boards simulated ahead of the user's pick
+SPECULATIVE_BOARDS = 3
+
+# Boards after the most likely one are only worth simulating above this probability
+MIN_BOARD_PROBABILITY = 0.05
+
+# A precomputed ranking is adapted when at most this many picks differ from the real board
+MAX_ADAPT_DISTANCE = 2
+
+# Precomputed results kept for the user's next pick
+MAX_SPECULATIVE_RESULTS = 12
+
+
+@dataclass(frozen=True)
+class PredictedBoard:
+    """A board the user may face at their next pick and how often the opponent model produced it."""
+    snapshot: BoardSnapshot
+    probability: float
+
+
+@dataclass(frozen=True)
+class SpeculativeResult:
+    """Recommendations simulated ahead of time for a predicted board."""
+    snapshot: BoardSnapshot
+    probability: float
+    recommendations: list
+    summary: dict
+    simulation_budget: Optional[int]  # options the speculative run was simulated with
+    paired: bool
+    antithetic: bool
+
+
+def predict_boards(snapshot: BoardSnapshot, stop_pick: int, num_boards: int = SPECULATIVE_BOARDS,
+                   num_samples: int = SPECULATION_SAMPLES, rng: Optional[np.random.Generator] = None,
+                   min_probability: float = MIN_BOARD_PROBABILITY) -> List[PredictedBoard]:
+    """Roll the opponents forward to stop_pick and return the most frequent boards, likeliest first."""
+    simulator = BatchDraftSimulator(snapshot.table, snapshot.settings)
+    available, team_sizes = simulator.advance_opponents(snapshot.board, stop_pick, num_samples,
+                                                        rng if rng is not None else np.random.default_rng())
+    boards, first, counts = np.unique(available, axis=0, return_index=True, return_counts=True)
+    predicted = []
+    for i in np.argsort(-counts, kind='stable')[:num_boards]:
+        probability = counts[i] / num_samples
+        if predicted and probability < min_probability:
+            break
+        board = BoardState(boards[i].copy(), team_sizes[first[i]].copy(), snapshot.board.user_roster, stop_pick)
+        predicted.append(PredictedBoard(replace(snapshot, board=board), float(probability)))
+    return predicted
+
+
+def board_difference(predicted: BoardState, actual: BoardState) -> Tuple[np.ndarray, np.ndarray]:
+    """Table indices taken on the real board but open on the prediction, and the reverse."""
+    return np.flatnonzero(predicted.available & ~actual.available), np.flatnonzero(actual.available & ~predicted.available)
+
+
+def _compatible(result: SpeculativeResult, snapshot: BoardSnapshot) -> bool:
+    # Same league settings and projections, same pick and the same user roster
+    predicted, table = result.snapshot, snapshot.table
+    return (predicted.settings == snapshot.settings
+            and predicted.board.current_pick == snapshot.board.current_pick
+            and predicted.board.user_roster == snapshot.board.user_roster
+            and predicted.table.names == table.names
+            and np.array_equal(predicted.table.projection, table.projection)
+            and (predicted.table.weekly is None) == (table.weekly is None)
+            and (table.weekly is None or np.array_equal(predicted.table.weekly, table.weekly)))
+
+
+def _satisfies(result: SpeculativeResult, simulation_budget: Optional[int], paired: bool, antithetic: bool) -> bool:
+    # Same sampling, and no more simulations than the speculative run did (None asks for unlimited)
+    return (result.paired == paired and result.antithetic == antithetic and simulation_budget is not None
+            and result.simulation_budget is not None and simulation_budget <= result.simulation_budget)
+
+
+class SpeculationCache:
+    """Precomputed recommendations for boards the user is likely to face at their next pick."""
+
+    def __init__(self, max_results: int = MAX_SPECULATIVE_RESULTS):
+        self.max_results = max_results
+        self._results: List[SpeculativeResult] = []
+        self._lock = threading.Lock()
+
+    def add(self, result: SpeculativeResult):
+        with self._lock:
+            # Results for an earlier pick can never match again
+            self._results = [r for r in self._results
+                             if r.snapshot.board.current_pick == result.snapshot.board.current_pick]
+            self._results.append(result)
+            self._results.sort(key=lambda r: r.probability, reverse=True)
+            del self._results[self.max_results:]
+
+    def has(self, snapshot: BoardSnapshot) -> bool:
+        """Whether this exact board already has a precomputed result."""
+        with self._lock:
+            return any(_compatible(r, snapshot) and np.array_equal(r.snapshot.board.available, snapshot.board.available)
+                       for r in self._results)
+
+    def take(self, snapshot: BoardSnapshot, simulation_budget: Optional[int], paired: bool = True,
+             antithetic: bool = False, max_distance: int = MAX_ADAPT_DISTANCE) -> Optional[Tuple[SpeculativeResult, int]]:
+        """Remove and return the closest result within max_distance differing picks, with its distance.
+
+        Only results simulated with the requested sampling and at least the requested budget
+        qualify. Results are used once, so asking again runs a fresh simulation.
+        """
+        with self._lock:
+            best = None
+            for result in self._results:
+                if not _compatible(result, snapshot) or not _satisfies(result, simulation_budget, paired, antithetic):
+                    continue
+                distance = len(board_difference(result.snapshot.board, snapshot.board)[0])
+                if distance <= max_distance and (best is None or distance < best[1]):
+                    best = (result, distance)
+            if best is not None:
+                self._results.remove(best[0])
+            return best
+
+    def clear(self):
+        with self._lock:
+            self._results = []
+
+
+# Global instance
+speculation_cache = SpeculationCache()
@@ -0,0 +1,31 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CSV_PATH = os.path.join(ROOT, '09042025LEAGUE_Rankings_2.csv')
+
+
+@pytest.fixture
+def make_assistant():
+    """Fresh FantasyDraftAssistant on the league rankings, drafted by ADP up to the user's first pick."""
+    from fantasy_draft_assistant_v2_clean import FantasyDraftAssistant
+
+    def make(num_teams=10, user_draft_position=3, roster_constraints=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            assistant = FantasyDraftAssistant(CSV_PATH)
+            assistant.set_num_teams(num_teams)
+            if roster_constraints:
+                assistant.set_roster_constraints(roster_constraints)
+            assistant.set_user_draft_position(user_draft_position)
+            assistant.reset_draft()
+            while not assistant.get_current_pick_info().get('is_user_turn', False):
+                assistant.draft_player(assistant.get_available_players()[0].name)
+        return assistant
+
+    return make
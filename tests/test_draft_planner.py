@@ -0,0 +1,15 @@
+from draft_planner import DraftPlanner, plan_summary
+from simulation_engine import BoardSnapshot
+
+
+def test_root_branches_report_rollout_error(make_assistant):
+    snapshot = BoardSnapshot.from_assistant(make_assistant())
+    root = DraftPlanner(snapshot).plan(snapshot.board, depth=2, num_sims=64, seed=1)
+
+    for branch in root.children:
+        summary = plan_summary(branch, snapshot.table, str)
+        assert summary['simulations'] > 1
+        # Every draft at the first pick shares one state, yet its rollouts still vary
+        assert summary['std_error'] > 1e-6
+        for child in summary['children']:
+            assert child['std_error'] > 1e-6
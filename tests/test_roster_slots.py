@@ -0,0 +1,62 @@
+import contextlib
+import io
+from types import SimpleNamespace
+
+import numpy as np
+
+from roster_tracker import RosterNeedsTracker
+from simulation_engine import BatchDraftSimulator, BoardSnapshot
+
+SUPERFLEX_LEAGUE = {'SUPERFLEX': 1, 'BN': 6}
+
+
+def players(*positions):
+    return [SimpleNamespace(position=position) for position in positions]
+
+
+def test_def_slot_starts_dst():
+    tracker = RosterNeedsTracker({'QB': 1, 'DEF': 1, 'BN': 2}, players('QB', 'DST'))
+    assert tracker.starters == 2
+    assert tracker.bench_used == 0
+    assert tracker.position_needs() == {'QB': 0, 'DST': 0}
+
+
+def test_superflex_slot_is_filled_before_the_bench():
+    constraints = {'QB': 1, 'RB': 1, 'FLEX': 1, 'SUPERFLEX': 1, 'BN': 1}
+    tracker = RosterNeedsTracker(constraints, players('QB', 'RB', 'RB'))
+    assert tracker.flex_used == 1
+    assert tracker.open_flex_slots() == {'SUPERFLEX': 1}
+    assert 'QB' in tracker.open_flex_positions
+
+    tracker.add('QB')
+    assert tracker.flex_used == 2
+    assert tracker.open_flex_slots() == {}
+    assert tracker.bench_available == 1
+
+
+def test_engine_user_rosters_fill_superflex_and_def(make_assistant):
+    assistant = make_assistant(roster_constraints=SUPERFLEX_LEAGUE)
+    assert assistant.roster_constraints['DEF'] == 1
+    snapshot = BoardSnapshot.from_assistant(assistant)
+    simulator = BatchDraftSimulator(snapshot.table, snapshot.settings, truncate_horizon=False)
+    rosters = []
+    simulator.roster_values = lambda roster: rosters.append(roster.copy()) or np.zeros(len(roster))
+    simulator.run(snapshot.board, 0, 200, np.random.default_rng(1))
+
+    roster = rosters[0]
+    assert ((roster >= 0).sum(axis=1) == snapshot.settings.roster_size).all()
+
+
+def test_scalar_user_rosters_fill_superflex_and_def(make_assistant, monkeypatch):
+    with contextlib.redirect_stdout(io.StringIO()):
+        import fantasy_draft_web_enhanced as web
+    assistant = make_assistant(roster_constraints=SUPERFLEX_LEAGUE)
+    projection_cache = {p.name: web.get_player_projection(p.name, web.selected_scoring_format) for p in assistant.players}
+    sizes = []
+    monkeypatch.setattr(web, 'calculate_roster_value_for_simulation_web_projections',
+                        lambda assistant, roster, projection_cache=None: sizes.append(len(roster)) or 0.0)
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        web.simulate_draft_with_player_web_projections(assistant, assistant.get_available_players()[0], projection_cache,
+                                                       truncate_horizon=False, rng=rng)
+    assert sizes == [sum(assistant.roster_constraints.values())] * 20
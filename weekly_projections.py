@@ -0,0 +1,105 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Sequence
+
+# Weeks stored per player (the regular season plus the final week)
+NUM_WEEKS = 18
+
+# Weeks a season projection is split over when a player has no weekly projections
+SEASON_SPLIT_WEEKS = 17
+
+# Optional weekly projections loaded at start-up (see WeeklyProjectionStore.load_csv for the layout)
+WEEKLY_PROJECTIONS_CSV = os.environ.get('WEEKLY_PROJECTIONS_CSV', 'weekly_projections.csv')
+
+# Column names accepted for each scoring format in a weekly projections CSV
+FORMAT_COLUMNS = {
+    'ppr': 'ppr',
+    'half-ppr': 'half-ppr',
+    'half_ppr': 'half-ppr',
+    'non-ppr': 'non-ppr',
+    'non_ppr': 'non-ppr',
+    'standard': 'standard'
+}
+
+
+class WeeklyProjectionStore:
+    """Per-scoring-format (player x week) float32 projections, rows indexed by player ID.
+
+    Players with weekly projections loaded from a CSV use them; everyone else falls back to
+    their season projection split evenly over SEASON_SPLIT_WEEKS weeks.
+    """
+
+    def __init__(self, names: Sequence[str], num_weeks: int = NUM_WEEKS):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.num_weeks = num_weeks
+        self._loaded: Dict[str, np.ndarray] = {}  # scoring format -> weekly rows (NaN where not loaded)
+        self._matrices: Dict[str, np.ndarray] = {}  # scoring format -> complete matrix
+        self._lock = threading.Lock()
+
+    def load_csv(self, path: str, scoring_format: Optional[str] = None) -> int:
+        """Load weekly projections in long format and return how many players matched.
+
+        Expects a Player (or Name) column, a Week column and one points column per scoring
+        format (ppr, half-ppr, non-ppr, standard), or a single Points column that applies to
+        scoring_format. Unknown players and weeks outside the season are ignored.
+        """
+        df = pd.read_csv(path)
+        df.columns = [str(column).strip() for column in df.columns]
+        name_column = 'Player' if 'Player' in df.columns else 'Name'
+        columns = {FORMAT_COLUMNS[column.lower()]: column for column in df.columns if column.lower() in FORMAT_COLUMNS}
+        if 'Points' in df.columns and scoring_format is not None:
+            columns[scoring_format] = 'Points'
+        if not columns:
+            raise ValueError(f"No projection columns found in {path}")
+
+        rows = df[name_column].astype(str).str.strip().map(self.index)
+        weeks = pd.to_numeric(df['Week'], errors='coerce')
+        valid = rows.notna() & weeks.between(1, self.num_weeks)
+        rows = rows[valid].astype(int).to_numpy()
+        weeks = weeks[valid].astype(int).to_numpy() - 1
+
+        with self._lock:
+            for fmt, column in columns.items():
+                loaded = np.full((len(self.names), self.num_weeks), np.nan, dtype=np.float32)
+                # A player with any weekly rows has 0 in the weeks that are missing (e.g. the bye)
+                loaded[np.unique(rows)] = 0.0
+                loaded[rows, weeks] = pd.to_numeric(df[column][valid], errors='coerce').fillna(0.0).to_numpy()
+                self._loaded[fmt] = loaded
+                self._matrices.pop(fmt, None)
+        return len(np.unique(rows))
+
+    def has_weekly(self, scoring_format: str) -> bool:
+        """Whether any weekly projections were loaded for a scoring format."""
+        return scoring_format in self._loaded
+
+    def overlay(self, scoring_format: str, season_projections: Sequence[float]) -> np.ndarray:
+        """Flat split of season_projections (in ID order) with any loaded weekly rows on top."""
+        season = np.asarray(season_projections, dtype=np.float32)
+        matrix = np.repeat((season / SEASON_SPLIT_WEEKS)[:, None], self.num_weeks, axis=1)
+        loaded = self._loaded.get(scoring_format)
+        if loaded is not None:
+            has_rows = ~np.isnan(loaded).all(axis=1)
+            matrix[has_rows] = loaded[has_rows]
+        return matrix
+
+    def matrix(self, scoring_format: str, season_projections: Callable[[], Sequence[float]]) -> np.ndarray:
+        """The (player x week) matrix for a format, built on first use.
+
+        season_projections returns every player's season projection in ID order; it is only
+        called when the matrix is (re)built.
+        """
+        with self._lock:
+            matrix = self._matrices.get(scoring_format)
+            if matrix is None:
+                matrix = self.overlay(scoring_format, season_projections())
+                matrix.setflags(write=False)
+                self._matrices[scoring_format] = matrix
+            return matrix
+
+    def clear_flat(self):
+        """Forget built matrices so the flat split picks up changed season projections."""
+        with self._lock:
+            self._matrices.clear()